@@ -1,118 +1,311 @@
 #!/usr/bin/env python3
 
-from .file_linter import lint
-
-try:
-    from .xml import dix, lrx, modes, transfer
-except ImportError:
-    print('WARNING: lxml is required to run XML linters')
-
-try:
-    from .tree_sitter import cg, lexc, lexd, rtx, twolc
-except ImportError:
-    print('WARNING: tree-sitter is required to run some linters')
+from .file_linter import FileLinter, lint, lint_bytes
+from .report import Reporters, TextReporter, make_reporter
+from .runner import lint_many, lint_results, run_files
+from .walk import Walker, changed_files, iter_changed, shard
 
 import os
-import json
 import sys
 from collections import defaultdict
-import subprocess
 
 def disp_dict(dct, indent=0):
-    prefix = '  '*indent
-    for k in sorted(dct.keys()):
-        blob = dct[k]
-        if isinstance(blob['value'], dict):
-            print(f'{prefix}{blob["long_name"]}:')
-            disp_dict(blob['value'], indent+1)
-        else:
-            print(f'{prefix}{blob["long_name"]}:\t{blob["value"]}')
+    for line in TextReporter(None).stats_lines(dct, indent):
+        print(line)
 
 def display_results(pth, args, blob):
-    if args.json:
-        print(json.dumps(pth) + ':' + json.dumps(blob) + ',')
-        return
-    if ((len(blob['stats']) == 0 or not args.stats) and
-        (len(blob['checks']) == 0 or not args.check)):
-        return
-    print_pth = pth.replace(os.getcwd(), '.')
-    if args.linewise:
-        if print_pth.count('/') == 1:
-            # just use the filename if it's in the top directory
-            print_pth = print_pth[2:]
-    else:
-        print(print_pth)
-    if args.check:
-        verb_labs = {
-            1: 'Error',
-            2: 'Warning',
-            3: 'Suggestion',
-            4: 'Nitpick',
-        }
-        for msg in blob['checks']:
-            typ = verb_labs.get(msg['level'], 'Message')
-            if args.linewise:
-                print(f'{print_pth}:{msg["line"]}: {typ.lower()}: ({msg["name"]}) {msg["desc"]}')
-            else:
-                print(f'{typ} ({msg["name"]}) on line {msg["line"]}: {msg["desc"]}')
-    if args.stats:
-        disp_dict(blob['stats'])
+    make_reporter(args).file(pth, blob)
 
-def lint_file(pth, args, totals=None):
-    linter = lint(pth, check=args.check, stats=args.stats)
-    res = linter.get_results()
-    display_results(pth, args, res)
+def record_totals(blob, totals):
     if totals is not None:
-        for ch in res.get('checks', []):
+        for ch in blob.get('checks', []):
             totals[ch['level']] += 1
 
+def lint_file(pth, args, totals=None):
+    config = getattr(args, 'config', None)
+    res = lint_results(pth, check=args.check, stats=args.stats,
+                       cache=getattr(args, 'cache', None),
+                       selection=config and config.selection_for(pth),
+                       root=os.path.dirname(pth))
+    display_results(pth, args, res)
+    record_totals(res, totals)
+
+def limit_exceeded(totals, args):
+    '''
+    Return a description of which of --max-error and --max-warn
+    has been exceeded, or None.
+    '''
+    max_error = getattr(args, 'max_error', -1)
+    max_warn = getattr(args, 'max_warn', -1)
+    if max_error >= 0 and totals[1] > max_error:
+        return f'more than {max_error} errors'
+    if max_warn >= 0 and totals[1] + totals[2] > max_warn:
+        return f'more than {max_warn} warnings or errors'
+    return None
+
+def stdin_files(name=None):
+    '''
+    The entry for run_files() to lint standard input as though it were
+    the file name (which is also what the results are reported as).
+    '''
+    name = name or '-'
+    yield name, os.path.dirname(name), sys.stdin.buffer.read()
+
+def lint_paths(paths, args, totals=None, reporter=None):
+    '''
+    Lint every file under paths and report the results.
+    Returns the Walker used to find the files, and, if --fail-fast
+    stopped the run early, a note saying so (otherwise None).
+    '''
+    if reporter is None:
+        reporter = make_reporter(args)
+    if totals is None:
+        totals = defaultdict(int)
+    walker = Walker(ignore=args.ignore, changed=getattr(args, 'changed', None))
+    if list(paths) == ['-']:
+        files = stdin_files(getattr(args, 'stdin_filename', None))
+    else:
+        files = walker.walk(paths, roots=True)
+        if getattr(args, 'shard', None):
+            files = shard(files, *args.shard)
+    results = run_files(files, check=args.check, stats=args.stats,
+                        jobs=getattr(args, 'jobs', 1),
+                        cache=getattr(args, 'cache', None),
+                        config=getattr(args, 'config', None),
+                        probes=getattr(args, 'probes', ()))
+    count = 0
+    for pth, res in results:
+        reporter.file(pth, res)
+        record_totals(res, totals)
+        count += 1
+        if getattr(args, 'fail_fast', False):
+            reason = limit_exceeded(totals, args)
+            if reason:
+                results.close()
+                files.close()
+                return walker, f'Stopped after {count} files: found {reason}.'
+    return walker, None
+
 def lint_path(pth, args, totals=None):
-    if os.path.isfile(pth):
-        lint_file(pth, args, totals)
-    elif os.path.isdir(pth):
-        skip = set()
-        if args.ignore:
-            # There's probably a safer way to write this call...
-            proc = subprocess.run('git check-ignore *',
-                                  shell=True, capture_output=True, cwd=pth)
-            if proc.returncode == 0:
-                skip = set(proc.stdout.decode('utf-8').splitlines())
-        for ent in os.scandir(pth):
-            if ent.name.startswith('.') or ent.name in skip:
-                continue
-            if ent.is_file():
-                lint_file(ent.path, args, totals)
-            elif ent.is_dir():
-                lint_path(ent.path, args, totals)
-
-def main():
+    lint_paths([pth], args, totals)
+
+def parse_shard(val):
+    '''I/N (counting from 1) for --shard, as (I - 1, N).'''
     import argparse
-    parser = argparse.ArgumentParser(description='Lint Apertium source files.')
-    parser.add_argument('filename', action='store', nargs='*')
+    try:
+        i, n = map(int, val.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected I/N, not {val!r}')
+    if not 1 <= i <= n:
+        raise argparse.ArgumentTypeError(f'{val}: I must be between 1 and N')
+    return i - 1, n
+
+def split_list(values):
+    ret = []
+    for v in values or []:
+        ret += [x.strip() for x in v.split(',') if x.strip()]
+    return ret
+
+def list_checks():
+    from .file_linter import linters
+    for cls in linters():
+        info = cls.all_check_info()
+        if not info:
+            continue
+        print(cls.__name__)
+        for name in sorted(info):
+            cost, reports, _ = info[name]
+            print(f'  {name} ({cost}): {", ".join(reports)}')
+
+def make_parser(prog=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description='Lint Apertium source files.')
+    parser.add_argument('filename', action='store', nargs='*',
+                        help='Files or directories to lint (default: the current directory), or - to read a file from standard input')
+    parser.add_argument('--stdin-filename', action='store', metavar='NAME',
+                        help='Lint standard input as though it were the file NAME')
     parser.add_argument('--stats', '-s', action='store_true')
     parser.add_argument('--no-check', '-C', action='store_false', dest='check')
     parser.add_argument('--include-ignored', '-I', action='store_false',
                         dest='ignore', help='Also lint files in .gitignore')
-    # these should probably be mutually exclusive and go to a format variable
-    parser.add_argument('--json', '-j', action='store_true')
-    parser.add_argument('--linewise', '--linewize', '-l', action='store_true')
+    parser.add_argument('--format', '-f', action='store', default='text',
+                        choices=sorted(Reporters.keys()),
+                        help='Output format (ndjson gives one JSON object per line for each diagnostic)')
+    parser.add_argument('--json', '-j', action='store_const', const='json',
+                        dest='format', help='Same as --format=json')
+    parser.add_argument('--linewise', '--linewize', '-l',
+                        action='store_const', const='linewise',
+                        dest='format', help='Same as --format=linewise')
     parser.add_argument('--max-error', action='store', type=int, default=-1,
                         metavar='N', help='Exit with non-zero status if more than N errors found')
     parser.add_argument('--max-warn', action='store', type=int, default=-1,
                         metavar='N', help='Exit with non-zero status if more than N warnings or errors found')
-    args = parser.parse_args()
-    if args.json:
-        print('{')
-    count = defaultdict(lambda: 0)
-    for fname in args.filename or [os.getcwd()]:
-        lint_path(fname, args, count)
-    if args.json:
-        print('"":{}\n}')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Stop as soon as --max-error or --max-warn is exceeded')
+    parser.add_argument('--jobs', action='store', type=int, default=1,
+                        metavar='N', help='Lint files using N worker processes (0 for one per CPU)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Reuse results for files which have not changed since the last run')
+    parser.add_argument('--cache-dir', action='store', metavar='DIR',
+                        help='Directory to store cached results in (implies --cache)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Report which directories were skipped')
+    parser.add_argument('--sample-size', action='store', type=int,
+                        default=FileLinter.SampleSize, metavar='BYTES',
+                        help='Only check the encoding of the beginning of unrecognized files larger than this')
+    parser.add_argument('--skip-size', action='store', type=int,
+                        default=FileLinter.SkipSize, metavar='BYTES',
+                        help='Skip unrecognized files larger than this')
+    parser.add_argument('--changed-since', action='store', metavar='REF',
+                        help='Only lint files which differ from git revision REF')
+    parser.add_argument('--select', action='append', metavar='NAMES',
+                        help='Only run these checks (comma-separated report types, check methods, or costs: cheap, linear, superlinear)')
+    parser.add_argument('--ignore', action='append', metavar='NAMES',
+                        dest='ignore_checks',
+                        help='Do not run these checks (same format as --select)')
+    parser.add_argument('--no-config', action='store_false', dest='use_config',
+                        help='Do not read .apertium-lint.toml')
+    parser.add_argument('--list-checks', action='store_true',
+                        help='List the available checks and exit')
+    parser.add_argument('--profile', action='store_true',
+                        help='Report the time spent in each phase of linting')
+    parser.add_argument('--profile-json', action='store', metavar='FILE',
+                        help='Write the --profile timings to FILE as JSON (implies --profile)')
+    parser.add_argument('--trace', action='store', metavar='FILE',
+                        help='Write a Chrome trace of each file being linted to FILE')
+    parser.add_argument('--metrics-file', action='store', metavar='FILE',
+                        help='Write counters for this run to FILE in the Prometheus text format')
+    parser.add_argument('--memory', action='store_true',
+                        help='Report the peak memory used by each phase of linting')
+    parser.add_argument('--watch', action='store_true',
+                        help='After linting, keep running and lint files again when they change, printing new (+) and resolved (-) diagnostics')
+    parser.add_argument('--shard', action='store', type=parse_shard,
+                        metavar='I/N', help='Only lint the I-th of N parts of the files (balanced by size), e.g. on each of N CI machines; see apertium-lint --merge --help')
+    parser.add_argument('--lsp', action='store_true',
+                        help='Run a Language Server Protocol server on standard input and output')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and lint files for --client on --socket')
+    parser.add_argument('--client', action='store_true',
+                        help='Send the other options to a --daemon on --socket and print its output (or lint here if none is running)')
+    parser.add_argument('--socket', action='store', metavar='PATH',
+                        help='Unix socket for --daemon and --client (default: apertium-lint.sock in $XDG_RUNTIME_DIR or the temporary directory)')
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # apertium-lint merge is short for apertium-lint --merge, unless
+    # there's a file or directory called merge to lint
+    if argv[:1] == ['--merge'] or (argv[:1] == ['merge'] and
+                                   not os.path.exists('merge')):
+        from .merge import main as merge_main
+        merge_main(argv[1:])
+        return
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.daemon or args.client:
+        from .daemon import client, default_socket, serve
+        sock = args.socket or default_socket()
+        if args.daemon:
+            serve(sock)
+            return
+        status = client(sock, argv, parser.prog)
+        if status is not None:
+            sys.exit(status)
+    run(args, parser)
+
+def run(args, parser):
+    '''Lint what main() was asked to, as parsed by make_parser().'''
+    if args.list_checks:
+        list_checks()
+        return
+    FileLinter.SampleSize = args.sample_size
+    FileLinter.SkipSize = args.skip_size
+    if '-' in args.filename and len(args.filename) > 1:
+        parser.error('- cannot be combined with other paths')
+    if args.stdin_filename:
+        if args.filename not in ([], ['-']):
+            parser.error('--stdin-filename cannot be combined with other paths')
+        args.filename = ['-']
+    if args.watch and args.filename == ['-']:
+        parser.error('--watch cannot be used with standard input')
+    if args.watch and args.format not in ('text', 'linewise'):
+        parser.error('--watch only works with --format text or linewise')
+    args.filename = args.filename or [os.getcwd()]
+    args.changed = None
+    if args.changed_since:
+        try:
+            args.changed = changed_files(args.changed_since, args.filename)
+        except ValueError as e:
+            parser.error(f'--changed-since: {e}')
+    from .config import Config, ConfigError
+    try:
+        args.config = Config(split_list(args.select) if args.select else None,
+                             split_list(args.ignore_checks), args.use_config)
+    except ConfigError as e:
+        parser.error(str(e))
+    if args.lsp:
+        from .lsp import serve
+        sys.exit(serve(args.config))
+    if args.cache or args.cache_dir:
+        from .cache import ResultCache
+        args.cache = ResultCache(args.cache_dir)
     else:
-        print(f'Errors: {count[1]} Warnings: {count[2]} Suggestions: {count[3]} Nitpicks: {count[4]}')
-    if args.max_error >= 0 and count[1] > args.max_error:
-        sys.exit(1)
-    if args.max_warn >= 0 and count[1] + count[2] > args.max_warn:
+        args.cache = None
+    args.probes = []
+    profiler = None
+    if args.profile or args.profile_json:
+        from .timing import Profiler
+        profiler = Profiler()
+        args.probes.append(profiler)
+    tracer = None
+    if args.trace:
+        from .trace import Tracer
+        tracer = Tracer()
+        args.probes.append(tracer)
+    metrics = None
+    if args.metrics_file:
+        from .metrics import Metrics
+        metrics = Metrics()
+        args.probes.append(metrics)
+    memory = None
+    if args.memory:
+        from .memory import MemoryProbe
+        memory = MemoryProbe()
+        args.probes.append(memory)
+    reporter = make_reporter(args)
+    if args.watch:
+        from .watch import Watch
+        Watch(args.filename, args, reporter).run()
+        return
+    reporter.start()
+    count = defaultdict(lambda: 0)
+    try:
+        walker, note = lint_paths(args.filename, args, count, reporter)
+    except ConfigError as e:
+        reporter.flush()
+        parser.error(str(e))
+    reporter.finish(count, note)
+    reporter.flush()
+    if profiler:
+        for line in profiler.table():
+            print(line, file=sys.stderr)
+        if args.profile_json:
+            profiler.dump(args.profile_json)
+    if tracer:
+        tracer.dump(args.trace)
+    if metrics:
+        metrics.write(args.metrics_file, count, args.cache)
+    if memory:
+        memory.stop()
+        for line in memory.table():
+            print(line, file=sys.stderr)
+    if args.verbose:
+        print(f'Skipped {len(walker.skipped)} paths', file=sys.stderr)
+        for pth, reason in walker.skipped:
+            print(f'  {pth.replace(os.getcwd(), ".")}: {reason}',
+                  file=sys.stderr)
+    if limit_exceeded(count, args):
         sys.exit(1)
 
 if __name__ == '__main__':
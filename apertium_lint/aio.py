@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+'''
+asyncio versions of lint_results() and lint_many(), for services which
+can't block their event loop.
+
+Files are read (and directories listed) in the loop's default executor
+(except for those which FileLinter.load() only samples, which are left
+to the linter),
+while the linting itself runs on the executor given, so that reading one
+file overlaps with checking others. The default executor is also used
+for linting if none is given, which keeps the loop responsive but, since
+the checks are pure Python, doesn't lint several files at once; pass a
+concurrent.futures.ProcessPoolExecutor for that (with
+initializer=runner._init_worker and initargs=(settings, probes) if
+FileLinter settings have been changed).
+'''
+
+from .file_linter import FileLinter, UnavailableLinter, identify, is_skip_rule
+from .runner import lint_results
+from .walk import Walker
+import asyncio
+import functools
+
+def _read(path, root):
+    '''
+    The contents of path if its linter reads all of it anyway, or None
+    for files which only get the generic checks, so that large ones are
+    sniffed and sampled (see FileLinter.load()) rather than read whole.
+    '''
+    cls = identify(path, '', root)
+    if (is_skip_rule(cls) or issubclass(cls, UnavailableLinter) or
+        cls.load is FileLinter.load):
+        return None
+    with open(path, 'rb') as fin:
+        return fin.read()
+
+async def lint_async(path, check=True, stats=False, cache=None,
+                     selection=None, root=None, executor=None):
+    '''
+    Lint the file at path without blocking the event loop and return
+    the same plain data as lint_results().
+    '''
+    loop = asyncio.get_running_loop()
+    try:
+        data = await loop.run_in_executor(None, _read, path, root)
+    except OSError:
+        # let the linter report it, as lint() would
+        data = None
+    return await loop.run_in_executor(
+        executor, functools.partial(lint_results, path, check, stats, cache,
+                                    selection, root, data))
+
+async def _walk(paths, walker):
+    '''Walker.walk(paths, roots=True), with each step run in a thread.'''
+    loop = asyncio.get_running_loop()
+    it = walker.walk(paths, roots=True)
+    done = object()
+    try:
+        while True:
+            ent = await loop.run_in_executor(None, next, it, done)
+            if ent is done:
+                return
+            yield ent
+    finally:
+        try:
+            it.close()
+        except ValueError:
+            # cancelled while a thread is still in next(), which will
+            # finish on its own
+            pass
+
+async def lint_paths_async(paths, check=True, stats=False, cache=None,
+                           config=None, executor=None, limit=8,
+                           walker=None):
+    '''
+    Lint every file under paths (files or directories, as on the
+    command line) and yield (path, results) as each one is done, with
+    no more than limit files being read or linted at once.
+    walker (a Walker) decides which files to skip; by default, those
+    ignored by git.
+    If the generator is closed early, files which haven't finished are
+    cancelled (although those already running on the executor still
+    run to completion there).
+    '''
+    walker = walker or Walker()
+    pending = set()
+    def start(pth, root):
+        sel = None if config is None else config.selection_for(pth)
+        task = asyncio.ensure_future(
+            lint_async(pth, check, stats, cache, sel, root, executor))
+        task.path = pth
+        pending.add(task)
+    async def finished():
+        done, _ = await asyncio.wait(pending,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            pending.discard(task)
+        return [(task.path, task.result()) for task in done]
+    files = _walk(paths, walker)
+    try:
+        async for pth, root in files:
+            start(pth, root)
+            if len(pending) >= max(limit, 1):
+                for res in await finished():
+                    yield res
+        while pending:
+            for res in await finished():
+                yield res
+    finally:
+        await files.aclose()
+        for task in pending:
+            task.cancel()
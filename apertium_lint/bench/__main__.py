@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+from .fuzz import fuzz
+from .generate import Formats, generate
+from .run import Sizes, compare, dump, load, run
+import argparse
+import sys
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m apertium_lint.bench',
+        description='Benchmark the linters on generated files')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_run = sub.add_parser('run', help='time each format at each size')
+    p_run.add_argument('-f', '--formats', nargs='+', choices=sorted(Formats),
+                       help='formats to benchmark (default: all)')
+    p_run.add_argument('-s', '--sizes', nargs='+', type=int, default=Sizes,
+                       help=f'number of entries (default: {Sizes})')
+    p_run.add_argument('-r', '--repeat', type=int, default=3,
+                       help='take the best of this many runs (default: 3)')
+    p_run.add_argument('--seed', type=int, default=0)
+    p_run.add_argument('-o', '--output', default='-',
+                       help='file to write results to (default: stdout)')
+
+    p_cmp = sub.add_parser('compare', help='compare two result files')
+    p_cmp.add_argument('old')
+    p_cmp.add_argument('new')
+    p_cmp.add_argument('-t', '--threshold', type=float, default=0.25,
+                       help='fractional slowdown to report (default: 0.25)')
+
+    p_fuzz = sub.add_parser('fuzz', help='search for inputs which are slow or crash')
+    p_fuzz.add_argument('-f', '--formats', nargs='+', choices=sorted(Formats),
+                        help='formats to fuzz (default: all)')
+    p_fuzz.add_argument('-n', '--iterations', type=int, default=100)
+    p_fuzz.add_argument('-b', '--budget', type=float, default=1.0,
+                        help='seconds allowed for each file (default: 1)')
+    p_fuzz.add_argument('-r', '--rate', type=float, default=2.0,
+                        help='extra seconds allowed per MiB (default: 2)')
+    p_fuzz.add_argument('--seed', type=int, default=0)
+    p_fuzz.add_argument('-o', '--output', default='fuzz-fixtures',
+                        help='directory to save failing inputs in')
+
+    p_gen = sub.add_parser('generate', help='print a generated file')
+    p_gen.add_argument('format', choices=sorted(Formats))
+    p_gen.add_argument('size', type=int)
+    p_gen.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        data = run(args.formats, args.sizes, args.repeat, args.seed,
+                   log=sys.stderr)
+        dump(data, args.output)
+    elif args.command == 'compare':
+        bad = list(compare(load(args.old), load(args.new), args.threshold))
+        for fmt, n, was, now, ratio in bad:
+            print(f'{fmt:<8} {n:>8} {was:10.4f}s -> {now:10.4f}s ({ratio:.2f}x)')
+        if bad:
+            sys.exit(1)
+        print('No regressions.')
+    elif args.command == 'fuzz':
+        found = list(fuzz(args.formats, args.iterations, args.budget,
+                          args.rate, args.seed, args.output, log=sys.stderr))
+        if found:
+            sys.exit(1)
+    else:
+        sys.stdout.write(generate(args.format, args.size, args.seed)[1])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+'''
+Search the parameters of the generators for inputs which make the
+linters slow (per byte of input) or recurse deeply, and save any input
+which goes over a time budget or crashes as a regression fixture.
+'''
+
+from .generate import Formats, generate
+from ..file_linter import lint
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+# format : {parameter : (lowest, highest, default)}
+Space = {
+    'monodix': {'n': (1, 5000, 100), 'pardefs': (1, 5000, 5),
+                'depth': (1, 5000, 3), 'chain': (1, 200, 1),
+                'cont': (0.0, 1.0, 0.3), 'blank': (0.0, 1.0, 0.05),
+                'cycles': (0, 1000, 0)},
+    'bidix': {'n': (1, 20000, 100)},
+    'lexc': {'n': (1, 5000, 100), 'multichars': (1, 5000, 21),
+             'layers': (0, 2000, 0), 'width': (1, 8, 2),
+             'cycles': (0, 2000, 0)},
+    'lexd': {'n': (1, 5000, 100)},
+    'twolc': {'n': (1, 5000, 100)},
+    'rlx': {'n': (1, 5000, 100)},
+    't1x': {'n': (1, 5000, 100), 'cats': (1, 2000, 25),
+            'overlap': (0.0, 1.0, 0.3)},
+    'rtx': {'n': (1, 5000, 100)},
+    'lrx': {'n': (1, 20000, 100)},
+}
+
+def defaults(fmt):
+    return {k: d for k, (lo, hi, d) in Space[fmt].items()}
+
+def mutate(rng, fmt, params):
+    '''Change one or two parameters of params, staying within Space.'''
+    params = dict(params)
+    for key in rng.sample(sorted(Space[fmt]), min(len(Space[fmt]), rng.randint(1, 2))):
+        lo, hi, _ = Space[fmt][key]
+        val = params[key]
+        if isinstance(lo, float):
+            val = rng.choice([lo, hi, val + rng.gauss(0, 0.3)])
+        elif rng.random() < 0.2:
+            val = rng.choice([lo, hi])
+        else:
+            val = round(max(val, 1) * 2 ** rng.uniform(-1.5, 1.5)) + rng.randint(-1, 1)
+        params[key] = min(max(val, lo), hi)
+    return params
+
+class Depth:
+    '''Deepest Python stack reached while active, relative to the start.'''
+    def __init__(self):
+        self.depth = 0
+        self.max = 0
+    def __call__(self, frame, event, arg):
+        if event == 'call':
+            self.depth += 1
+            if self.depth > self.max:
+                self.max = self.depth
+        elif event == 'return':
+            self.depth -= 1
+
+def allowance(text, budget, rate):
+    '''Seconds allowed for text: budget, plus rate seconds per MiB.'''
+    return budget + rate * len(text.encode('utf-8')) / (1 << 20)
+
+def measure(path, budget, depth=True):
+    '''
+    Seconds to lint path, and how deep the stack got in a second run
+    (skipped if the first took more than budget seconds).
+    '''
+    start = time.perf_counter()
+    lint(path, check=True, stats=True).get_results()
+    seconds = time.perf_counter() - start
+    if seconds > budget or not depth:
+        return seconds, 0
+    depth = Depth()
+    sys.setprofile(depth)
+    try:
+        lint(path, check=True, stats=True).get_results()
+    finally:
+        sys.setprofile(None)
+    return seconds, depth.max
+
+def _child(path, budget, depth, conn):
+    try:
+        conn.send(('ok',) + measure(path, budget, depth))
+    except BaseException as e:
+        conn.send(('crash', f'{type(e).__name__}: {e}'[:500]))
+
+def run_file(path, budget, depth=True):
+    '''
+    Lint path in a separate process, which is killed if it takes longer
+    than budget seconds. Returns one of ('ok', seconds, depth),
+    ('crash', message) or ('timeout', seconds).
+    '''
+    recv, send = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_child,
+                                   args=(path, budget, depth, send))
+    proc.start()
+    # the depth run is slower than the timed run, so allow for it
+    if recv.poll(budget * 10 if depth else budget):
+        res = recv.recv()
+        if res[0] == 'ok' and res[1] > budget:
+            res = ('timeout', res[1])
+    else:
+        proc.kill()
+        res = ('timeout', budget)
+    proc.join()
+    return res
+
+def evaluate(fmt, params, budget, rate, tmpd):
+    '''
+    Lint a generated file with run_file(), allowing allowance() seconds.
+    Returns (file name, text, result).
+    '''
+    name, text = generate(fmt, **params)
+    path = os.path.join(tmpd, name)
+    with open(path, 'w') as fout:
+        fout.write(text)
+    return name, text, run_file(path, allowance(text, budget, rate))
+
+def save(out_dir, fmt, params, name, text, res, budget):
+    '''
+    Write the input, how to regenerate it, and the time it should be
+    linted in, to a new directory.
+    '''
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+    dirname = os.path.join(out_dir, f'{fmt}-{digest}')
+    os.makedirs(dirname, exist_ok=True)
+    with open(os.path.join(dirname, name), 'w') as fout:
+        fout.write(text)
+    meta = {'format': fmt, 'file': name, 'params': params,
+            'result': list(res), 'budget': budget}
+    with open(os.path.join(dirname, 'fixture.json'), 'w') as fout:
+        json.dump(meta, fout, indent=2, sort_keys=True)
+        fout.write('\n')
+    return dirname
+
+def kind(res):
+    '''The kind of failure, ignoring the details of the message.'''
+    if res[0] == 'crash':
+        return res[1].split(':')[0]
+    return res[0]
+
+def shrink(fmt, params, budget, rate, tmpd, res, tries=20):
+    '''Make the integer parameters smaller while the input still fails.'''
+    for _ in range(tries):
+        changed = False
+        for key, (lo, hi, _) in sorted(Space[fmt].items()):
+            if isinstance(lo, float) or params[key] <= lo:
+                continue
+            smaller = dict(params, **{key: max(lo, params[key] // 2)})
+            name, text, new = evaluate(fmt, smaller, budget, rate, tmpd)
+            # only keep it if it fails in the same way
+            if kind(new) == kind(res):
+                params, res = smaller, new
+                changed = True
+        if not changed:
+            break
+    return params, res
+
+def fuzz(formats=None, iterations=100, budget=1.0, rate=2.0, seed=0,
+         out_dir='.', keep=5, log=None):
+    '''
+    Evolve generator parameters for each format towards inputs with the
+    most time per byte and the deepest recursion, starting from the
+    defaults. Inputs which crash or take more than budget seconds plus
+    rate seconds per MiB are shrunk and saved to out_dir.
+    Yields the directory of each fixture saved.
+    '''
+    formats = formats or list(Formats)
+    rng = random.Random(seed)
+    # format : [(score, params)] for time per byte and for depth
+    slow = {fmt: [(0, defaults(fmt))] for fmt in formats}
+    deep = {fmt: [(0, defaults(fmt))] for fmt in formats}
+    seen = set()
+    with tempfile.TemporaryDirectory() as tmpd:
+        for it in range(iterations):
+            fmt = rng.choice(formats)
+            pool = rng.choice([slow, deep])[fmt]
+            params = mutate(rng, fmt, rng.choice(pool)[1])
+            params['seed'] = rng.randrange(1000)
+            name, text, res = evaluate(fmt, params, budget, rate, tmpd)
+            if res[0] != 'ok':
+                params, res = shrink(fmt, params, budget, rate, tmpd, res)
+                name, text = generate(fmt, **params)
+                key = (fmt, kind(res))
+                if key not in seen:
+                    seen.add(key)
+                    dirname = save(out_dir, fmt, params, name, text, res,
+                                   allowance(text, budget, rate))
+                    if log:
+                        print(f'{it:5} {fmt:<8} {res[0]}: {res[1]} -> {dirname}', file=log)
+                    yield dirname
+                continue
+            seconds, depth = res[1], res[2]
+            per_kb = seconds * 1024 / max(len(text), 1)
+            for pop, score in [(slow[fmt], per_kb), (deep[fmt], depth)]:
+                pop.append((score, params))
+                pop.sort(key=lambda sp: -sp[0])
+                del pop[keep:]
+            if log:
+                print(f'{it:5} {fmt:<8} {len(text):9}B {seconds:8.4f}s depth {depth:5}', file=log)
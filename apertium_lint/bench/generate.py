@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+
+'''
+Deterministic generators of synthetic Apertium source files.
+
+Each generator takes a size n (the number of entries, stems or rules)
+and a seed, and returns the text of a file of roughly that size with
+the shapes found in real language data: paradigms which refer to other
+paradigms, multichar symbols, overlapping categories, and so on.
+The same arguments always give the same text.
+'''
+
+import random
+
+Letters = 'abcdefghijklmnopqrstuvwxyz'
+Tags = ['n', 'vblex', 'adj', 'adv', 'pr', 'det', 'prn', 'np']
+Inflection = ['sg', 'pl', 'nom', 'acc', 'gen', 'dat', 'pres', 'past', 'inf',
+              'p1', 'p2', 'p3', 'm', 'f', 'nt', 'def', 'ind']
+
+def word(rng, lo=3, hi=9):
+    return ''.join(rng.choice(Letters) for _ in range(rng.randint(lo, hi)))
+
+def words(rng, n, lo=3, hi=9):
+    '''n distinct words'''
+    seen = set()
+    ret = []
+    while len(ret) < n:
+        w = word(rng, lo, hi)
+        if w not in seen:
+            seen.add(w)
+            ret.append(w)
+    return ret
+
+def s_tags(tags):
+    return ''.join(f'<s n="{t}"/>' for t in tags)
+
+def monodix(n, seed=0, pardefs=None, depth=3, chain=1, cont=0.3,
+            blank=0.05, cycles=0):
+    '''
+    A monolingual dictionary with n entries in the main section and
+    pardefs paradigms (n/20 by default).
+    Paradigm entries continue into one of the depth paradigms before them
+    with probability cont, and have nothing on the left with probability
+    blank. The first cycles paradigms also have an empty entry which
+    continues into a later paradigm (or the same one), making loops.
+    Each entry in the main section has chain - 1 prefix paradigms before
+    the stem.
+    '''
+    rng = random.Random(seed)
+    pardefs = pardefs or max(1, n // 20)
+    sufs = words(rng, pardefs, 1, 4)
+    names = [f'{w}/{s}__{rng.choice(Tags)}' for w, s in zip(words(rng, pardefs), sufs)]
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<dictionary>',
+             f'  <alphabet>{Letters}{Letters.upper()}</alphabet>', '  <sdefs>']
+    lines += [f'    <sdef n="{t}"/>' for t in Tags + Inflection]
+    lines += ['  </sdefs>', '  <pardefs>']
+    for i, name in enumerate(names):
+        lines.append(f'    <pardef n="{name}">')
+        suf = name.split('/')[1].split('__')[0]
+        for j in range(rng.randint(1, 4)):
+            tags = s_tags([name.split('__')[1]] + rng.sample(Inflection, 2))
+            ending = suf + word(rng, 0, 2)
+            if rng.random() < blank:
+                ending = ''
+            par = ''
+            if i > 0 and rng.random() < cont:
+                k = rng.randrange(max(0, i - depth), i)
+                par = f'<par n="{names[k]}"/>'
+            lines.append(f'      <e><p><l>{ending}</l><r>{ending}{tags}</r></p>{par}</e>')
+        if i < cycles:
+            k = rng.randrange(i, len(names))
+            lines.append(f'      <e><p><l></l><r>{tags}</r></p><par n="{names[k]}"/></e>')
+        lines.append('    </pardef>')
+    lines += ['  </pardefs>', '  <section id="main" type="standard">']
+    for stem in words(rng, n):
+        name = rng.choice(names)
+        suf = name.split('/')[1].split('__')[0]
+        if rng.random() < 0.05:
+            other = word(rng)
+            lines.append(f'    <e lm="{stem} {other}"><i>{stem}<b/>{other}</i><par n="{name}"/></e>')
+        else:
+            pre = ''.join(f'<par n="{rng.choice(names)}"/>'
+                          for _ in range(chain - 1))
+            lines.append(f'    <e lm="{stem}{suf}">{pre}<i>{stem}</i><par n="{name}"/></e>')
+    lines += ['  </section>', '</dictionary>', '']
+    return '\n'.join(lines)
+
+def bidix(n, seed=0):
+    '''A bilingual dictionary with n entries.'''
+    rng = random.Random(seed)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<dictionary>',
+             '  <alphabet/>', '  <sdefs>']
+    lines += [f'    <sdef n="{t}"/>' for t in Tags + Inflection]
+    lines += ['  </sdefs>', '  <section id="main" type="standard">']
+    for left, right in zip(words(rng, n), words(rng, n)):
+        tag = s_tags([rng.choice(Tags)])
+        restrict = rng.choice(['', '', '', ' r="LR"', ' r="RL"'])
+        lines.append(f'    <e{restrict}><p><l>{left}{tag}</l><r>{right}{tag}</r></p></e>')
+    lines += ['  </section>', '</dictionary>', '']
+    return '\n'.join(lines)
+
+def lexc(n, seed=0, multichars=None, layers=0, width=2, cycles=0):
+    '''
+    An lexc file with n stems spread over continuation lexicons, and
+    multichars multichar symbols (tags and archiphonemes).
+    layers adds that many layers of width lexicons, each of which
+    continues into every lexicon of the next layer without adding
+    anything, and finally into #. cycles adds a loop of that many
+    lexicons which only continue into each other.
+    '''
+    rng = random.Random(seed)
+    multichars = multichars or max(len(Tags + Inflection), n // 50)
+    tags = [f'%<{t}%>' for t in Tags + Inflection]
+    tags += [f'%<x{i}%>' for i in range(max(0, multichars - len(tags) - 4))]
+    archi = ['%{A%}', '%{I%}', '%{n%}', '%{y%}']
+    lines = ['Multichar_Symbols']
+    lines += tags + archi
+    lines += ['', 'LEXICON Root', '']
+    conts = [f'{t.upper()}-INFL' for t in Tags[:4]]
+    lines += [f'{c}-STEMS ;' for c in conts]
+    if layers:
+        lines += [f'LAYER-0-{k} ;' for k in range(width)]
+    if cycles:
+        lines.append('CYCLE-0 ;')
+    for c, t in zip(conts, Tags):
+        lines += ['', f'LEXICON {c}-STEMS', '']
+        for stem in words(rng, max(1, n // len(conts))):
+            if rng.random() < 0.1:
+                lines.append(f'{stem}:{stem}{rng.choice(archi)} {c} ; ! {word(rng)}')
+            else:
+                lines.append(f'{stem} {c} ;')
+        lines += ['', f'LEXICON {c}', '']
+        for _ in range(rng.randint(2, 5)):
+            tg = f'%<{t}%>' + ''.join(rng.sample(tags, 2))
+            lines.append(f'{tg}:{rng.choice(archi)}{word(rng, 0, 2)} # ;')
+    for l in range(layers):
+        for k in range(width):
+            lines += ['', f'LEXICON LAYER-{l}-{k}', '']
+            if l + 1 < layers:
+                lines += [f'LAYER-{l+1}-{m} ;' for m in range(width)]
+            else:
+                lines.append('# ;')
+    for i in range(cycles):
+        lines += ['', f'LEXICON CYCLE-{i}', '', f'CYCLE-{(i + 1) % cycles} ;']
+    lines.append('')
+    return '\n'.join(lines)
+
+def lexd(n, seed=0):
+    '''A lexd file with n lexicon entries and n/20 patterns.'''
+    rng = random.Random(seed)
+    lexicons = [f'Lex{i}' for i in range(max(2, n // 50))]
+    lines = ['PATTERNS']
+    for _ in range(max(1, n // 20)):
+        parts = rng.sample(lexicons, min(len(lexicons), rng.randint(1, 3)))
+        if rng.random() < 0.2:
+            parts.insert(0, f'[<{rng.choice(Tags)}>:]')
+        lines.append(' '.join(parts))
+    per = max(1, n // len(lexicons))
+    for lex in lexicons:
+        lines += ['', f'LEXICON {lex}']
+        for w in words(rng, per):
+            if rng.random() < 0.5:
+                lines.append(f'{w}<{rng.choice(Tags)}>:{w}')
+            else:
+                lines.append(w)
+    lines.append('')
+    return '\n'.join(lines)
+
+def twolc(n, seed=0):
+    '''A twolc file with n rules over an alphabet with archiphonemes.'''
+    rng = random.Random(seed)
+    archi = [f'%{{{c}%}}' for c in 'AEIOUKGN']
+    pairs = [f'{a}:{rng.choice(Letters)}' for a in archi for _ in range(2)]
+    lines = ['Alphabet']
+    lines.append('  ' + ' '.join(Letters) + ' ' + ' '.join(sorted(set(pairs))) + ' ;')
+    lines += ['', 'Sets', '  Vow = a e i o u ;', '  Cns = b c d f g k l m n p r s t ;',
+              '', 'Rules']
+    for i in range(n):
+        pair = rng.choice(pairs)
+        left = rng.choice(['Vow', 'Cns', '#', rng.choice(Letters)])
+        right = rng.choice(['Vow', 'Cns', '', rng.choice(Letters)])
+        lines += [f'"rule {i}"', f'{pair} <=> {left} _ {right} ;', '']
+    return '\n'.join(lines)
+
+def rlx(n, seed=0):
+    '''A Constraint Grammar with n rules over n/5 sets.'''
+    rng = random.Random(seed)
+    sets = [f'S{i}' for i in range(max(2, n // 5))]
+    lines = ['DELIMITERS = "<.>" "<!>" "<?>" ;', '']
+    for s in sets:
+        lines.append(f'LIST {s} = ' + ' '.join(rng.sample(Tags + Inflection, 3)) + ' ;')
+    lines += ['', 'SECTION', '']
+    for _ in range(n):
+        op = rng.choice(['SELECT', 'REMOVE'])
+        pos = rng.choice(['-1', '1', '-2', '2', '0', '*1', '-1*'])
+        lines.append(f'{op} {rng.choice(sets)} IF ({pos} {rng.choice(sets)}) ;')
+    lines.append('')
+    return '\n'.join(lines)
+
+def t1x(n, seed=0, cats=None, overlap=0.3):
+    '''
+    A chunker with n rules of one to three pattern items over cats
+    categories (n/4 by default). Each category has one to three items,
+    each of which is shared with a few other categories with probability
+    overlap.
+    '''
+    rng = random.Random(seed)
+    cats = cats or max(2, n // 4)
+    names = [f'cat{i}' for i in range(cats)]
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<transfer default="chunk">',
+             '  <section-def-cats>']
+    for name in names:
+        lines.append(f'    <def-cat n="{name}">')
+        for k in range(rng.randint(1, 3)):
+            if rng.random() < overlap:
+                t = f'{rng.choice(Tags)}.s{rng.randrange(max(1, cats // 4))}'
+            else:
+                t = f'{rng.choice(Tags)}.{name}.{k}'
+            lines.append(f'      <cat-item tags="{t}.*"/>')
+        lines.append('    </def-cat>')
+    lines += ['  </section-def-cats>', '  <section-def-attrs>',
+              '    <def-attr n="nbr">', '      <attr-item tags="sg"/>',
+              '      <attr-item tags="pl"/>', '    </def-attr>',
+              '  </section-def-attrs>', '  <section-def-vars>',
+              '    <def-var n="number"/>', '  </section-def-vars>',
+              '  <section-def-macros>',
+              '    <def-macro n="set_number" npar="1">',
+              '      <let><var n="number"/><clip pos="1" side="tl" part="nbr"/></let>',
+              '    </def-macro>', '  </section-def-macros>', '  <section-rules>']
+    for i in range(n):
+        pat = [rng.choice(names) for _ in range(rng.randint(1, 3))]
+        lines.append(f'    <rule comment="rule {i}">')
+        lines.append('      <pattern>')
+        lines += [f'        <pattern-item n="{p}"/>' for p in pat]
+        lines.append('      </pattern>')
+        lines.append('      <action>')
+        lines.append('        <call-macro n="set_number"><with-param pos="1"/></call-macro>')
+        lines.append('        <out>')
+        for j in range(1, len(pat) + 1):
+            if j > 1:
+                lines.append('          <b/>')
+            lines.append(f'          <chunk name="c{j}"><tags><tag><lit-tag v="SN"/></tag></tags>'
+                         f'<lu><clip pos="{j}" side="tl" part="whole"/></lu></chunk>')
+        lines.append('        </out>')
+        lines.append('      </action>')
+        lines.append('    </rule>')
+    lines += ['  </section-rules>', '</transfer>', '']
+    return '\n'.join(lines)
+
+def rtx(n, seed=0):
+    '''An RTX file with n reduction rules.'''
+    rng = random.Random(seed)
+    lines = ['number = sg pl ND ;', 'gender = m f GD ;', '',
+             'NP: _.number.gender ;', 'N: _.number.gender ;',
+             'D: _.number ;', 'A: _.gender ;', '']
+    cats = ['n', 'det', 'adj', 'NP']
+    out = {'n': 'N', 'det': 'D', 'adj': 'A', 'NP': 'NP'}
+    for i in range(n):
+        pat = [rng.choice(cats) for _ in range(rng.randint(1, 3))]
+        body = ' _ '.join(str(j) for j in range(1, len(pat) + 1))
+        w = rng.randint(1, 9)
+        lines.append(f'NP -> {w}: ' + ' '.join(pat) + f' {{ {body} }} ;')
+    lines.append('')
+    return '\n'.join(lines)
+
+def lrx(n, seed=0):
+    '''A lexical selection file with n rules and some macros.'''
+    rng = random.Random(seed)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<rules>']
+    for i in range(n):
+        lem = word(rng)
+        tag = rng.choice(Tags)
+        ctx = ''
+        if rng.random() < 0.5:
+            ctx = f'<match tags="{rng.choice(Tags)}.*"/>'
+        lines.append(f'  <rule weight="{rng.randint(1, 9)}.0">{ctx}'
+                     f'<match lemma="{lem}" tags="{tag}.*"><select lemma="{word(rng)}"/></match></rule>')
+    lines += ['</rules>', '']
+    return '\n'.join(lines)
+
+# format : (file name, generator)
+Formats = {
+    'monodix': ('apertium-xxx.xxx.dix', monodix),
+    'bidix': ('apertium-xxx-yyy.xxx-yyy.dix', bidix),
+    'lexc': ('apertium-xxx.xxx.lexc', lexc),
+    'lexd': ('apertium-xxx.xxx.lexd', lexd),
+    'twolc': ('apertium-xxx.xxx.twol', twolc),
+    'rlx': ('apertium-xxx.xxx.rlx', rlx),
+    't1x': ('apertium-xxx-yyy.xxx-yyy.t1x', t1x),
+    'rtx': ('apertium-xxx-yyy.xxx-yyy.rtx', rtx),
+    'lrx': ('apertium-xxx-yyy.xxx-yyy.lrx', lrx),
+}
+
+def generate(fmt, n, seed=0, **kwargs):
+    '''Return (file name, text) for n items of format fmt.'''
+    name, fn = Formats[fmt]
+    return name, fn(n, seed=seed, **kwargs)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+'''
+Time each linter on generated files of increasing size, and compare
+the results of two runs.
+'''
+
+from .generate import Formats, generate
+from ..file_linter import lint
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+Sizes = [100, 1000, 10000]
+
+def time_file(path, repeat=3):
+    '''
+    Best wall-clock time of repeat runs, the number of diagnostics, and
+    the name of the linter class.
+    '''
+    best = None
+    count = 0
+    name = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        linter = lint(path, check=True, stats=True)
+        res = linter.get_results()
+        seconds = time.perf_counter() - start
+        count = len(res['checks'])
+        name = type(linter).__name__
+        if best is None or seconds < best:
+            best = seconds
+    return best, count, name
+
+def exponent(points):
+    '''
+    Slope of the least-squares line through [(size, seconds)] on a log-log
+    scale, so 1 is linear and 2 is quadratic.
+    '''
+    pts = [(math.log(n), math.log(s)) for n, s in points if n > 0 and s > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(x for x, y in pts) / len(pts)
+    my = sum(y for x, y in pts) / len(pts)
+    den = sum((x - mx) ** 2 for x, y in pts)
+    if den == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in pts) / den
+
+def run(formats=None, sizes=None, repeat=3, seed=0, log=None):
+    formats = formats or list(Formats)
+    sizes = sizes or Sizes
+    results = []
+    scaling = {}
+    with tempfile.TemporaryDirectory() as tmpd:
+        for fmt in formats:
+            points = []
+            for n in sizes:
+                name, text = generate(fmt, n, seed=seed)
+                path = os.path.join(tmpd, name)
+                with open(path, 'w') as fout:
+                    fout.write(text)
+                seconds, count, linter = time_file(path, repeat)
+                results.append({'format': fmt, 'linter': linter, 'size': n,
+                                'bytes': len(text.encode('utf-8')),
+                                'seconds': seconds, 'diagnostics': count})
+                points.append((n, seconds))
+                if log:
+                    print(f'{fmt:<8} {n:>8} {seconds:10.4f}s', file=log)
+            scaling[fmt] = exponent(points)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+        'scaling': scaling,
+    }
+
+def compare(old, new, threshold=0.25, min_seconds=0.005):
+    '''
+    Yield (format, size, old seconds, new seconds, ratio) for each result
+    which got slower by more than threshold (as a fraction).
+    Results under min_seconds in both runs are too noisy to compare.
+    '''
+    before = {(r['format'], r['size']): r['seconds'] for r in old['results']}
+    for r in new['results']:
+        key = (r['format'], r['size'])
+        if key not in before:
+            continue
+        was = before[key]
+        now = r['seconds']
+        if max(was, now) < min_seconds:
+            continue
+        ratio = now / was if was > 0 else math.inf
+        if ratio > 1 + threshold:
+            yield r['format'], r['size'], was, now, ratio
+
+def load(fname):
+    with open(fname) as fin:
+        return json.load(fin)
+
+def dump(data, fname):
+    if fname == '-':
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return
+    with open(fname, 'w') as fout:
+        json.dump(data, fout, indent=2)
+        fout.write('\n')
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+from .file_linter import FileLinter
+from .runner import Settings
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'apertium-lint')
+
+@functools.lru_cache(maxsize=None)
+def environment_key():
+    '''
+    A string identifying everything other than the file itself that can
+    change the output of a linter: the versions of this package and of
+    the parsers, along with the state of the linter source files
+    (so that running from a checkout doesn't return stale results).
+    '''
+    from importlib import metadata
+    parts = []
+    for pkg in ['apertium_lint', 'tree-sitter-apertium', 'tree-sitter', 'lxml']:
+        try:
+            parts.append(pkg + '=' + metadata.version(pkg))
+        except metadata.PackageNotFoundError:
+            parts.append(pkg + '=')
+    src = os.path.dirname(os.path.abspath(__file__))
+    for root, dirs, files in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for name in sorted(files):
+            if name.endswith('.py'):
+                st = os.stat(os.path.join(root, name))
+                parts.append(f'{name}:{st.st_size}:{st.st_mtime_ns}')
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as fin:
+        for block in iter(lambda: fin.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+class ResultCache:
+    '''
+    On-disk cache of FileLinter.get_results(), keyed by the content of
+    the file, the linter class, the check/stats flags, the Selection,
+    the command line settings in runner.Settings, and environment_key().
+
+    To avoid rehashing unchanged files, the content hash of each path is
+    stored along with its mtime and size, and only recomputed when
+    those change.
+    '''
+    # files modified more recently than this many seconds ago might be
+    # modified again without changing the mtime, so don't trust it
+    RacyWindow = 2
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+    def _entry(self, kind, key):
+        return os.path.join(self.directory, kind, key[:2], key[2:] + '.json')
+    def _read(self, kind, key):
+        try:
+            with open(self._entry(kind, key), 'r', encoding='utf-8') as fin:
+                return json.load(fin)
+        except (OSError, ValueError):
+            return None
+    def _write(self, kind, key, blob):
+        pth = self._entry(kind, key)
+        try:
+            os.makedirs(os.path.dirname(pth), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(pth))
+            with os.fdopen(fd, 'w', encoding='utf-8') as fout:
+                json.dump(blob, fout)
+            os.replace(tmp, pth)
+        except OSError:
+            # the cache is an optimization, so failing to write it
+            # shouldn't fail the lint run
+            pass
+    def file_digest(self, path):
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        pkey = hashlib.sha256(path.encode('utf-8', 'surrogateescape')).hexdigest()
+        ent = self._read('index', pkey)
+        if (ent and ent.get('path') == path and
+            ent.get('mtime') == st.st_mtime_ns and ent.get('size') == st.st_size):
+            return ent['digest']
+        digest = hash_file(path)
+        if st.st_mtime_ns < (time.time() - self.RacyWindow) * 1e9:
+            self._write('index', pkey, {
+                'path': path,
+                'mtime': st.st_mtime_ns,
+                'size': st.st_size,
+                'digest': digest,
+            })
+        return digest
+    def key(self, path, cls, check, stats, selection=None, data=None):
+        '''
+        The key for the results of linting path, or data if it is given
+        (see lint_bytes()).
+        '''
+        if data is None:
+            digest = self.file_digest(path)
+        else:
+            digest = hashlib.sha256(data).hexdigest()
+        parts = [
+            digest,
+            cls.__module__ + '.' + cls.__qualname__,
+            f'check={bool(check)}',
+            f'stats={bool(stats)}',
+            f'selection={selection!r}',
+            environment_key(),
+        ]
+        # e.g. --skip-size changes the results for large files
+        parts += [f'{k}={getattr(FileLinter, k)!r}' for k in Settings]
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+    def get(self, key):
+        res = self._read('results', key)
+        if res is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return res
+    def put(self, key, results):
+        self._write('results', key, results)
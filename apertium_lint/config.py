@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+from .file_linter import Selection, unknown_checks
+from .ignore import translate
+import os
+import re
+import sys
+
+ConfigName = '.apertium-lint.toml'
+
+def load_toml(path):
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            print(f'Warning: ignoring {path} (reading it requires tomli on Python < 3.11)',
+                  file=sys.stderr)
+            return {}
+    with open(path, 'rb') as fin:
+        return tomllib.load(fin)
+
+class ConfigError(ValueError):
+    pass
+
+def validate(names, where):
+    '''
+    Raise ConfigError if any of names is not a report type, check
+    method, or cost, since a misspelled --select would otherwise
+    silently disable everything.
+    '''
+    if not names:
+        return
+    unknown = sorted(unknown_checks(names))
+    if unknown:
+        raise ConfigError(f'{where}: unknown check name(s): {", ".join(unknown)} (see --list-checks)')
+
+def as_list(val, where, names=True):
+    if val is None:
+        return None
+    if isinstance(val, str):
+        val = [val]
+    if not isinstance(val, list) or not all(isinstance(v, str) for v in val):
+        raise ConfigError(f'{where} must be a list of strings')
+    if names:
+        validate(val, where)
+    return val
+
+class ConfigFile:
+    '''
+    The contents of a single .apertium-lint.toml:
+
+        select = ['...']    # only these (default: everything)
+        ignore = ['...']    # except these
+
+        [[overrides]]
+        paths = ['generated/*.dix']
+        ignore = ['check_space_blank']
+
+    Entries can be report types, check method names, or costs
+    (cheap, linear, superlinear).
+    Override paths are gitignore-style patterns relative to the directory
+    containing the file. Later overrides take precedence: select
+    replaces the list so far and ignore adds to it.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.root = os.path.dirname(os.path.abspath(path))
+        blob = load_toml(path)
+        self.select = as_list(blob.get('select'), f'{path}: select')
+        self.ignore = as_list(blob.get('ignore'), f'{path}: ignore') or []
+        self.overrides = [] # (regex, select, ignore)
+        for i, ov in enumerate(blob.get('overrides', [])):
+            where = f'{path}: overrides[{i}]'
+            pats = as_list(ov.get('paths'), where + '.paths', False) or []
+            # a pattern matching a directory applies to everything in it
+            rx = re.compile('(?:' + '|'.join(translate(p.rstrip('/'))
+                                             for p in pats) + ')(?:/.*)?$',
+                            re.DOTALL)
+            self.overrides.append((rx if pats else None,
+                                   as_list(ov.get('select'), where + '.select'),
+                                   as_list(ov.get('ignore'), where + '.ignore') or []))
+    def lists_for(self, path):
+        select = self.select
+        ignore = list(self.ignore)
+        rel = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+        for rx, sel, ign in self.overrides:
+            if rx is None or not rx.match(rel):
+                continue
+            if sel is not None:
+                select = sel
+            ignore += ign
+        return select, ignore
+
+class Config:
+    '''
+    Work out the Selection for each file from the nearest
+    .apertium-lint.toml and the --select and --ignore options.
+    --select replaces the select list from the file and --ignore adds
+    to its ignore list.
+    '''
+    def __init__(self, select=None, ignore=(), use_files=True):
+        validate(select, '--select')
+        validate(ignore, '--ignore')
+        self.select = select
+        self.ignore = list(ignore)
+        self.use_files = use_files
+        self.files = {} # directory : ConfigFile or None
+        self.selections = {}
+    def find(self, dirname):
+        if dirname in self.files:
+            return self.files[dirname]
+        pth = os.path.join(dirname, ConfigName)
+        if os.path.isfile(pth):
+            ret = ConfigFile(pth)
+        else:
+            parent = os.path.dirname(dirname)
+            ret = None if parent == dirname else self.find(parent)
+        self.files[dirname] = ret
+        return ret
+    def selection_for(self, path):
+        '''
+        Return a Selection for path, or None if nothing is disabled.
+        '''
+        select, ignore = None, []
+        if self.use_files:
+            conf = self.find(os.path.dirname(os.path.abspath(path)))
+            if conf is not None:
+                select, ignore = conf.lists_for(path)
+        if self.select is not None:
+            select = self.select
+        ignore = ignore + self.ignore
+        if select is None and not ignore:
+            return None
+        key = (None if select is None else tuple(sorted(select)),
+               tuple(sorted(set(ignore))))
+        if key not in self.selections:
+            self.selections[key] = Selection(select, ignore)
+        return self.selections[key]
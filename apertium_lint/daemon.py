@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+'''
+A server which keeps the linters (along with lxml, the tree-sitter
+grammars and compiled queries) loaded between runs, and a client which
+sends it a command line and prints what it outputs.
+
+Each request is one line of JSON from the client:
+    {"argv": [...], "prog": "...", "cwd": "...", "stdin": base64 or null}
+and the server replies with one line:
+    {"stdout": "...", "stderr": "...", "status": N}
+Requests are handled one at a time, since they change the working
+directory and sys.stdout of the server.
+'''
+
+from contextlib import redirect_stderr, redirect_stdout
+import base64
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import traceback
+
+def default_socket():
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    name = 'apertium-lint.sock'
+    if not os.environ.get('XDG_RUNTIME_DIR') and hasattr(os, 'getuid'):
+        # the temporary directory is shared with other users
+        name = f'apertium-lint-{os.getuid()}.sock'
+    return os.path.join(base, name)
+
+# options which either don't return (and so would block every other
+# client) or only make sense outside the daemon
+Unsupported = ['daemon', 'client', 'watch', 'lsp']
+
+class Terminated(BaseException):
+    '''
+    Raised by SIGTERM. Not a SystemExit, which handle() catches, so that
+    it stops the daemon even in the middle of a request.
+    '''
+
+def handle(req):
+    '''Run the command line in req as main() would and capture the output.'''
+    from . import make_parser, run
+    out = io.StringIO()
+    err = io.StringIO()
+    status = 0
+    cwd = os.getcwd()
+    stdin = sys.stdin
+    try:
+        os.chdir(req['cwd'])
+        sys.stdin = io.TextIOWrapper(
+            io.BytesIO(base64.b64decode(req.get('stdin') or '')))
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                parser = make_parser(req.get('prog'))
+                args = parser.parse_args(req['argv'])
+                for opt in Unsupported:
+                    if getattr(args, opt):
+                        parser.error(f'--{opt} can\'t be run by the daemon')
+                run(args, parser)
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                    status = 1
+                else:
+                    status = e.code or 0
+            except Exception:
+                traceback.print_exc()
+                status = 1
+    except OSError as e:
+        print(f'{req.get("prog") or "apertium-lint"}: {e}', file=err)
+        status = 1
+    finally:
+        os.chdir(cwd)
+        sys.stdin = stdin
+    return {'stdout': out.getvalue(), 'stderr': err.getvalue(),
+            'status': status}
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        resp = handle(json.loads(line))
+        self.wfile.write(json.dumps(resp).encode('utf-8') + b'\n')
+
+def make_server(path):
+    '''
+    Listen on the Unix socket path, replacing it if it was left behind
+    by a daemon which is no longer running.
+    '''
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise OSError(f'a daemon is already listening on {path}')
+    # only the current user can connect
+    mask = os.umask(0o177)
+    try:
+        return socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(mask)
+
+def serve(path):
+    server = make_server(path)
+    print(f'Listening on {path}', file=sys.stderr)
+    # clean up the socket when killed as well as on ^C
+    def terminate(*args):
+        raise Terminated()
+    signal.signal(signal.SIGTERM, terminate)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, Terminated):
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+def request(path, argv, prog=None, stdin=None):
+    '''
+    Send argv to the daemon at path and return its reply.
+    Raises OSError if no daemon is listening there.
+    '''
+    req = {'argv': list(argv), 'prog': prog, 'cwd': os.getcwd(),
+           'stdin': base64.b64encode(stdin).decode('ascii') if stdin else None}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile('rwb') as conn:
+            conn.write(json.dumps(req).encode('utf-8') + b'\n')
+            conn.flush()
+            line = conn.readline()
+    if not line:
+        raise OSError(f'no reply from daemon on {path}')
+    return json.loads(line)
+
+def client_argv(argv):
+    '''argv without --client and --socket, which are for the client.'''
+    ret = []
+    it = iter(argv)
+    for arg in it:
+        if arg == '--':
+            ret.append(arg)
+            ret += it
+        elif arg == '--socket':
+            next(it, None)
+        elif arg != '--client' and not arg.startswith('--socket='):
+            ret.append(arg)
+    return ret
+
+def client(path, argv, prog=None):
+    '''
+    Have the daemon at path run argv, print what it printed, and return
+    its exit status, or None if there is no daemon.
+    '''
+    argv = client_argv(argv)
+    stdin = None
+    if '-' in argv or any(a.startswith('--stdin-filename') for a in argv):
+        stdin = sys.stdin.buffer.read()
+    try:
+        resp = request(path, argv, prog, stdin)
+    except OSError:
+        if stdin is not None:
+            # the caller will read it again
+            sys.stdin = io.TextIOWrapper(io.BytesIO(stdin))
+        return None
+    sys.stdout.write(resp['stdout'])
+    sys.stderr.write(resp['stderr'])
+    sys.stdout.flush()
+    return resp['status']
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 
 from collections import defaultdict
-import inspect
+import codecs
+import importlib
+import io
+import itertools
 import os.path
 import re
-from unicodedata import normalize
+from time import perf_counter
+from unicodedata import is_normalized, normalize
 
 class Verbosity:
     Error = 1
@@ -12,7 +16,118 @@ class Verbosity:
     Suggestion = 3
     Nitpick = 4
 
+class Cost:
+    '''How the running time of a check grows with the size of the file.'''
+    Cheap = 'cheap'
+    Linear = 'linear'
+    Superlinear = 'superlinear'
+
+class Selection:
+    '''
+    Which checks to run and report, given as sets of report types
+    (e.g. 'NBSP'), check methods (e.g. 'check_space_blank') or costs
+    (e.g. 'superlinear').
+    If select is None, everything not in ignore is enabled.
+    '''
+    def __init__(self, select=None, ignore=()):
+        self.select = None if select is None else frozenset(select)
+        self.ignore = frozenset(ignore)
+        self._enabled = {} # class : report types
+        self._checks = {} # class : check methods
+    def __eq__(self, other):
+        return (isinstance(other, Selection) and self.select == other.select
+                and self.ignore == other.ignore)
+    def __hash__(self):
+        return hash((self.select, self.ignore))
+    def __repr__(self):
+        sel = None if self.select is None else sorted(self.select)
+        return f'Selection({sel!r}, {sorted(self.ignore)!r})'
+    def __getstate__(self):
+        return (self.select, self.ignore)
+    def __setstate__(self, state):
+        self.select, self.ignore = state
+        self._enabled = {}
+        self._checks = {}
+    def check_ignored(self, name, info):
+        return name in self.ignore or info[0] in self.ignore
+    def enabled_reports(self, cls):
+        if cls in self._enabled:
+            return self._enabled[cls]
+        checks = cls.all_check_info()
+        ret = set()
+        for key in cls.all_report_types():
+            if key in self.ignore:
+                continue
+            sources = [(n, info) for n, info in checks.items()
+                       if key in info[1]]
+            live = [(n, info) for n, info in sources
+                    if not self.check_ignored(n, info)]
+            if sources and not live:
+                continue
+            if self.select is not None:
+                tags = {key}
+                for n, info in live:
+                    tags.update([n, info[0]])
+                if tags.isdisjoint(self.select):
+                    continue
+            ret.add(key)
+        self._enabled[cls] = frozenset(ret)
+        return self._enabled[cls]
+    def enabled_checks(self, cls):
+        '''
+        The methods in cls.CheckInfo which need to run, either because
+        they report something which is enabled or because such a check
+        depends on them.
+        '''
+        if cls in self._checks:
+            return self._checks[cls]
+        checks = cls.all_check_info()
+        enabled = self.enabled_reports(cls)
+        todo = [n for n, info in checks.items()
+                if not info[1] or (not self.check_ignored(n, info)
+                                   and not enabled.isdisjoint(info[1]))]
+        ret = set()
+        while todo:
+            n = todo.pop()
+            if n in ret:
+                continue
+            ret.add(n)
+            todo += [d for d in checks[n][2] if d in checks]
+        self._checks[cls] = frozenset(ret)
+        return self._checks[cls]
+
+# Objects which observe each phase of lint() (see Probe).
+# When it is empty, the only cost is checking that it is.
+Probes = []
+
+class Probe:
+    '''
+    Base class for observers of lint(), which are enabled by adding
+    them to Probes.
+    begin() is called at the start of each phase of linting a file and
+    its return value is passed to the matching end(). The phases are
+    'lint' (the whole file), 'load', each check and stat method, and
+    'get_results'. Since per_ hooks are called once for each node,
+    each of them is reported once with add() instead.
+    Probes given to run_files() with several jobs are copied to each
+    worker, and drain() and merge() bring what they collect back.
+    '''
+    def begin(self, linter, phase):
+        return None
+    def end(self, linter, phase, token):
+        pass
+    def add(self, linter, phase, seconds, calls):
+        pass
+    def drain(self):
+        return None
+    def merge(self, data):
+        pass
+
+def linter_spec(cls):
+    return cls.__module__ + ':' + cls.__qualname__
+
 class FileLinter:
+    # Classes may be given as 'module:ClassName' (see declare())
     Extensions = {} # str:class
     Identifiers = [] # (regex, class)
     PathIdentifiers = [] # same, but full path
@@ -24,24 +139,47 @@ class FileLinter:
         'NBSP': (Verbosity.Warn, 'Line contains non-breaking space.'),
         'undef': (Verbosity.Error, '{0} {1} used but not defined.'),
         'unuse': (Verbosity.Warn, '{0} {1} defined but not used.'),
+        'large-file': (Verbosity.Nitpick, 'File is {0} bytes, so its encoding was not checked.'),
     }
     StatLabels = {} # short label : full label
+    # check method : (cost, report types, helper analyses it calls)
+    # Checks with no entry, or no report types, are always run.
+    CheckInfo = {
+        'check_encoding': (Cost.Linear, ['noNL', 'unnorm', 'NBSP'], []),
+    }
+
+    # Files which aren't identified as anything more specific are sniffed
+    # before check_encoding() reads them: binary files are skipped,
+    # files over SampleSize bytes only have that many bytes checked,
+    # and files over SkipSize bytes aren't checked at all.
+    SniffSize = 8192
+    SampleSize = 16 << 20
+    SkipSize = 256 << 20
 
     RunStat = []
     RunCheck = []
     RunStatCheck = []
     RunPer = {}
 
-    def __init__(self, path):
+    def __init__(self, path, selection=None, data=None):
         self.path = path
+        # the contents of the file, if they have been read (see read())
+        # or were given to lint_bytes()
+        self.data = data
         self.reports = [] # (line, level, key, text)
-        self.statistics = defaultdict(lambda: 0)
+        self.statistics = defaultdict(int)
+        self.sample = None
+        self.selection = selection
+        self.enabled = None
+        if selection is not None:
+            self.enabled = selection.enabled_reports(type(self))
     def __init_subclass__(cls, *args, **kwargs):
         super.__init_subclass__(*args, **kwargs)
         stat_methods = []
         check_methods = []
         per_methods = defaultdict(lambda: [[], [], []])
-        for name, fn in inspect.getmembers(cls):
+        for name in dir(cls):
+            fn = getattr(cls, name)
             if not callable(fn):
                 continue
             if name.startswith('stat_'):
@@ -70,17 +208,67 @@ class FileLinter:
         cls.RunStatCheck = nsort(check_methods + stat_methods)
         cls.RunPer = {k:list(map(sorted, v))
                       for k, v in per_methods.items()}
+        cls.CheckNames = frozenset(cls.all_check_info())
         if isinstance(cls.Extensions, list):
             for e in cls.Extensions:
                 FileLinter.Extensions[e] = cls
-        for i in cls.Identifiers:
-            if isinstance(i, str):
-                FileLinter.Identifiers.append((re.compile(i), cls))
-        for pi in cls.PathIdentifiers:
-            if isinstance(pi, str):
-                FileLinter.PathIdentifiers.append((re.compile(pi), cls))
+        # replace the entries from declare(), if any, keeping their position
+        spec = linter_spec(cls)
+        def register(table, patterns):
+            for pat in patterns:
+                if not isinstance(pat, str):
+                    continue
+                for i, (r, c) in enumerate(table):
+                    if c == spec and r.pattern == pat:
+                        table[i] = (r, cls)
+                        break
+                else:
+                    table.append((re.compile(pat), cls))
+        register(FileLinter.Identifiers, cls.Identifiers)
+        register(FileLinter.PathIdentifiers, cls.PathIdentifiers)
+    def read(self):
+        '''The contents of the file as bytes, read from disk only once.'''
+        if self.data is None:
+            with open(self.path, 'rb') as fin:
+                self.data = fin.read()
+        return self.data
+    def open(self):
+        '''A binary file object for the contents of the file.'''
+        if self.data is None:
+            return open(self.path, 'rb')
+        return io.BytesIO(self.data)
+    @property
+    def size(self):
+        if self.data is None:
+            return os.path.getsize(self.path)
+        return len(self.data)
     def load(self):
+        try:
+            size = self.size
+            with self.open() as fin:
+                prefix = fin.read(self.SniffSize)
+        except OSError:
+            return True
+        if is_binary(prefix, size <= self.SniffSize):
+            return False
+        if size > self.SkipSize:
+            self.record('large-file', 1, size)
+            return False
+        if size > self.SampleSize:
+            self.sample = self.SampleSize
         return True
+    @classmethod
+    def _merged(cls, attr):
+        ret = {}
+        for c in reversed(cls.__mro__):
+            ret.update(c.__dict__.get(attr, {}))
+        return ret
+    @classmethod
+    def all_report_types(cls):
+        return cls._merged('ReportTypes')
+    @classmethod
+    def all_check_info(cls):
+        return cls._merged('CheckInfo')
     def _get_report_label(self, label):
         for cls in self.__class__.__mro__:
             if label in cls.ReportTypes:
@@ -88,6 +276,8 @@ class FileLinter:
         raise KeyError(f'Report type "{label}" is not defined.')
     def record(self, key, line, *args):
         level, fs = self._get_report_label(key)
+        if self.enabled is not None and key not in self.enabled:
+            return
         self.reports.append((line, level, key, fs.format(*args)))
     def _get_stat_label(self, label, default):
         for cls in self.__class__.__mro__:
@@ -120,7 +310,7 @@ class FileLinter:
                 elif k in dct:
                     dct = dct[k]
                 else:
-                    dct[k] = defaultdict(lambda: 0)
+                    dct[k] = defaultdict(int)
                     dct = dct[k]
     def record_stat(self, key, val=None, inc=None):
         cur = self.get_stat(key)
@@ -144,6 +334,10 @@ class FileLinter:
             ret[k] = sd
         return ret
     def get_results(self):
+        if Probes:
+            return self.observe('get_results', self.collect_results)
+        return self.collect_results()
+    def collect_results(self):
         rep = []
         for line, level, key, desc in sorted(self.reports):
             rep.append({
@@ -154,37 +348,111 @@ class FileLinter:
             })
         return {'stats': self.__process_stats(self.statistics), 'checks': rep}
 
+    def observe(self, phase, fn, *args):
+        probes = list(Probes)
+        tokens = [p.begin(self, phase) for p in probes]
+        try:
+            return fn(*args)
+        finally:
+            for p, t in zip(reversed(probes), reversed(tokens)):
+                p.end(self, phase, t)
     def __call_all(self, ls, *args):
+        if Probes:
+            for a in ls:
+                self.observe(a, getattr(self, a), *args)
+            return
         for a in ls:
             getattr(self, a).__call__(*args)
+    def __observe_per(self, node_type, per):
+        fns = [(n, getattr(self, n)) for n in per]
+        total = dict.fromkeys(per, 0.0)
+        calls = 0
+        for node in self.iter_type(node_type):
+            calls += 1
+            for n, fn in fns:
+                start = perf_counter()
+                fn(node)
+                total[n] += perf_counter() - start
+        for p in Probes:
+            for n in per:
+                p.add(self, n, total[n], calls)
     def iter_type(self, name):
         pass
+    def should_run(self, name):
+        '''
+        Whether check method name is needed for the selected report types.
+        '''
+        if self.selection is None or name not in self.CheckNames:
+            return True
+        return name in self.selection.enabled_checks(type(self))
+    def selected(self, ls):
+        return [n for n in ls if self.should_run(n)]
     def run_per(self):
         for k in sorted(self.RunPer.keys()):
             pre, per, post = self.RunPer[k]
+            per = self.selected(per)
+            post = self.selected(post)
+            if not per and not post:
+                continue
             self.__call_all(pre)
-            for node in self.iter_type(k):
-                self.__call_all(per, node)
+            if per and Probes:
+                self.__observe_per(k, per)
+            elif per:
+                self.run_per_type(k, per)
             self.__call_all(post)
+    def run_per_type(self, node_type, per):
+        '''Call each of the per_ hooks in per on every node_type node.'''
+        for node in self.iter_type(node_type):
+            self.__call_all(per, node)
+    def run(self, check=True, stats=False):
+        loaded = self.observe('load', self.load) if Probes else self.load()
+        if not loaded:
+            return
+        if check and stats:
+            self.run_statcheck()
+        elif check:
+            self.run_check()
+        elif stats:
+            self.run_stat()
     def run_stat(self):
         self.__call_all(self.RunStat)
     def run_check(self):
-        self.__call_all(self.RunCheck)
+        self.__call_all(self.selected(self.RunCheck))
     def run_statcheck(self):
-        self.__call_all(self.RunStatCheck)
+        # anything which gathers statistics still needs to run
+        self.__call_all([n for n in self.RunStatCheck
+                         if n in self.RunStat or self.should_run(n)])
     def check_encoding(self):
-        with open(self.path, 'rb') as fin:
+        with self.open() as fin:
+            if self.sample:
+                byt = fin.read(self.sample)
+                # only check complete lines
+                byt = byt[:byt.rfind(b'\n')+1]
+                fin.seek(-1, os.SEEK_END)
+                final = fin.read(1)
+            else:
+                byt = fin.read()
+                final = byt[-1:]
             try:
-                txt = fin.read().decode('utf-8')
+                txt = byt.decode('utf-8')
             except UnicodeDecodeError:
                 return
-            lines = txt.splitlines()
-            if txt and not txt.endswith('\n'):
-                self.record('noNL', len(lines))
-            for num, line in enumerate(lines, 1):
-                if normalize('NFC', line) != line:
+            if final and final != b'\n':
+                if self.sample:
+                    fin.seek(0)
+                    n = sum(b.count(b'\n')
+                            for b in iter(lambda: fin.read(1 << 20), b''))
+                    self.record('noNL', n + 1)
+                else:
+                    self.record('noNL', len(txt.splitlines()))
+            unnorm = not is_normalized('NFC', txt)
+            nbsp = ' ' in txt
+            if not unnorm and not nbsp:
+                return
+            for num, line in enumerate(txt.splitlines(), 1):
+                if unnorm and normalize('NFC', line) != line:
                     self.record('unnorm', num)
-                if ' ' in line:
+                if nbsp and ' ' in line:
                     self.record('NBSP', num)
     def warn_def_use(self, check_dict, ref_dict, err):
         '''
@@ -200,6 +468,10 @@ class FileLinter:
                 for ln in ls:
                     self.record(err, ln, lab)
 
+# __init_subclass__ isn't called for FileLinter itself, but unrecognized
+# files still need check_encoding()
+FileLinter.__init_subclass__()
+
 class SkipLinting(FileLinter):
     Extensions = [
         'bin', 'prob', 'zhfst', 'hfst', 'gz', 'mode', # compiled files
@@ -230,31 +502,270 @@ class SkipLinting(FileLinter):
     def load(self):
         return False
 
-def identify(path, extension):
-    if extension in FileLinter.Extensions:
-        return FileLinter.Extensions[extension]
-    filename = os.path.basename(path)
-    ext = os.path.splitext(filename)[1].lstrip('.')
-    if ext in FileLinter.Extensions:
-        return FileLinter.Extensions[ext]
+def is_binary(prefix, complete=False):
+    '''
+    Guess whether a file is binary based on its first few bytes.
+    If complete is False, prefix may end partway through a character.
+    '''
+    if b'\0' in prefix:
+        return True
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=complete)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+def is_skip_rule(cls):
+    return isinstance(cls, type) and issubclass(cls, SkipLinting)
+
+def is_dir_pattern(pattern):
+    '''
+    Whether a PathIdentifiers pattern can only match the directory part
+    of a path, so that if it matches a directory, it matches every file
+    inside it.
+    '''
+    return pattern.endswith('/')
+
+def skip_directory(path):
+    '''
+    If every file inside directory path would be identified as
+    SkipLinting by one of the PathIdentifiers, return that pattern,
+    otherwise return None.
+    '''
+    dirpath = path.replace(os.sep, '/').rstrip('/') + '/'
     for r, c in FileLinter.PathIdentifiers:
-        if r.search(path):
-            return c
-    for r, c in FileLinter.Identifiers:
-        if r.match(filename):
-            return c
-    return FileLinter
-
-def lint(path, extension='', check=True, stats=False):
-    cls = identify(path, extension)
-    ret = cls(path)
-    loaded = ret.load()
-    if not loaded:
-        return ret
-    if check and stats:
-        ret.run_statcheck()
-    elif check:
-        ret.run_check()
-    elif stats:
-        ret.run_stat()
+        if is_skip_rule(c) and is_dir_pattern(r.pattern) and r.search(dirpath):
+            return r.pattern
+    return None
+
+class UnavailableLinter(FileLinter):
+    '''
+    Stand-in for a linter whose module couldn't be imported, which only
+    does the generic checks and says why.
+    '''
+    Reason = ''
+    ReportTypes = {
+        'no-linter': (Verbosity.Warn, 'Only generic checks were run because {0}.'),
+    }
+    def load(self):
+        self.record('no-linter', 1, self.Reason)
+        return FileLinter.load(self)
+
+def declare(spec, extensions=[], identifiers=[], path_identifiers=[]):
+    '''
+    Register the linter class spec ('module:ClassName') for the given
+    extensions and patterns without importing it.
+    The module will be imported by identify() when a matching file is
+    found, at which point the class must have the same attributes.
+    '''
+    for e in extensions:
+        FileLinter.Extensions.setdefault(e, spec)
+    for i in identifiers:
+        FileLinter.Identifiers.append((re.compile(i), spec))
+    for pi in path_identifiers:
+        FileLinter.PathIdentifiers.append((re.compile(pi), spec))
+
+_unavailable = {} # spec : UnavailableLinter subclass
+
+def resolve(cls):
+    '''
+    Given either a class or a spec from declare(), import it if necessary
+    and return the class.
+    '''
+    if not isinstance(cls, str):
+        return cls
+    if cls in _unavailable:
+        return _unavailable[cls]
+    mod, name = cls.split(':')
+    try:
+        return getattr(importlib.import_module(mod), name)
+    except ImportError as e:
+        reason = f'{mod} could not be imported ({e})'
+        sub = type(name, (UnavailableLinter,), {'Reason': reason})
+        _unavailable[cls] = sub
+        return sub
+
+def iter_linters():
+    '''
+    Import and yield every registered linter class, in the order they
+    were registered, importing each one only when it is reached.
+    '''
+    seen = [FileLinter]
+    yield FileLinter
+    entries = (list(FileLinter.Extensions.values()) +
+               [c for _, c in FileLinter.Identifiers] +
+               [c for _, c in FileLinter.PathIdentifiers])
+    for c in entries:
+        c = resolve(c)
+        if c not in seen and not is_skip_rule(c):
+            seen.append(c)
+            yield c
+
+def linters():
+    '''
+    Import and return every registered linter class, in the order they
+    were registered.
+    '''
+    return list(iter_linters())
+
+def unknown_checks(names):
+    '''
+    The names which are not report types, check methods or costs.
+    Linters are only imported until every name has been found, so
+    usually only the ones which own them are imported.
+    '''
+    left = set(names) - {Cost.Cheap, Cost.Linear, Cost.Superlinear}
+    for cls in itertools.chain([UnavailableLinter], iter_linters()):
+        if not left:
+            break
+        left -= set(cls.all_report_types())
+        left -= set(cls.all_check_info())
+    return left
+
+def check_names():
+    '''
+    Every name which can be given to a Selection: report types, check
+    methods and costs.
+    '''
+    ret = {Cost.Cheap, Cost.Linear, Cost.Superlinear}
+    for cls in linters() + [UnavailableLinter]:
+        ret.update(cls.all_report_types())
+        ret.update(cls.all_check_info())
+    return ret
+
+class Dispatch:
+    '''
+    Compiled form of FileLinter.Extensions, Identifiers and
+    PathIdentifiers used by identify().
+
+    Each list of patterns is combined into a single regex with a named
+    group for each pattern, so that one match finds the first pattern
+    (in registration order) which matches. The PathIdentifiers which
+    only depend on the directory are checked once per directory.
+    '''
+    def __init__(self):
+        self.key = None
+    @staticmethod
+    def combine(entries, search):
+        if not entries:
+            return None
+        # .*? before each alternative makes match() act like search()
+        # for each pattern while still trying them in order
+        prefix = '.*?' if search else ''
+        alts = [f'{prefix}(?P<_{i}>{pat})' for i, pat in entries]
+        return re.compile('(?:' + '|'.join(alts) + ')', re.DOTALL)
+    @staticmethod
+    def first(rx, s):
+        if rx is None:
+            return None
+        m = rx.match(s)
+        if m is None:
+            return None
+        for name, val in m.groupdict().items():
+            if val is not None and name.startswith('_'):
+                return int(name[1:])
+    def compile(self):
+        paths = FileLinter.PathIdentifiers
+        idents = FileLinter.Identifiers
+        self.key = (len(paths), len(idents))
+        dir_rules = []
+        file_rules = []
+        for i, (r, _) in enumerate(paths):
+            if is_dir_pattern(r.pattern):
+                dir_rules.append((i, r.pattern))
+            else:
+                file_rules.append((i, r.pattern))
+        self.dir_path = self.combine(dir_rules, True)
+        self.file_path = self.combine(file_rules, True)
+        self.ident = self.combine([(i, r.pattern)
+                                   for i, (r, _) in enumerate(idents)], False)
+        self.dirs = {} # (root, dirname) : (relative dirname, rule index)
+    def directory(self, dirname, root):
+        key = (root, dirname)
+        if key not in self.dirs:
+            rel = dirname
+            if root is not None:
+                rel = os.path.relpath(dirname or '.', root)
+                if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+                    rel = ''
+            rel = '' if rel in ['', '.'] else rel.replace(os.sep, '/') + '/'
+            self.dirs[key] = (rel, self.first(self.dir_path, rel))
+        return self.dirs[key]
+    def identify(self, path, extension, root=None):
+        if self.key != (len(FileLinter.PathIdentifiers),
+                        len(FileLinter.Identifiers)):
+            self.compile()
+        if extension in FileLinter.Extensions:
+            return resolve(FileLinter.Extensions[extension])
+        dirname, _, filename = path.rpartition(os.sep)
+        # same as os.path.splitext()
+        base = filename.lstrip('.')
+        dot = base.rfind('.')
+        ext = base[dot+1:] if dot >= 0 else ''
+        if ext in FileLinter.Extensions:
+            return resolve(FileLinter.Extensions[ext])
+        rel, i = self.directory(dirname, root)
+        j = self.first(self.file_path, rel + filename)
+        if i is None or (j is not None and j < i):
+            i = j
+        if i is not None:
+            return resolve(FileLinter.PathIdentifiers[i][1])
+        i = self.first(self.ident, filename)
+        if i is not None:
+            return resolve(FileLinter.Identifiers[i][1])
+        return FileLinter
+
+_dispatch = Dispatch()
+
+def identify(path, extension, root=None):
+    '''
+    Find the linter class for path. PathIdentifiers are matched against
+    path relative to root (the directory or file being linted) if it is
+    given, or against path as it is otherwise.
+    '''
+    return _dispatch.identify(path, extension, root)
+
+def lint(path, extension='', check=True, stats=False, selection=None,
+         root=None, data=None):
+    '''
+    Lint the file at path with the linter chosen by identify().
+    If data is given, it is used as the contents of the file, which is
+    never read from disk.
+    '''
+    cls = identify(path, extension, root)
+    ret = cls(path, selection, data)
+    if Probes:
+        ret.observe('lint', ret.run, check, stats)
+    else:
+        ret.run(check, stats)
     return ret
+
+def lint_bytes(data, filename_hint, extension='', check=True, stats=False,
+               selection=None, root=None):
+    '''
+    Lint data (bytes, or str which will be encoded as UTF-8) as though it
+    were the contents of a file named filename_hint, which decides which
+    linter is used but doesn't need to exist.
+    '''
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return lint(filename_hint, extension, check, stats, selection, root,
+                data)
+
+# The linters for each format are only imported once a file which needs
+# them is found, so that e.g. linting modes.xml doesn't load lxml and
+# every tree-sitter grammar.
+# These must match the Extensions and Identifiers of each class.
+declare('apertium_lint.xml.dix:BiDixLinter',
+        identifiers=[r'^apertium-\w+-\w+.\w+-\w+.dix$'])
+declare('apertium_lint.xml.dix:MonoDixLinter', identifiers=[r'.*\.dix$'])
+declare('apertium_lint.xml.lrx:LRXLinter', extensions=['lrx'])
+declare('apertium_lint.xml.modes:ModesLinter', identifiers=[r'^modes\.xml$'])
+declare('apertium_lint.xml.transfer:TransferLinter',
+        extensions=['t1x', 't2x', 't3x', 't4x'])
+declare('apertium_lint.tree_sitter.cg:CGLinter', extensions=['rlx'])
+declare('apertium_lint.tree_sitter.lexc:LexCLinter', extensions=['lexc'])
+declare('apertium_lint.tree_sitter.lexd:LexdLinter', extensions=['lexd'])
+declare('apertium_lint.tree_sitter.rtx:RTXLinter', extensions=['rtx'])
+declare('apertium_lint.tree_sitter.twolc:TwolCLinter',
+        extensions=['twol', 'twoc', 'twolc'])
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+import os
+import re
+
+def translate(pattern):
+    '''
+    Convert a gitignore pattern (with any leading ! and trailing /
+    already removed) to a regular expression matching paths relative to
+    the directory containing the .gitignore file.
+    '''
+    anchored = '/' in pattern
+    if pattern.startswith('/'):
+        pattern = pattern[1:]
+    res = ''
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**/', i) and (i == 0 or pattern[i-1] == '/'):
+            res += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            res += '/.*'
+            i += 3
+        elif c == '*':
+            while i < n and pattern[i] == '*':
+                i += 1
+            res += '[^/]*'
+        elif c == '?':
+            res += '[^/]'
+            i += 1
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                res += re.escape(c)
+                i += 1
+            else:
+                body = pattern[i+1:j]
+                if body[0] in '!^':
+                    body = '^' + body[1:]
+                res += '[' + body.replace('\\', '\\\\') + ']'
+                i = j + 1
+        elif c == '\\' and i + 1 < n:
+            res += re.escape(pattern[i+1])
+            i += 2
+        else:
+            res += re.escape(c)
+            i += 1
+    return ('' if anchored else '(?:.*/)?') + res
+
+def parse_line(line):
+    '''
+    Parse one line of a gitignore file.
+    Return (regex, negate) or None if the line is blank or a comment.
+    The regex should be matched against relative paths with a trailing
+    slash for directories.
+    '''
+    line = line.rstrip('\n').rstrip('\r')
+    if not line or line.startswith('#'):
+        return None
+    # trailing spaces are ignored unless escaped
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+    negate = False
+    if line.startswith('!'):
+        negate = True
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+    dir_only = line.endswith('/') and not line.endswith('\\/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    return translate(line) + ('/' if dir_only else '/?'), negate
+
+def find_repo_root(path):
+    cur = os.path.abspath(path)
+    if not os.path.isdir(cur):
+        cur = os.path.dirname(cur)
+    while True:
+        if os.path.exists(os.path.join(cur, '.git')):
+            return cur
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            return None
+        cur = parent
+
+def git_dir(root):
+    dot_git = os.path.join(root, '.git')
+    if os.path.isfile(dot_git):
+        # worktrees and submodules have a file pointing to the real directory
+        with open(dot_git) as fin:
+            for line in fin:
+                if line.startswith('gitdir:'):
+                    dot_git = os.path.join(root, line.split(':', 1)[1].strip())
+                    break
+        common = os.path.join(dot_git, 'commondir')
+        if os.path.isfile(common):
+            with open(common) as fin:
+                dot_git = os.path.join(dot_git, fin.read().strip())
+    return dot_git
+
+def config_excludes_file(config_files):
+    '''
+    Find the value of core.excludesFile in the last of config_files
+    which sets it.
+    '''
+    ret = None
+    for fname in config_files:
+        try:
+            with open(fname, encoding='utf-8') as fin:
+                section = ''
+                for line in fin:
+                    line = line.strip()
+                    if line.startswith('['):
+                        section = line.strip('[]').split()[0].lower()
+                    elif section == 'core' and '=' in line:
+                        key, val = line.split('=', 1)
+                        if key.strip().lower() == 'excludesfile':
+                            ret = val.strip().strip('"')
+        except (OSError, UnicodeDecodeError):
+            continue
+    return ret
+
+def global_excludes_file(repo_git_dir):
+    xdg = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    configs = [
+        os.path.join(xdg, 'git', 'config'),
+        os.path.expanduser('~/.gitconfig'),
+        os.path.join(repo_git_dir, 'config'),
+    ]
+    fname = config_excludes_file(configs)
+    if fname:
+        return os.path.expanduser(fname)
+    return os.path.join(xdg, 'git', 'ignore')
+
+class GitIgnore:
+    '''
+    Matcher for the ignore rules of a single git repository: the global
+    excludes file, .git/info/exclude, and the .gitignore files of every
+    directory which has been loaded with load_dir().
+
+    Consecutive rules from the same file with the same polarity are
+    combined into a single regular expression, and checked starting
+    from the highest precedence, so that the last matching rule wins.
+
+    As with git check-ignore, files which are tracked (and directories
+    containing them) are never ignored. The list of tracked files is
+    read with a single git ls-files the first time a rule matches.
+    '''
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.groups = [] # (prefix, regex, negate)
+        self.loaded = set()
+        self.tracked = None
+        # ignored directories which were only walked because they
+        # contain tracked files, so anything untracked in them is ignored
+        self.tracked_dirs = set()
+        gdir = git_dir(self.root)
+        self.load_file(global_excludes_file(gdir), '')
+        self.load_file(os.path.join(gdir, 'info', 'exclude'), '')
+    @classmethod
+    def for_path(cls, path):
+        root = find_repo_root(path)
+        if root is None:
+            return None
+        ret = cls(root)
+        ret.load_parents(path)
+        return ret
+    def relative(self, path):
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == '.':
+            return ''
+        return rel.replace(os.sep, '/')
+    def load_file(self, fname, prefix):
+        try:
+            with open(fname, encoding='utf-8', errors='surrogateescape') as fin:
+                lines = fin.readlines()
+        except OSError:
+            return
+        cur = []
+        cur_neg = None
+        def flush():
+            if cur:
+                rx = re.compile('(?:' + '|'.join(cur) + ')$', re.DOTALL)
+                self.groups.append((prefix, rx, cur_neg))
+        for line in lines:
+            rule = parse_line(line)
+            if rule is None:
+                continue
+            regex, neg = rule
+            if neg != cur_neg:
+                flush()
+                cur = []
+                cur_neg = neg
+            cur.append(regex)
+        flush()
+    def load_dir(self, dirpath):
+        rel = self.relative(dirpath)
+        if rel in self.loaded or rel.startswith('../'):
+            return
+        self.loaded.add(rel)
+        prefix = rel + '/' if rel else ''
+        self.load_file(os.path.join(dirpath, '.gitignore'), prefix)
+    def load_parents(self, path):
+        path = os.path.abspath(path)
+        if not os.path.isdir(path):
+            path = os.path.dirname(path)
+        rel = self.relative(path)
+        cur = self.root
+        self.load_dir(cur)
+        if rel:
+            for part in rel.split('/'):
+                cur = os.path.join(cur, part)
+                self.load_dir(cur)
+    def load_tracked(self):
+        '''
+        Read the paths of all tracked files, and of the directories
+        containing them (with a trailing slash).
+        '''
+        import subprocess
+        self.tracked = set()
+        try:
+            proc = subprocess.run(['git', 'ls-files', '-z'], cwd=self.root,
+                                  capture_output=True)
+        except OSError:
+            return
+        if proc.returncode != 0:
+            return
+        for name in proc.stdout.decode('utf-8', 'surrogateescape').split('\0'):
+            while name and name not in self.tracked:
+                self.tracked.add(name)
+                name = name.rstrip('/').rpartition('/')[0]
+                if name:
+                    name += '/'
+    def is_tracked(self, rel):
+        if self.tracked is None:
+            self.load_tracked()
+        return rel in self.tracked
+    def ignored(self, path, is_dir=False):
+        '''
+        Check whether path is ignored, assuming its parent directory is not.
+        '''
+        rel = self.relative(path)
+        if not rel or rel.startswith('../'):
+            return False
+        if is_dir:
+            rel += '/'
+        if self.tracked_dirs:
+            parent = rel.rstrip('/').rpartition('/')[0] + '/'
+            if parent in self.tracked_dirs:
+                if is_dir and self.is_tracked(rel):
+                    self.tracked_dirs.add(rel)
+                return not self.is_tracked(rel)
+        for prefix, rx, negate in reversed(self.groups):
+            if prefix and not rel.startswith(prefix):
+                continue
+            if rx.match(rel, len(prefix)):
+                if negate or not self.is_tracked(rel):
+                    return not negate
+                if is_dir:
+                    self.tracked_dirs.add(rel)
+                return False
+        return False
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+'''
+A Language Server Protocol server (on stdin and stdout) which lints
+documents as they are edited and publishes the diagnostics.
+
+Documents in formats with a TreeSitterLinter are reparsed incrementally
+after each edit, and the per_ hooks which only depend on their node are
+only run on the nodes in the edited ranges (see
+TreeSitterLinter.run_per_type()). The check_ methods, which look at
+the whole file (e.g. for definitions and uses), still run on every
+edit, so that part of linting is still proportional to the size of the
+document. Other formats are linted from scratch.
+'''
+
+from .file_linter import identify, lint_bytes
+from .tree_sitter.tree_sitter_linter import TreeSitterLinter
+from tree_sitter import Parser
+from urllib.parse import unquote, urlparse
+import json
+import os
+import select
+import sys
+
+# Verbosity : DiagnosticSeverity (Error, Warning, Information, Hint)
+Severity = {1: 1, 2: 2, 3: 3, 4: 4}
+
+def uri_to_path(uri):
+    parsed = urlparse(uri)
+    if parsed.scheme not in ('', 'file'):
+        return parsed.path
+    return unquote(parsed.path)
+
+def utf16_to_bytes(line, character):
+    '''The byte offset in line (bytes) of a UTF-16 column.'''
+    text = line.decode('utf-8', 'surrogateescape')
+    units = 0
+    for i, ch in enumerate(text):
+        if units >= character:
+            return len(text[:i].encode('utf-8', 'surrogateescape'))
+        units += 2 if ord(ch) > 0xFFFF else 1
+    return len(line)
+
+class Document:
+    '''The current text of an open file, and its tree if it has one.'''
+    def __init__(self, uri, text, config=None):
+        self.uri = uri
+        self.path = uri_to_path(uri)
+        self.data = text.encode('utf-8')
+        self.selection = config and config.selection_for(self.path)
+        cls = identify(self.path, '', os.path.dirname(self.path))
+        self.cls = cls
+        self.parser = None
+        self.tree = None
+        self.memo = {}
+        self.spans = {} # see TreeSitterLinter.spans
+        self.changed = [] # (start, end) in bytes since the last lint()
+        if issubclass(cls, TreeSitterLinter) and cls.language is not None:
+            self.parser = Parser(cls.language)
+            self.tree = self.parser.parse(self.data)
+    def position(self, pos):
+        '''The byte offset and tree-sitter point of an LSP Position.'''
+        lines = self.data.split(b'\n', pos['line'])
+        if len(lines) <= pos['line']:
+            # past the end
+            return len(self.data), (len(lines) - 1, len(lines[-1]))
+        start = sum(map(len, lines[:-1])) + pos['line']
+        line = lines[-1].split(b'\n', 1)[0]
+        col = utf16_to_bytes(line, pos['character'])
+        return start + col, (pos['line'], col)
+    def edit(self, change):
+        '''Apply a TextDocumentContentChangeEvent.'''
+        text = change['text'].encode('utf-8')
+        if 'range' not in change:
+            self.data = text
+            self.changed = [(0, len(text))]
+            self.spans = {}
+            if self.tree is not None:
+                self.tree = self.parser.parse(self.data)
+            return
+        start, start_pt = self.position(change['range']['start'])
+        end, end_pt = self.position(change['range']['end'])
+        self.data = self.data[:start] + text + self.data[end:]
+        new_end = start + len(text)
+        nl = text.count(b'\n')
+        if nl:
+            new_pt = (start_pt[0] + nl, len(text) - text.rfind(b'\n') - 1)
+        else:
+            new_pt = (start_pt[0], start_pt[1] + len(text))
+        delta = new_end - end
+        changed = []
+        for s, e in self.changed:
+            if e < start:
+                changed.append((s, e))
+            elif s > end:
+                changed.append((s + delta, e + delta))
+            else:
+                # overlaps the edit, so it grows or shrinks with it
+                changed.append((min(s, start), max(e + delta, new_end)))
+        changed.append((start, new_end))
+        self.changed = changed
+        # move what the per_ hooks reported along with the text, and
+        # forget it for the nodes which were edited
+        rows = new_pt[0] - end_pt[0]
+        spans = {}
+        for name, (ctx, ents) in self.spans.items():
+            keep = []
+            for s, e, row, reps in ents:
+                if e < start:
+                    keep.append((s, e, row, reps))
+                elif s > end:
+                    keep.append((s + delta, e + delta, row + rows, reps))
+            spans[name] = (ctx, keep)
+        self.spans = spans
+        if self.tree is not None:
+            self.tree.edit(start, end, new_end, start_pt, end_pt, new_pt)
+    def apply(self, changes):
+        for change in changes:
+            self.edit(change)
+        if self.tree is not None:
+            tree = self.parser.parse(self.data, self.tree)
+            self.changed += [(r.start_byte, r.end_byte)
+                             for r in self.tree.changed_ranges(tree)]
+            self.tree = tree
+    def lint(self):
+        '''The results of linting the current text, as from get_results().'''
+        if self.tree is None:
+            return lint_bytes(self.data, self.path,
+                              selection=self.selection).get_results()
+        linter = self.cls(self.path, self.selection, self.data)
+        linter.parsed = self.tree
+        linter.memo = self.memo
+        linter.spans = self.spans
+        linter.changed = self.changed
+        linter.run(check=True)
+        self.memo = {k: v for k, v in (linter.saved or {}).items() if v}
+        self.spans = linter.saved_spans or {}
+        self.changed = []
+        return linter.get_results()
+    def diagnostics(self):
+        ret = []
+        for msg in self.lint()['checks']:
+            line = max(msg['line'] - 1, 0)
+            ret.append({
+                'range': {'start': {'line': line, 'character': 0},
+                          'end': {'line': line + 1, 'character': 0}},
+                'severity': Severity.get(msg['level'], 3),
+                'code': msg['name'],
+                'source': 'apertium-lint',
+                'message': msg['desc'],
+            })
+        return ret
+
+class Server:
+    '''
+    Read JSON-RPC messages from fin and write replies and diagnostics
+    to fout (both binary).
+    Documents are linted once there are no more messages waiting, so
+    a burst of changes (e.g. typing quickly) is only linted once.
+    '''
+    def __init__(self, fin, fout, config=None):
+        self.fin = fin
+        self.fout = fout
+        self.config = config
+        self.buf = b''
+        self.docs = {} # uri : Document
+        self.dirty = set()
+        self.running = True
+        self.shutdown = False
+    def fill(self):
+        read = getattr(self.fin, 'read1', self.fin.read)
+        more = read(1 << 16)
+        if not more:
+            raise EOFError
+        self.buf += more
+    def pending(self):
+        if self.buf:
+            return True
+        try:
+            return bool(select.select([self.fin], [], [], 0)[0])
+        except (OSError, ValueError, TypeError):
+            return False
+    def read(self):
+        while b'\r\n\r\n' not in self.buf:
+            self.fill()
+        head, self.buf = self.buf.split(b'\r\n\r\n', 1)
+        size = 0
+        for line in head.split(b'\r\n'):
+            name, _, val = line.partition(b':')
+            if name.strip().lower() == b'content-length':
+                size = int(val)
+        while len(self.buf) < size:
+            self.fill()
+        body, self.buf = self.buf[:size], self.buf[size:]
+        return json.loads(body)
+    def send(self, msg):
+        msg['jsonrpc'] = '2.0'
+        body = json.dumps(msg).encode('utf-8')
+        self.fout.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+        self.fout.flush()
+    def publish(self, uri, diagnostics):
+        self.send({'method': 'textDocument/publishDiagnostics',
+                   'params': {'uri': uri, 'diagnostics': diagnostics}})
+    def flush(self):
+        for uri in sorted(self.dirty):
+            self.publish(uri, self.docs[uri].diagnostics())
+        self.dirty.clear()
+    def run(self):
+        try:
+            while self.running:
+                if self.dirty and not self.pending():
+                    self.flush()
+                self.handle(self.read())
+        except EOFError:
+            pass
+        return 0 if self.shutdown else 1
+    def handle(self, msg):
+        method = msg.get('method')
+        params = msg.get('params') or {}
+        fn = getattr(self, 'on_' + (method or '').replace('/', '_'), None)
+        if 'id' not in msg:
+            if fn is not None:
+                fn(params)
+            return
+        if fn is None:
+            self.send({'id': msg['id'], 'error': {
+                'code': -32601, 'message': f'Unknown method {method}'}})
+            return
+        try:
+            self.send({'id': msg['id'], 'result': fn(params)})
+        except Exception as e:
+            self.send({'id': msg['id'], 'error': {
+                'code': -32603, 'message': f'{type(e).__name__}: {e}'}})
+    def on_initialize(self, params):
+        return {
+            'capabilities': {
+                # incremental changes
+                'textDocumentSync': {'openClose': True, 'change': 2},
+            },
+            'serverInfo': {'name': 'apertium-lint'},
+        }
+    def on_shutdown(self, params):
+        self.flush()
+        self.shutdown = True
+        return None
+    def on_exit(self, params):
+        self.running = False
+    def on_textDocument_didOpen(self, params):
+        doc = params['textDocument']
+        self.docs[doc['uri']] = Document(doc['uri'], doc['text'],
+                                         self.config)
+        self.dirty.add(doc['uri'])
+    def on_textDocument_didChange(self, params):
+        uri = params['textDocument']['uri']
+        if uri in self.docs:
+            self.docs[uri].apply(params['contentChanges'])
+            self.dirty.add(uri)
+    def on_textDocument_didClose(self, params):
+        uri = params['textDocument']['uri']
+        self.docs.pop(uri, None)
+        self.dirty.discard(uri)
+        self.publish(uri, [])
+
+def serve(config=None):
+    return Server(sys.stdin.buffer, sys.stdout.buffer, config).run()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+from .file_linter import Probe
+import os
+import tracemalloc
+
+def current_rss():
+    '''Resident set size of this process in bytes, or None if unknown.'''
+    try:
+        with open('/proc/self/statm') as fin:
+            return int(fin.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # peak rather than current, but still shows growth
+        scale = 1 if os.uname().sysname == 'Darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    except (ImportError, OSError):
+        return None
+
+class MemoryProbe(Probe):
+    '''
+    Peak memory allocated by Python during each phase of linting (see
+    Probe), measured with tracemalloc, along with how much the resident
+    set size of the process grew.
+    tracemalloc doesn't see memory allocated by C libraries, such as the
+    trees built by lxml and tree-sitter, which only show up in RSS.
+    Tracing is started the first time a phase begins in each process.
+    '''
+    def __init__(self):
+        self.started = False
+        self.stack = [] # [traced at start, highest peak so far, rss at start]
+        self.phases = {} # (class name, phase) : [max peak, total peak, calls, max rss growth]
+        self.files = {} # path : [class name, peak, rss growth]
+    def __getstate__(self):
+        # each worker starts its own tracing
+        state = self.__dict__.copy()
+        state['started'] = False
+        state['stack'] = []
+        return state
+    def begin(self, linter, phase):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+        cur, peak = tracemalloc.get_traced_memory()
+        if self.stack:
+            self.stack[-1][1] = max(self.stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        self.stack.append([cur, cur, current_rss()])
+    def end(self, linter, phase, token):
+        _, peak = tracemalloc.get_traced_memory()
+        start, high, rss = self.stack.pop()
+        high = max(high, peak)
+        if self.stack:
+            self.stack[-1][1] = max(self.stack[-1][1], high)
+            tracemalloc.reset_peak()
+        growth = 0
+        rss_now = current_rss()
+        if rss is not None and rss_now is not None:
+            growth = max(rss_now - rss, 0)
+        used = high - start
+        name = type(linter).__name__
+        ent = self.phases.setdefault((name, phase), [0, 0, 0, 0])
+        ent[0] = max(ent[0], used)
+        ent[1] += used
+        ent[2] += 1
+        ent[3] = max(ent[3], growth)
+        if phase == 'lint':
+            self.files[linter.path] = [name, used, growth]
+    def stop(self):
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+    def drain(self):
+        ret = (self.phases, self.files)
+        self.phases = {}
+        self.files = {}
+        return ret
+    def merge(self, data):
+        phases, files = data
+        for key, (mx, total, calls, growth) in phases.items():
+            ent = self.phases.setdefault(key, [0, 0, 0, 0])
+            ent[0] = max(ent[0], mx)
+            ent[1] += total
+            ent[2] += calls
+            ent[3] = max(ent[3], growth)
+        self.files.update(files)
+    def table(self, top_files=10):
+        def mib(n):
+            return f'{n / (1 << 20):10.2f}'
+        yield f'{"Peak MiB":>10} {"Mean MiB":>10} {"RSS+ MiB":>10}  {"Linter":<16} Phase'
+        rows = sorted(self.phases.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        for (name, phase), (mx, total, calls, growth) in rows:
+            yield f'{mib(mx)} {mib(total / calls)} {mib(growth)}  {name:<16} {phase}'
+        files = sorted(self.files.items(), key=lambda kv: (-kv[1][1], kv[0]))
+        if files and top_files:
+            yield ''
+            yield f'{"Peak MiB":>10} {"RSS+ MiB":>10}  Largest files'
+            for pth, (name, used, growth) in files[:top_files]:
+                yield f'{mib(used)} {mib(growth)}  {pth} ({name})'
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+'''
+apertium-lint merge (or --merge, if there's a path called merge): combine
+the --format json or ndjson output of several runs (such as the shards
+from --shard) into one report.
+'''
+
+from .report import Reporters, make_reporter
+from collections import defaultdict
+import json
+import sys
+
+def read_results(text):
+    '''
+    Parse the output of --format json or ndjson.
+    Returns {path: results} and a list of notes (for runs cut short).
+    '''
+    files = {}
+    notes = []
+    try:
+        blob = json.loads(text)
+    except ValueError:
+        blob = None
+    if isinstance(blob, dict) and blob.get('type') is None:
+        # --format json, which ends with an empty entry
+        files = {k: v for k, v in blob.items() if k}
+        return files, notes
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        rec = json.loads(line)
+        typ = rec.pop('type', None)
+        if typ == 'summary':
+            if rec.get('note'):
+                notes.append(rec['note'])
+            continue
+        res = files.setdefault(rec.pop('path'), {'stats': {}, 'checks': []})
+        if typ == 'check':
+            res['checks'].append(rec)
+        elif typ == 'stats':
+            res['stats'] = rec['stats']
+    return files, notes
+
+def merge(texts):
+    '''
+    Combine the output of several runs, as from read_results().
+    A file in more than one run keeps the results from the last.
+    '''
+    files = {}
+    notes = []
+    for text in texts:
+        f, n = read_results(text)
+        files.update(f)
+        notes += n
+    return files, notes
+
+def main(argv=None):
+    import argparse
+    from . import limit_exceeded, record_totals
+    parser = argparse.ArgumentParser(
+        prog='apertium-lint merge',
+        description='Combine the --format json or ndjson output of several runs (e.g. with --shard) into one report.')
+    parser.add_argument('results', nargs='+', metavar='FILE',
+                        help='Output of apertium-lint --format json or ndjson (- for standard input)')
+    parser.add_argument('--format', '-f', action='store', default='text',
+                        choices=sorted(Reporters.keys()))
+    parser.add_argument('--json', '-j', action='store_const', const='json',
+                        dest='format')
+    parser.add_argument('--linewise', '-l', action='store_const',
+                        const='linewise', dest='format')
+    parser.add_argument('--stats', '-s', action='store_true',
+                        help='Show the statistics from runs with --stats')
+    parser.add_argument('--max-error', action='store', type=int, default=-1,
+                        metavar='N', help='Exit with non-zero status if more than N errors found')
+    parser.add_argument('--max-warn', action='store', type=int, default=-1,
+                        metavar='N', help='Exit with non-zero status if more than N warnings or errors found')
+    args = parser.parse_args(argv)
+    texts = []
+    for fname in args.results:
+        try:
+            if fname == '-':
+                texts.append(sys.stdin.read())
+            else:
+                with open(fname, encoding='utf-8') as fin:
+                    texts.append(fin.read())
+        except OSError as e:
+            parser.error(str(e))
+    try:
+        files, notes = merge(texts)
+    except (ValueError, KeyError) as e:
+        parser.error(f'not the output of --format json or ndjson: {e}')
+    args.check = True
+    totals = defaultdict(int)
+    reporter = make_reporter(args)
+    reporter.start()
+    for pth in sorted(files):
+        reporter.file(pth, files[pth])
+        record_totals(files[pth], totals)
+    reporter.finish(totals, ' '.join(notes) or None)
+    reporter.flush()
+    if limit_exceeded(totals, args):
+        sys.exit(1)
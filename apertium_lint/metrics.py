@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+from .file_linter import Probe
+from .report import LevelLabels
+import os
+import tempfile
+import time
+
+def escape(val):
+    return str(val).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def labels(**kw):
+    if not kw:
+        return ''
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in sorted(kw.items())) + '}'
+
+class Metrics(Probe):
+    '''
+    Counters for a single run, written in the Prometheus text format
+    read by the node-exporter textfile collector.
+    Files linted, bytes read, parse (load()) time and check time are
+    collected from the phases reported to Probes; diagnostics and cache
+    hits are filled in from the totals of the run by write().
+    '''
+    ParseBuckets = [0.001, 0.01, 0.1, 1.0, 10.0, 60.0]
+    # the phases which aren't checks
+    NotChecks = ['lint', 'load', 'get_results', 'run_per']
+
+    def __init__(self):
+        self.start = time.time()
+        self.files = {} # linter : count
+        self.bytes = {} # linter : bytes
+        self.parse = {} # linter : [count per bucket..., sum, count]
+        self.checks = {} # (linter, check) : seconds
+    def begin(self, linter, phase):
+        return time.perf_counter()
+    def end(self, linter, phase, token):
+        seconds = time.perf_counter() - token
+        name = type(linter).__name__
+        if phase == 'lint':
+            self.files[name] = self.files.get(name, 0) + 1
+            try:
+                size = linter.size
+            except OSError:
+                size = 0
+            self.bytes[name] = self.bytes.get(name, 0) + size
+        elif phase == 'load':
+            hist = self.parse.setdefault(name, [0] * len(self.ParseBuckets) + [0.0, 0])
+            for i, b in enumerate(self.ParseBuckets):
+                if seconds <= b:
+                    hist[i] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+        elif phase not in self.NotChecks:
+            self.add(linter, phase, seconds, 1)
+    def add(self, linter, phase, seconds, calls):
+        key = (type(linter).__name__, phase)
+        self.checks[key] = self.checks.get(key, 0.0) + seconds
+    def drain(self):
+        ret = (self.files, self.bytes, self.parse, self.checks)
+        self.files, self.bytes, self.parse, self.checks = {}, {}, {}, {}
+        return ret
+    def merge(self, data):
+        files, byt, parse, checks = data
+        for dst, src in [(self.files, files), (self.bytes, byt),
+                         (self.checks, checks)]:
+            for k, v in src.items():
+                dst[k] = dst.get(k, 0) + v
+        for k, hist in parse.items():
+            cur = self.parse.setdefault(k, [0] * len(self.ParseBuckets) + [0.0, 0])
+            for i, v in enumerate(hist):
+                cur[i] += v
+    def lines(self, totals=None, cache=None):
+        def metric(name, typ, desc, samples):
+            yield f'# HELP {name} {desc}'
+            yield f'# TYPE {name} {typ}'
+            for lab, val in samples:
+                yield f'{name}{lab} {val}'
+        yield from metric(
+            'apertium_lint_files_total', 'counter',
+            'Files linted (not counting cache hits).',
+            [(labels(linter=k), v) for k, v in sorted(self.files.items())])
+        yield from metric(
+            'apertium_lint_read_bytes_total', 'counter',
+            'Bytes in the files linted.',
+            [(labels(linter=k), v) for k, v in sorted(self.bytes.items())])
+        yield '# HELP apertium_lint_parse_seconds Time spent loading and parsing each file.'
+        yield '# TYPE apertium_lint_parse_seconds histogram'
+        for k, hist in sorted(self.parse.items()):
+            for b, n in zip(self.ParseBuckets, hist):
+                yield f'apertium_lint_parse_seconds_bucket{labels(linter=k, le=b)} {n}'
+            yield f'apertium_lint_parse_seconds_bucket{labels(linter=k, le="+Inf")} {hist[-1]}'
+            yield f'apertium_lint_parse_seconds_sum{labels(linter=k)} {hist[-2]}'
+            yield f'apertium_lint_parse_seconds_count{labels(linter=k)} {hist[-1]}'
+        yield from metric(
+            'apertium_lint_check_seconds_total', 'counter',
+            'Time spent in each check.',
+            [(labels(linter=k, check=c), v)
+             for (k, c), v in sorted(self.checks.items())])
+        if totals is not None:
+            yield from metric(
+                'apertium_lint_diagnostics_total', 'counter',
+                'Diagnostics reported at each level.',
+                [(labels(level=lab.lower()), totals[lev])
+                 for lev, lab in sorted(LevelLabels.items())])
+        if cache is not None:
+            yield from metric('apertium_lint_cache_hits_total', 'counter',
+                              'Files whose results were found in the cache.',
+                              [('', cache.hits)])
+            yield from metric('apertium_lint_cache_misses_total', 'counter',
+                              'Files whose results were not in the cache.',
+                              [('', cache.misses)])
+        yield from metric('apertium_lint_run_seconds', 'gauge',
+                          'Wall-clock duration of the run.',
+                          [('', round(time.time() - self.start, 6))])
+    def write(self, fname, totals=None, cache=None):
+        # write to a temporary file and rename it, so that the collector
+        # never sees half a file
+        dirname = os.path.dirname(os.path.abspath(fname))
+        fd, tmp = tempfile.mkstemp(dir=dirname, prefix='.apertium-lint-')
+        with os.fdopen(fd, 'w') as fout:
+            for line in self.lines(totals, cache):
+                fout.write(line + '\n')
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, fname)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sys
+
+LevelLabels = {
+    1: 'Error',
+    2: 'Warning',
+    3: 'Suggestion',
+    4: 'Nitpick',
+}
+
+class Reporter:
+    '''
+    Base class for output formats.
+    start() is called once before any files are linted, file() once for
+    each file with the output of FileLinter.get_results(), and finish()
+    once at the end with the totals for each level and, if the run was
+    cut short, a note explaining why.
+    All output goes through self.out, a single buffered stream.
+    '''
+    def __init__(self, args, out=None):
+        self.args = args
+        self.out = out or sys.stdout
+    def start(self):
+        pass
+    def file(self, pth, blob):
+        pass
+    def finish(self, totals, note=None):
+        pass
+    def flush(self):
+        self.out.flush()
+
+class TextReporter(Reporter):
+    linewise = False
+    def display_path(self, pth):
+        print_pth = pth.replace(os.getcwd(), '.')
+        if self.linewise and print_pth.count('/') == 1:
+            # just use the filename if it's in the top directory
+            print_pth = print_pth[2:]
+        return print_pth
+    def stats_lines(self, dct, indent=0):
+        prefix = '  '*indent
+        for k in sorted(dct.keys()):
+            blob = dct[k]
+            if isinstance(blob['value'], dict):
+                yield f'{prefix}{blob["long_name"]}:'
+                yield from self.stats_lines(blob['value'], indent+1)
+            else:
+                yield f'{prefix}{blob["long_name"]}:\t{blob["value"]}'
+    def file(self, pth, blob):
+        args = self.args
+        if ((len(blob['stats']) == 0 or not args.stats) and
+            (len(blob['checks']) == 0 or not args.check)):
+            return
+        print_pth = self.display_path(pth)
+        lines = []
+        if not self.linewise:
+            lines.append(print_pth)
+        if args.check:
+            for msg in blob['checks']:
+                typ = LevelLabels.get(msg['level'], 'Message')
+                if self.linewise:
+                    lines.append(f'{print_pth}:{msg["line"]}: {typ.lower()}: ({msg["name"]}) {msg["desc"]}')
+                else:
+                    lines.append(f'{typ} ({msg["name"]}) on line {msg["line"]}: {msg["desc"]}')
+        if args.stats:
+            lines += self.stats_lines(blob['stats'])
+        self.out.write('\n'.join(lines) + '\n')
+    def finish(self, totals, note=None):
+        if note:
+            self.out.write(note + '\n')
+        self.out.write(f'Errors: {totals[1]} Warnings: {totals[2]} Suggestions: {totals[3]} Nitpicks: {totals[4]}\n')
+
+class LinewiseReporter(TextReporter):
+    linewise = True
+
+class JsonReporter(Reporter):
+    '''
+    A single JSON object mapping paths to results.
+    Kept for compatibility: use NdjsonReporter for anything that needs
+    to process the output as it is produced.
+    '''
+    def start(self):
+        self.out.write('{\n')
+    def file(self, pth, blob):
+        self.out.write(json.dumps(pth) + ':' + json.dumps(blob) + ',\n')
+    def finish(self, totals, note=None):
+        self.out.write('"":{}\n}\n')
+        if note:
+            print(note, file=sys.stderr)
+
+class NdjsonReporter(Reporter):
+    '''
+    Newline-delimited JSON with one record per diagnostic, so that the
+    output can be parsed as it is produced and is valid up to the last
+    complete line even if the run is interrupted.
+
+    {"type": "check", "path": ..., "line": ..., "level": ..., "name": ..., "desc": ...}
+    {"type": "stats", "path": ..., "stats": {...}}
+    {"type": "summary", "errors": ..., "warnings": ..., "suggestions": ..., "nitpicks": ..., ["note": ...]}
+    '''
+    encoder = json.JSONEncoder(separators=(',', ':'))
+    def file(self, pth, blob):
+        # write each record as it is encoded, since legacy files can
+        # have a very large number of diagnostics
+        enc = self.encoder.encode
+        write = self.out.write
+        if self.args.check:
+            for msg in blob['checks']:
+                rec = {'type': 'check', 'path': pth}
+                rec.update(msg)
+                write(enc(rec) + '\n')
+        if self.args.stats and blob['stats']:
+            write(enc({'type': 'stats', 'path': pth,
+                       'stats': blob['stats']}) + '\n')
+    def finish(self, totals, note=None):
+        rec = {'type': 'summary'}
+        for level, label in LevelLabels.items():
+            rec[label.lower() + 's'] = totals[level]
+        if note:
+            rec['note'] = note
+        self.out.write(self.encoder.encode(rec) + '\n')
+
+Reporters = {
+    'text': TextReporter,
+    'linewise': LinewiseReporter,
+    'json': JsonReporter,
+    'ndjson': NdjsonReporter,
+}
+
+def make_reporter(args, out=None):
+    fmt = getattr(args, 'format', None)
+    if fmt is None:
+        # args from before --format existed
+        if getattr(args, 'json', False):
+            fmt = 'json'
+        elif getattr(args, 'linewise', False):
+            fmt = 'linewise'
+        else:
+            fmt = 'text'
+    return Reporters[fmt](args, out)
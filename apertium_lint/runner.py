@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+from .file_linter import FileLinter, Probes, identify, lint
+from collections import deque
+import atexit
+import os
+import queue
+
+def lint_results(path, check=True, stats=False, cache=None, selection=None,
+                 root=None, data=None):
+    '''
+    Lint the file at path and return the output of get_results(),
+    which only contains plain data and so can be sent between processes.
+    If cache (a ResultCache) is given, reuse the stored results if the
+    file hasn't changed, and store them otherwise.
+    selection (a Selection) limits which checks are run, and root is
+    passed along to identify().
+    If data is given, it is linted instead of the contents of path
+    (see lint_bytes()).
+    '''
+    if cache is None:
+        return lint(path, check=check, stats=stats, selection=selection,
+                    root=root, data=data).get_results()
+    key = cache.key(path, identify(path, '', root), check, stats, selection,
+                    data)
+    res = cache.get(key)
+    if res is None:
+        res = lint(path, check=check, stats=stats, selection=selection,
+                   root=root, data=data).get_results()
+        cache.put(key, res)
+    return res
+
+# FileLinter class attributes which can be changed from the command line
+# and so need to be copied to worker processes
+Settings = ['SampleSize', 'SkipSize']
+
+# In the workers, the highest call to run_files() which was abandoned
+_cancelled = None
+
+def _init_worker(settings, probes, cancelled):
+    global _cancelled
+    for k, v in settings.items():
+        setattr(FileLinter, k, v)
+    Probes[:] = probes
+    _cancelled = cancelled
+    # The linters (and with them lxml and the tree-sitter grammars) are
+    # imported by identify() the first time each worker needs them.
+
+def _lint_task(args, call=0):
+    '''
+    Run lint_results() in a worker, and return what it found along with
+    the changes to the cache counters and whatever the probes collected,
+    which would otherwise stay in the worker.
+    Returns None without linting anything if the call to run_files()
+    which it belongs to has been abandoned.
+    '''
+    if _cancelled is not None and call <= _cancelled.value:
+        return None
+    cache = args[3]
+    before = (cache.hits, cache.misses) if cache else (0, 0)
+    res = lint_results(*args)
+    after = (cache.hits, cache.misses) if cache else (0, 0)
+    return (res, (after[0] - before[0], after[1] - before[1]),
+            [p.drain() for p in Probes])
+
+class SharedPool:
+    '''
+    The process pool used by run_files(), which is kept between calls
+    so that its workers only import the linters and grammars and
+    compile their queries once.
+    It is replaced if the number of jobs, the Settings or the probes
+    change, since the workers are started with them.
+    '''
+    def __init__(self):
+        self.key = None
+        self.pool = None
+        self.cancelled = None
+        self.calls = 0
+    def get(self, jobs, probes):
+        import multiprocessing
+        settings = {k: getattr(FileLinter, k) for k in Settings}
+        key = (jobs, tuple(sorted(settings.items())), tuple(probes))
+        if self.pool is None or self.key != key:
+            self.close()
+            self.key = key
+            self.cancelled = multiprocessing.Value('q', 0, lock=False)
+            self.pool = multiprocessing.Pool(
+                jobs, _init_worker, (settings, list(probes), self.cancelled))
+        self.calls += 1
+        return self.pool, self.calls
+    def cancel(self, call):
+        '''Skip the files from call which haven't been started yet.'''
+        if self.cancelled is not None:
+            self.cancelled.value = max(self.cancelled.value, call)
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+            self.key = None
+
+_pool = SharedPool()
+atexit.register(_pool.close)
+
+def worker_count(jobs):
+    if jobs is None or jobs < 1:
+        return os.cpu_count() or 1
+    return jobs
+
+def run_files(paths, check=True, stats=False, jobs=1, cache=None,
+              config=None, probes=(), ordered=True):
+    '''
+    Lint every file in the iterable paths and yield (path, results)
+    in the same order as paths, or as each one finishes if ordered
+    is False.
+    Each entry in paths can also be (path, root), as from
+    Walker.walk(paths, roots=True), or (path, root, data) to lint data
+    in place of the contents of path.
+    If jobs is greater than 1, files are linted by a pool of that many
+    processes (0 means one per CPU), which is kept for later calls
+    (see SharedPool).
+    If cache is given, it is passed along to lint_results().
+    If config (a Config) is given, it decides which checks to run on
+    each file.
+    probes (see file_linter.Probe) are installed while the files are
+    linted, and with several jobs collect what each worker observed.
+    If the generator is closed before it is exhausted, any files which
+    haven't been started yet are skipped.
+    '''
+    def entries():
+        for ent in paths:
+            if isinstance(ent, str):
+                ent = (ent,)
+            pth, root, data = tuple(ent) + (None,) * (3 - len(ent))
+            sel = None if config is None else config.selection_for(pth)
+            yield pth, (pth, check, stats, cache, sel, root, data)
+    if jobs == 1:
+        Probes.extend(probes)
+        try:
+            for pth, args in entries():
+                yield pth, lint_results(*args)
+        finally:
+            for p in probes:
+                Probes.remove(p)
+        return
+    jobs = worker_count(jobs)
+    # Keep a bounded number of files in flight so that a large tree
+    # doesn't get queued all at once and results can be displayed
+    # in order as soon as they are available.
+    window = jobs * 4
+    pool, call = _pool.get(jobs, probes)
+    # with ordered=False, the index of each file is put here when it's done
+    done = queue.Queue()
+    def submit(args, callback=None):
+        return pool.apply_async(_lint_task, (args, call), callback=callback,
+                                error_callback=callback)
+    def collect(res):
+        res, (hits, misses), data = res.get()
+        if cache is not None:
+            cache.hits += hits
+            cache.misses += misses
+        for p, d in zip(probes, data):
+            p.merge(d)
+        return res
+    try:
+        if ordered:
+            pending = deque()
+            for pth, args in entries():
+                pending.append((pth, submit(args)))
+                if len(pending) >= window:
+                    p, res = pending.popleft()
+                    yield p, collect(res)
+            while pending:
+                p, res = pending.popleft()
+                yield p, collect(res)
+        else:
+            pending = {}
+            for i, (pth, args) in enumerate(entries()):
+                notify = lambda _, i=i: done.put(i)
+                pending[i] = (pth, submit(args, notify))
+                if len(pending) >= window:
+                    p, res = pending.pop(done.get())
+                    yield p, collect(res)
+            while pending:
+                p, res = pending.pop(done.get())
+                yield p, collect(res)
+    except GeneratorExit:
+        # The caller stopped early, so don't lint the files which are
+        # still queued. The pool is kept for next time.
+        _pool.cancel(call)
+        raise
+    except BaseException:
+        # something failed (or was interrupted), so don't trust the
+        # workers to be in a usable state
+        _pool.close()
+        raise
+
+def lint_many(paths, jobs=1, cache=None, check=True, stats=False,
+              config=None):
+    '''
+    Lint each file in paths and yield (path, results) as soon as each
+    one is done, which with several jobs might not be the order of
+    paths. The arguments are as for run_files().
+    Closing the generator (or breaking out of a loop over it) cancels
+    the files which haven't been linted yet.
+    Linters, grammars and compiled queries are loaded once per process,
+    and with several jobs the worker processes are kept between calls
+    (as long as jobs is the same), so repeated calls don't pay for them
+    again, and passing the same cache to each call shares the file
+    hashes it has already computed.
+    '''
+    return run_files(paths, check=check, stats=stats, jobs=jobs,
+                     cache=cache, config=config, ordered=False)
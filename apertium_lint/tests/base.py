@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 
+import gc
 import shutil
 import tempfile
 import os
 from .. import lint
+from ..bench.generate import Formats, generate
+from ..bench.run import exponent
+from time import perf_counter
 
 class TempDir:
     def __enter__(self):
@@ -26,13 +30,18 @@ X: :X
     }
     stats = False
     check = True
+    selection = None
+
+    def lint_text(self, tmpd, text):
+        pth = os.path.join(tmpd, self.file_name)
+        with open(pth, 'w') as fout:
+            fout.write(text)
+        return lint(pth, check=self.check, stats=self.stats,
+                    selection=self.selection)
 
     def runTest(self):
         with TempDir() as tmpd:
-            pth = os.path.join(tmpd, self.file_name)
-            with open(pth, 'w') as fout:
-                fout.write(self.file_contents)
-            linter = lint(pth, check=self.check, stats=self.stats)
+            linter = self.lint_text(tmpd, self.file_contents)
             blob = linter.get_results()
             self.assertEqual(self.expected_class, linter.__class__.__name__)
             if self.stats or self.expected_stats:
@@ -49,3 +58,71 @@ X: :X
                         out, self.expected_checks,
                         'Unexpected check returned on line %s of type %s' % out
                     )
+
+class ScalingTestBase(LintTestBase):
+    '''
+    Lint files from bench.generate at each of sizes and fail if the time
+    grows faster than size ** max_exponent.
+    Subclasses set fmt, sizes and expected_class, and can override
+    generate() to pass other arguments to the generator.
+
+    Noise only ever makes a timing slower, so each point is the fastest
+    of several samples, each of which lints the file as many times as
+    fit in min_time. If the fit is still too steep, every point is
+    measured again (up to retries times) keeping the fastest, so that
+    a busy machine can't fail a linear check but a superlinear one
+    still fails every time.
+    '''
+    fmt = 'lexd'
+    sizes = [1000, 4000]
+    max_exponent = 1.5
+    repeat = 3
+    min_time = 0.05
+    retries = 4
+    stats = True
+
+    @property
+    def file_name(self):
+        return Formats[self.fmt][0]
+
+    def generate(self, n):
+        return generate(self.fmt, n)[1]
+
+    def best_time(self, tmpd, text):
+        best = None
+        for _ in range(self.repeat):
+            count = 0
+            gc.collect()
+            gc.disable()
+            try:
+                start = perf_counter()
+                while True:
+                    linter = self.lint_text(tmpd, text)
+                    linter.get_results()
+                    count += 1
+                    seconds = perf_counter() - start
+                    if seconds >= self.min_time:
+                        break
+            finally:
+                gc.enable()
+            if best is None or seconds / count < best:
+                best = seconds / count
+        self.assertEqual(self.expected_class, linter.__class__.__name__)
+        return best
+
+    def runTest(self):
+        with TempDir() as tmpd:
+            # the first file also pays for imports and compiling queries
+            self.lint_text(tmpd, self.generate(self.sizes[0]))
+            texts = [self.generate(n) for n in self.sizes]
+            times = [self.best_time(tmpd, t) for t in texts]
+            for _ in range(self.retries):
+                if exponent(list(zip(self.sizes, times))) <= self.max_exponent:
+                    break
+                times = [min(s, self.best_time(tmpd, t))
+                         for s, t in zip(times, texts)]
+        points = list(zip(self.sizes, times))
+        exp = exponent(points)
+        self.assertLessEqual(
+            exp, self.max_exponent,
+            f'{self.expected_class} took {points}, which grows as n^{exp:.2f}')
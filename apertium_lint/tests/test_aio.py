@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from .base import TempDir
+from ..aio import _read, lint_async, lint_paths_async
+from ..file_linter import FileLinter
+from ..runner import lint_results, run_files
+from ..walk import Walker
+
+class Async(unittest.TestCase):
+    files = {
+        'a.rlx': 'SELECT X ;\n',
+        'b.lexd': 'PATTERNS\nX: :X\n',
+        'c.txt': 'no newline',
+        'sub/d.rlx': 'LIST X = x ;\nSELECT X ;\n',
+        'sub/e.dix': '<dictionary><section id="main" type="standard"/></dictionary>\n',
+    }
+    def runTest(self):
+        with TempDir() as tmpd:
+            for name, text in self.files.items():
+                pth = os.path.join(tmpd, name)
+                os.makedirs(os.path.dirname(pth), exist_ok=True)
+                with open(pth, 'w') as fout:
+                    fout.write(text)
+            expected = dict(run_files(Walker().walk([tmpd], roots=True),
+                                      stats=True))
+            self.assertEqual(len(self.files), len(expected))
+            async def collect(**kwargs):
+                return dict([r async for r in
+                             lint_paths_async([tmpd], stats=True, **kwargs)])
+            for limit in [1, 3]:
+                self.assertEqual(expected, asyncio.run(collect(limit=limit)))
+            with ThreadPoolExecutor(2) as ex:
+                self.assertEqual(expected, asyncio.run(collect(executor=ex)))
+            pth = os.path.join(tmpd, 'a.rlx')
+            self.assertEqual(lint_results(pth),
+                             asyncio.run(lint_async(pth)))
+            async def first():
+                gen = lint_paths_async([tmpd], limit=2)
+                async for pth, _ in gen:
+                    await gen.aclose()
+                    return pth
+            self.assertIn(asyncio.run(first()), expected)
+
+class LargeFile(unittest.TestCase):
+    '''Files with only the generic checks aren't read whole.'''
+    def runTest(self):
+        with TempDir() as tmpd:
+            big = os.path.join(tmpd, 'big.txt')
+            with open(big, 'w') as fout:
+                fout.write('x\n' * 1000)
+            small = os.path.join(tmpd, 'a.rlx')
+            with open(small, 'w') as fout:
+                fout.write('SELECT X ;\n')
+            self.assertIsNone(_read(big, tmpd))
+            self.assertEqual(b'SELECT X ;\n', _read(small, tmpd))
+            with mock.patch.object(FileLinter, 'SkipSize', 100):
+                res = asyncio.run(lint_async(big))
+                self.assertEqual(lint_results(big), res)
+            self.assertEqual(['large-file'], [c['name'] for c in res['checks']])
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from .base import TempDir
+from ..bench.generate import Formats, generate
+from ..bench.run import compare, exponent, run
+from ..file_linter import Verbosity, lint
+
+class Generators(unittest.TestCase):
+    expected = {
+        'monodix': 'MonoDixLinter',
+        'bidix': 'BiDixLinter',
+        'lexc': 'LexCLinter',
+        'lexd': 'LexdLinter',
+        'twolc': 'TwolCLinter',
+        'rlx': 'CGLinter',
+        't1x': 'TransferLinter',
+        'rtx': 'RTXLinter',
+        'lrx': 'LRXLinter',
+    }
+    def runTest(self):
+        self.assertEqual(sorted(self.expected), sorted(Formats))
+        with TempDir() as tmpd:
+            for fmt, cls in self.expected.items():
+                with self.subTest(fmt=fmt):
+                    name, text = generate(fmt, 50, seed=3)
+                    self.assertEqual((name, text), generate(fmt, 50, seed=3))
+                    self.assertNotEqual(text, generate(fmt, 50, seed=4)[1])
+                    pth = os.path.join(tmpd, name)
+                    with open(pth, 'w') as fout:
+                        fout.write(text)
+                    linter = lint(pth)
+                    self.assertEqual(cls, type(linter).__name__)
+                    tree = getattr(linter, 'tree', None)
+                    if hasattr(tree, 'root_node'):
+                        self.assertFalse(tree.root_node.has_error)
+                    levels = [c['level'] for c in linter.get_results()['checks']]
+                    self.assertNotIn(Verbosity.Error, levels)
+
+class Compare(unittest.TestCase):
+    def runTest(self):
+        self.assertAlmostEqual(1.0, exponent([(10, 0.1), (100, 1.0)]))
+        self.assertAlmostEqual(2.0, exponent([(10, 0.1), (100, 10.0)]))
+        data = run(['lexd'], [10, 20], repeat=1)
+        self.assertEqual(2, len(data['results']))
+        self.assertEqual('LexdLinter', data['results'][0]['linter'])
+        self.assertEqual([], list(compare(data, data)))
+        old = {'results': [{'format': 'lexd', 'size': 10, 'seconds': 0.1},
+                           {'format': 'lexd', 'size': 20, 'seconds': 0.1},
+                           {'format': 'lexd', 'size': 30, 'seconds': 0.001}]}
+        new = {'results': [{'format': 'lexd', 'size': 10, 'seconds': 0.11},
+                           {'format': 'lexd', 'size': 20, 'seconds': 0.2},
+                           {'format': 'lexd', 'size': 30, 'seconds': 0.003}]}
+        self.assertEqual([('lexd', 20, 0.1, 0.2, 2.0)],
+                         list(compare(old, new, threshold=0.25)))
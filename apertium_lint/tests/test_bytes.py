@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import json
+import os
+import sys
+import unittest
+from collections import defaultdict
+from .base import TempDir
+from .. import lint, lint_bytes, lint_paths
+from ..bench.generate import Formats, generate
+from ..cache import ResultCache
+from ..report import make_reporter
+from ..runner import lint_results
+
+class SameAsFile(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            for fmt in sorted(Formats):
+                with self.subTest(fmt=fmt):
+                    name, text = generate(fmt, 30, seed=1)
+                    pth = os.path.join(tmpd, name)
+                    with open(pth, 'w') as fout:
+                        fout.write(text)
+                    linter = lint(pth, stats=True)
+                    # the hint doesn't need to exist
+                    hint = os.path.join(tmpd, 'missing', name)
+                    mem = lint_bytes(text.encode('utf-8'), hint, stats=True)
+                    self.assertIs(type(linter), type(mem))
+                    self.assertEqual(linter.get_results(), mem.get_results())
+
+class Buffer(unittest.TestCase):
+    def runTest(self):
+        res = lint_bytes('SELECT X ;', 'x.rlx').get_results()
+        self.assertIn((1, 'noNL'),
+                      [(c['line'], c['name']) for c in res['checks']])
+        res = lint_bytes('SELECT X ;\n# a\u00a0b\n', 'x.rlx').get_results()
+        self.assertIn((2, 'NBSP'),
+                      [(c['line'], c['name']) for c in res['checks']])
+
+class Cached(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            cache = ResultCache(tmpd)
+            one = lint_results('x.rlx', cache=cache, data=b'SELECT X ;\n')
+            two = lint_results('x.rlx', cache=cache, data=b'SELECT Y ;\n')
+            self.assertNotEqual(one, two)
+            self.assertEqual(two, lint_results('x.rlx', cache=cache,
+                                               data=b'SELECT Y ;\n'))
+
+class Stdin(unittest.TestCase):
+    def runTest(self):
+        args = argparse.Namespace(
+            check=True, stats=False, ignore=False, format='ndjson', jobs=1,
+            max_error=-1, max_warn=-1, stdin_filename='dev/x.rlx')
+        out = io.StringIO()
+        totals = defaultdict(int)
+        old = sys.stdin
+        sys.stdin = io.TextIOWrapper(io.BytesIO(b'SELECT X ;\n'))
+        try:
+            lint_paths(['-'], args, totals, make_reporter(args, out))
+        finally:
+            sys.stdin = old
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(['dev/x.rlx'], [r['path'] for r in records])
+        self.assertEqual(1, totals[1])
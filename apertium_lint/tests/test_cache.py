@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from .base import TempDir
+from ..cache import ResultCache
+from ..file_linter import FileLinter
+from ..runner import lint_results
+
+class CacheReuse(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            cache = ResultCache(os.path.join(tmpd, 'cache'))
+            pth = os.path.join(tmpd, 'test.rlx')
+            with open(pth, 'w') as fout:
+                fout.write('SELECT X ;\n')
+            first = lint_results(pth, cache=cache)
+            self.assertEqual((0, 1), (cache.hits, cache.misses))
+            self.assertEqual(first, lint_results(pth, cache=cache))
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+            # different flags get separate entries
+            lint_results(pth, stats=True, cache=cache)
+            self.assertEqual((1, 2), (cache.hits, cache.misses))
+            with open(pth, 'w') as fout:
+                fout.write('LIST X = x ;\nSELECT X ;\n')
+            self.assertEqual([], lint_results(pth, cache=cache)['checks'])
+            self.assertEqual((1, 3), (cache.hits, cache.misses))
+
+class CacheStatIndex(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            cache = ResultCache(os.path.join(tmpd, 'cache'))
+            pth = os.path.join(tmpd, 'test.rlx')
+            with open(pth, 'w') as fout:
+                fout.write('SELECT X ;\n')
+            os.utime(pth, (1, 1))
+            digest = cache.file_digest(pth)
+            # the stored digest is trusted as long as mtime and size match
+            with open(pth, 'w') as fout:
+                fout.write('SELECT Y ;\n')
+            os.utime(pth, (1, 1))
+            self.assertEqual(digest, cache.file_digest(pth))
+            os.utime(pth, (2, 2))
+            self.assertNotEqual(digest, cache.file_digest(pth))
+
+class CacheSettings(unittest.TestCase):
+    '''Changing --skip-size doesn't reuse results from before.'''
+    def tearDown(self):
+        FileLinter.SkipSize = self.skip_size
+    def runTest(self):
+        self.skip_size = FileLinter.SkipSize
+        with TempDir() as tmpd:
+            cache = ResultCache(os.path.join(tmpd, 'cache'))
+            pth = os.path.join(tmpd, 'test.txt')
+            with open(pth, 'w') as fout:
+                fout.write('x' * 200)
+            self.assertEqual(['noNL'], [c['name'] for c in
+                                        lint_results(pth, cache=cache)['checks']])
+            FileLinter.SkipSize = 100
+            self.assertEqual(['large-file'], [c['name'] for c in
+                                              lint_results(pth, cache=cache)['checks']])
+            self.assertEqual((0, 2), (cache.hits, cache.misses))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import signal
+import socket
+import threading
+import unittest
+from contextlib import redirect_stdout
+from .base import TempDir
+from .. import main
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'needs Unix sockets')
+class Daemon(unittest.TestCase):
+    def runTest(self):
+        from ..daemon import make_server, request
+        with TempDir() as tmpd:
+            with open(os.path.join(tmpd, 'a.rlx'), 'w') as fout:
+                fout.write('SELECT X ;\n')
+            sock = os.path.join(tmpd, 'lint.sock')
+            server = make_server(sock)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                argv = ['--linewise', '--max-error', '0',
+                        os.path.join(tmpd, 'a.rlx')]
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    with self.assertRaises(SystemExit) as exit:
+                        main(argv)
+                resp = request(sock, argv)
+                self.assertEqual(out.getvalue(), resp['stdout'])
+                self.assertEqual(exit.exception.code, resp['status'])
+                self.assertEqual(1, resp['status'])
+                resp = request(sock, ['-l', '--stdin-filename', 'b.rlx'],
+                               stdin=b'SELECT Y ;')
+                self.assertIn('b.rlx:1:', resp['stdout'])
+                self.assertIn('noNL', resp['stdout'])
+                resp = request(sock, ['--no-such-option'], prog='lint')
+                self.assertEqual(2, resp['status'])
+                self.assertIn('lint: error:', resp['stderr'])
+                for opt in ['--watch', '--lsp', '--client', '--daemon']:
+                    resp = request(sock, [opt, tmpd], prog='lint')
+                    self.assertEqual(2, resp['status'])
+                    self.assertIn(f'lint: error: {opt} ', resp['stderr'])
+                # only one daemon at a time
+                with self.assertRaises(OSError):
+                    make_server(sock)
+            finally:
+                server.shutdown()
+                thread.join()
+                server.server_close()
+
+class ClientArgv(unittest.TestCase):
+    def runTest(self):
+        from ..daemon import client_argv
+        self.assertEqual(
+            ['-l', 'x', '--', '--client'],
+            client_argv(['--client', '-l', '--socket', 's', 'x',
+                         '--socket=t', '--', '--client']))
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX') and hasattr(signal, 'SIGTERM'),
+                     'needs Unix sockets')
+class Terminate(unittest.TestCase):
+    '''SIGTERM stops the daemon even while it is linting.'''
+    def runTest(self):
+        import subprocess
+        import sys
+        import time
+        with TempDir() as tmpd:
+            sock = os.path.join(tmpd, 'lint.sock')
+            # the daemon is killed while it is linting a file
+            code = ('import os, signal\n'
+                    'from apertium_lint import daemon, runner\n'
+                    'def killed(*args, **kwargs):\n'
+                    '    os.kill(os.getpid(), signal.SIGTERM)\n'
+                    '    return {"stats": {}, "checks": []}\n'
+                    'runner.lint_results = killed\n'
+                    f'daemon.serve({sock!r})\n')
+            root = os.path.dirname(os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__))))
+            proc = subprocess.Popen([sys.executable, '-c', code], cwd=root,
+                                    stderr=subprocess.PIPE)
+            try:
+                for _ in range(100):
+                    if os.path.exists(sock):
+                        break
+                    time.sleep(0.05)
+                from ..daemon import request
+                with open(os.path.join(tmpd, 'a.rlx'), 'w') as fout:
+                    fout.write('SELECT X ;\n')
+                with self.assertRaises(OSError):
+                    request(sock, [os.path.join(tmpd, 'a.rlx')])
+                self.assertEqual(0, proc.wait(10))
+                self.assertFalse(os.path.exists(sock))
+            finally:
+                proc.kill()
+                proc.wait()
+                proc.stderr.close()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from .base import LintTestBase, TempDir
+from ..file_linter import FileLinter, lint
+
+class UnknownFile(unittest.TestCase, LintTestBase):
+    file_name = 'notes.txt'
+    file_contents = 'fine\nnon\u00a0breaking\ncombining e\u0301\nno newline'
+    expected_class = 'FileLinter'
+    expected_checks = [
+        (2, 'NBSP'),
+        (3, 'unnorm'),
+        (4, 'noNL'),
+    ]
+
+class SizeTiers(unittest.TestCase):
+    def setUp(self):
+        self.sizes = (FileLinter.SampleSize, FileLinter.SkipSize)
+    def tearDown(self):
+        FileLinter.SampleSize, FileLinter.SkipSize = self.sizes
+    def lint_bytes(self, byt):
+        with TempDir() as tmpd:
+            pth = os.path.join(tmpd, 'data.txt')
+            with open(pth, 'wb') as fout:
+                fout.write(byt)
+            blob = lint(pth).get_results()
+            return [(out['line'], out['name']) for out in blob['checks']]
+    def runTest(self):
+        text = 'a\u00a0b\n'.encode('utf-8') * 100 + b'end'
+        self.assertEqual(101, len(self.lint_bytes(text)))
+        FileLinter.SampleSize = 40
+        self.assertEqual([(i, 'NBSP') for i in range(1, 9)] + [(101, 'noNL')],
+                         self.lint_bytes(text))
+        FileLinter.SkipSize = 100
+        self.assertEqual([(1, 'large-file')], self.lint_bytes(text))
+        self.assertEqual([], self.lint_bytes(b'\0\1\2\3 no newline'))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import unittest
+from .base import TempDir
+from ..bench.fuzz import fuzz, run_file
+
+FixtureDir = os.path.join(os.path.dirname(__file__), 'fuzz')
+
+class FuzzFixtures(unittest.TestCase):
+    '''Inputs found by `python -m apertium_lint.bench fuzz`.'''
+    def runTest(self):
+        for name in sorted(os.listdir(FixtureDir)):
+            with self.subTest(fixture=name):
+                with open(os.path.join(FixtureDir, name, 'fixture.json')) as fin:
+                    meta = json.load(fin)
+                res = run_file(os.path.join(FixtureDir, name, meta['file']),
+                               meta['budget'], depth=False)
+                self.assertEqual('ok', res[0], res)
+
+class FuzzSaves(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            # nothing can be linted in no time at all
+            found = list(fuzz(['lexd'], iterations=1, budget=0, rate=0,
+                              out_dir=tmpd))
+            self.assertEqual(1, len(found))
+            with open(os.path.join(found[0], 'fixture.json')) as fin:
+                meta = json.load(fin)
+            self.assertEqual('timeout', meta['result'][0])
+            self.assertEqual(1, meta['params']['n'])
+            self.assertTrue(os.path.isfile(os.path.join(found[0], meta['file'])))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import unittest
+from .base import TempDir
+from .test_walk import make_tree
+from .. import lint_paths
+from ..file_linter import FileLinter, SkipLinting, declare, identify
+from argparse import Namespace
+from collections import defaultdict
+
+class Identify(unittest.TestCase):
+    cases = [
+        ('apertium-eng.eng.dix', 'MonoDixLinter'),
+        ('apertium-eng-spa.eng-spa.dix', 'BiDixLinter'),
+        ('dev/apertium-eng.eng.dix', 'SkipLinting'),
+        ('dev/apertium-eng.eng.rlx', 'CGLinter'),
+        ('dev/notes.txt', 'SkipLinting'),
+        ('apertium-eng-spa.eng-spa.t1x', 'TransferLinter'),
+        ('apertium-eng-spa.eng-spa.lrx', 'LRXLinter'),
+        ('apertium-eng.eng.lexc', 'LexCLinter'),
+        ('apertium-eng.eng.lexd', 'LexdLinter'),
+        ('apertium-eng.eng.twol', 'TwolCLinter'),
+        ('apertium-eng.eng.rlx', 'CGLinter'),
+        ('apertium-eng-spa.spa-eng.rtx', 'RTXLinter'),
+        ('modes.xml', 'ModesLinter'),
+        ('sub/modes.xml', 'ModesLinter'),
+        ('modes/eng-spa.mode', 'SkipLinting'),
+        ('Makefile.am', 'FileLinter'),
+        ('Makefile.in', 'SkipLinting'),
+        ('configure.ac', 'SkipLinting'),
+        ('README', 'FileLinter'),
+        ('.gitignore', 'FileLinter'),
+        ('x.dix~', 'SkipLinting'),
+        ('test/expected/a.txt', 'SkipLinting'),
+        ('test/a-gold.txt', 'SkipLinting'),
+        ('test/a.txt', 'FileLinter'),
+        ('corpus/big.txt', 'SkipLinting'),
+        ('devtools/x.txt', 'FileLinter'),
+        ('eng.bin', 'SkipLinting'),
+    ]
+    def runTest(self):
+        for pth, exp in self.cases:
+            self.assertEqual(exp, identify(pth, '').__name__, pth)
+        # path rules apply relative to the path being linted
+        self.assertEqual('FileLinter',
+                         identify('/src/dev/eng/x.txt', '', '/src/dev/eng').__name__)
+        self.assertEqual('FileLinter',
+                         identify('dev/eng/x.txt', '', 'dev/eng').__name__)
+        self.assertEqual('SkipLinting',
+                         identify('/src/eng/dev/x.txt', '', '/src/eng').__name__)
+        self.assertEqual('FileLinter',
+                         identify('/src/dev/x.txt', '', '/src/dev/x.txt').__name__)
+        self.assertEqual('TransferLinter', identify('notes.txt', 't2x').__name__)
+
+class SkipBeforeIdentifiers(unittest.TestCase):
+    '''
+    A path which SkipLinting's PathIdentifiers match is skipped even if
+    a linter's Identifiers also match it, whichever was registered first.
+    '''
+    def setUp(self):
+        declare('apertium_lint.xml.modes:ModesLinter',
+                identifiers=[r'.*\.skiptest$'])
+        FileLinter.PathIdentifiers.append((re.compile(r'(/|^)skiptest/'),
+                                           SkipLinting))
+    def tearDown(self):
+        del FileLinter.Identifiers[-1]
+        del FileLinter.PathIdentifiers[-1]
+    def runTest(self):
+        for pth, exp in [
+                ('x.skiptest', 'ModesLinter'),
+                ('skiptest/x.skiptest', 'SkipLinting'),
+                ('skiptest/modes.xml', 'SkipLinting'),
+                ('dev/modes.xml', 'SkipLinting'),
+                ('test/expected/apertium-eng.eng.dix', 'SkipLinting'),
+                ('modes.xml', 'ModesLinter'),
+        ]:
+            self.assertEqual(exp, identify(pth, '').__name__, pth)
+
+class LintDevSubdirectory(unittest.TestCase):
+    '''Linting dev/<pair> from its parent directory lints the pair.'''
+    def runTest(self):
+        with TempDir() as tmpd:
+            make_tree(tmpd, ['dev/apertium-eng/apertium-eng.eng.rlx',
+                             'dev/apertium-eng/notes.txt',
+                             'dev/apertium-eng/corpus/x.txt'])
+            with open(os.path.join(tmpd, 'dev/apertium-eng/apertium-eng.eng.rlx'), 'w') as fout:
+                fout.write('SELECT X ;\n')
+            args = Namespace(ignore=False, check=True, stats=False,
+                             format='ndjson')
+            seen = []
+            class Collect:
+                def file(self, pth, blob):
+                    seen.append((pth, [c['name'] for c in blob['checks']]))
+            cwd = os.getcwd()
+            try:
+                os.chdir(tmpd)
+                lint_paths([os.path.join('dev', 'apertium-eng')], args,
+                           defaultdict(int), Collect())
+            finally:
+                os.chdir(cwd)
+            self.assertEqual([
+                ('dev/apertium-eng/apertium-eng.eng.rlx', ['undef-set']),
+                ('dev/apertium-eng/notes.txt', []),
+            ], sorted(seen))
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import unittest
-from .base import LintTestBase
+from .base import LintTestBase, TempDir
 
 class EmptyLeft(unittest.TestCase, LintTestBase):
     file_name = 'test.lexc'
@@ -80,3 +80,41 @@ LEXICON Root
         (9, 'undef-archi'),
         (9, 'undef-tag'),
     ]
+
+class EmptyPathTie(unittest.TestCase, LintTestBase):
+    '''Of the shortest empty paths, the one reached last is reported.'''
+    file_name = 'test.lexc'
+    file_contents = '''
+LEXICON Root
+E ;
+F ;
+
+LEXICON E
+C ;
+
+LEXICON F
+A ;
+B ;
+C ;
+
+LEXICON A
+x # ;
+
+LEXICON B
+# ;
+
+LEXICON C
+# ;
+'''
+    expected_class = 'LexCLinter'
+    expected_checks = [
+        (1, 'left-empty'),
+        (1, 'right-empty'),
+    ]
+
+    def runTest(self):
+        LintTestBase.runTest(self)
+        with TempDir() as tmpd:
+            checks = self.lint_text(tmpd, self.file_contents).get_results()['checks']
+        for msg in checks:
+            self.assertTrue(msg['desc'].endswith(' Root F C #.'), msg['desc'])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import random
+import unittest
+from unittest import mock
+from .. import lint_bytes
+from ..bench.generate import generate
+from ..lsp import Document, Server
+from ..tree_sitter.lexc import LexCLinter
+import tree_sitter_apertium as TSA
+
+def change(line, char, end_line, end_char, text):
+    return {'range': {'start': {'line': line, 'character': char},
+                      'end': {'line': end_line, 'character': end_char}},
+            'text': text}
+
+class Incremental(unittest.TestCase):
+    inserts = ['', 'x', '%<n%>', '\n', ';', ' ', 'ä', '<n>', 'LEXICON Y\n']
+    def runTest(self):
+        for fmt in ['lexc', 'twolc', 'lexd', 'rlx', 'rtx']:
+            with self.subTest(fmt=fmt):
+                name, text = generate(fmt, 60, seed=2)
+                doc = Document('file:///tmp/' + name, text)
+                doc.lint()
+                rng = random.Random(1)
+                for _ in range(20):
+                    lines = doc.data.decode('utf-8').split('\n')
+                    ln = rng.randrange(len(lines))
+                    end = min(ln + rng.choice([0, 0, 1]), len(lines) - 1)
+                    ch = rng.randrange(len(lines[ln]) + 1)
+                    if end == ln:
+                        end_ch = rng.randrange(ch, len(lines[ln]) + 1)
+                    else:
+                        end_ch = rng.randrange(len(lines[end]) + 1)
+                    doc.apply([change(ln, ch, end, end_ch,
+                                      rng.choice(self.inserts))])
+                    self.assertEqual(
+                        lint_bytes(doc.data, '/tmp/' + name).get_results(),
+                        doc.lint())
+                    self.assertEqual(
+                        str(TSA.parse_bytes(doc.data, doc.cls.language)),
+                        str(doc.tree.root_node))
+
+class Reuse(unittest.TestCase):
+    def runTest(self):
+        name, text = generate('lexc', 200, seed=1)
+        doc = Document('file:///tmp/' + name, text)
+        doc.lint()
+        line = text.split('\n').index('LEXICON Root') + 1
+        doc.apply([change(line, 0, line, 0, 'xyz%<undef%>')])
+        hook = LexCLinter.per_lexicon_string__symbols
+        with mock.patch.object(LexCLinter, 'per_lexicon_string__symbols',
+                               autospec=True, side_effect=hook) as per:
+            res = doc.lint()
+        self.assertEqual(1, per.call_count)
+        self.assertEqual(lint_bytes(doc.data, name).get_results(), res)
+        self.assertIn((line + 1, 'undef-tag'),
+                      [(c['line'], c['name']) for c in res['checks']])
+
+class Protocol(unittest.TestCase):
+    def runTest(self):
+        msgs = [
+            {'id': 1, 'method': 'initialize', 'params': {}},
+            {'method': 'initialized', 'params': {}},
+            {'method': 'textDocument/didOpen', 'params': {'textDocument': {
+                'uri': 'file:///tmp/x.rlx', 'text': 'SELECT X ;\n'}}},
+            {'method': 'textDocument/didChange', 'params': {
+                'textDocument': {'uri': 'file:///tmp/x.rlx'},
+                'contentChanges': [change(0, 0, 0, 0, 'LIST X = x ;\n')]}},
+            {'id': 2, 'method': 'textDocument/hover', 'params': {}},
+            {'method': 'textDocument/didChange', 'params': {
+                'textDocument': {'uri': 'file:///tmp/x.rlx'},
+                'contentChanges': [change(0, 5, 0, 6, 'Y')]}},
+            {'id': 3, 'method': 'shutdown'},
+            {'method': 'exit'},
+        ]
+        fin = io.BytesIO()
+        for msg in msgs:
+            body = json.dumps(dict(msg, jsonrpc='2.0')).encode('utf-8')
+            fin.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+        fin.seek(0)
+        fout = io.BytesIO()
+        self.assertEqual(0, Server(fin, fout).run())
+        out = []
+        for part in fout.getvalue().split(b'Content-Length: ')[1:]:
+            out.append(json.loads(part.split(b'\r\n\r\n', 1)[1]))
+        self.assertEqual(2, out[0]['result']['capabilities']
+                         ['textDocumentSync']['change'])
+        self.assertEqual(-32601, out[1]['error']['code'])
+        diags = [m['params']['diagnostics'] for m in out
+                 if m.get('method') == 'textDocument/publishDiagnostics']
+        self.assertEqual(1, len(diags))
+        self.assertEqual(
+            {('undef-set', 1), ('unuse-set', 0)},
+            {(d['code'], d['range']['start']['line']) for d in diags[0]})
+        self.assertEqual(3, out[-1]['id'])
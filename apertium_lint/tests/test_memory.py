@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import os
+import tracemalloc
+import unittest
+from .base import TempDir
+from ..memory import MemoryProbe
+from ..runner import run_files
+
+def big_dix(n):
+    ents = ''.join(f'    <e lm="w{i}"><i>w{i}</i><par n="x__n"/></e>\n'
+                   for i in range(n))
+    return f'''<dictionary>
+  <pardefs>
+    <pardef n="x__n"><e><p><l></l><r><s n="n"/></r></p></e></pardef>
+  </pardefs>
+  <section id="main" type="standard">
+{ents}  </section>
+</dictionary>
+'''
+
+class MemoryPhases(unittest.TestCase):
+    def runTest(self):
+        for jobs in [1, 2]:
+            with TempDir() as tmpd:
+                small = os.path.join(tmpd, 'small.dix')
+                large = os.path.join(tmpd, 'large.dix')
+                with open(small, 'w') as fout:
+                    fout.write(big_dix(10))
+                with open(large, 'w') as fout:
+                    fout.write(big_dix(2000))
+                probe = MemoryProbe()
+                list(run_files([small, large], jobs=jobs, probes=[probe]))
+                probe.stop()
+            self.assertFalse(tracemalloc.is_tracing())
+            self.assertEqual({small, large}, set(probe.files))
+            self.assertGreater(probe.files[large][1], probe.files[small][1])
+            phases = {ph: v for (name, ph), v in probe.phases.items()
+                      if name == 'MonoDixLinter'}
+            for ph in ['lint', 'load', 'check_space_blank', 'get_results']:
+                self.assertIn(ph, phases)
+            # a phase can't use more than the file as a whole
+            self.assertLessEqual(phases['check_space_blank'][0],
+                                 phases['lint'][0])
+            self.assertIn('Phase', next(probe.table()))
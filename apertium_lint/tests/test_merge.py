@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import unittest
+from collections import defaultdict
+from contextlib import redirect_stdout
+from .base import TempDir
+from .. import lint_paths, main as lint_main
+from ..merge import main, merge
+from ..report import make_reporter
+
+class Merge(unittest.TestCase):
+    files = {
+        'a.rlx': 'SELECT X ;\n',
+        'b.lexd': 'PATTERNS\nX: :X\n',
+        'c.txt': 'no newline',
+        'sub/d.rlx': 'LIST X = x ;\nSELECT X ;\n' * 5,
+        'sub/e.rlx': 'SELECT Y ;\nSELECT Z ;\n',
+    }
+    def run_lint(self, tmpd, fmt, shard=None):
+        args = argparse.Namespace(check=True, stats=False, ignore=False,
+                                  format=fmt, shard=shard)
+        out = io.StringIO()
+        totals = defaultdict(int)
+        reporter = make_reporter(args, out)
+        reporter.start()
+        lint_paths([tmpd], args, totals, reporter)
+        reporter.finish(totals)
+        return out.getvalue(), totals
+    def runTest(self):
+        with TempDir() as tmpd:
+            for name, text in self.files.items():
+                pth = os.path.join(tmpd, name)
+                os.makedirs(os.path.dirname(pth), exist_ok=True)
+                with open(pth, 'w') as fout:
+                    fout.write(text)
+            whole, totals = self.run_lint(tmpd, 'json')
+            expected, _ = merge([whole])
+            self.assertEqual(len(self.files), len(expected))
+            shards = [self.run_lint(tmpd, fmt, (i, 3))[0]
+                      for i, fmt in enumerate(['json', 'ndjson', 'ndjson'])]
+            files, notes = merge(shards)
+            self.assertEqual([], notes)
+            self.assertEqual({p: r['checks'] for p, r in expected.items()
+                              if r['checks']},
+                             {p: r['checks'] for p, r in files.items()})
+            names = []
+            for i, text in enumerate(shards):
+                names.append(os.path.join(tmpd, f'{i}.json'))
+                with open(names[-1], 'w') as fout:
+                    fout.write(text)
+            out = io.StringIO()
+            with redirect_stdout(out):
+                main(['-l'] + names)
+            self.assertEqual(
+                f'Errors: {totals[1]} Warnings: {totals[2]} Suggestions: 0 Nitpicks: 0',
+                out.getvalue().splitlines()[-1])
+            with redirect_stdout(io.StringIO()):
+                with self.assertRaises(SystemExit) as exit:
+                    main(['--max-error', str(totals[1] - 1)] + names)
+            self.assertEqual(1, exit.exception.code)
+
+class MergeCommand(unittest.TestCase):
+    '''apertium-lint merge lints a path called merge if there is one.'''
+    def runTest(self):
+        with TempDir() as tmpd:
+            res = os.path.join(tmpd, 'res.json')
+            with open(res, 'w') as fout:
+                fout.write('{"x.rlx": {"stats": {}, "checks": []}, "": {}}')
+            cwd = os.getcwd()
+            os.chdir(tmpd)
+            try:
+                for argv in [['merge', '-l', res], ['--merge', '-l', res]]:
+                    out = io.StringIO()
+                    with redirect_stdout(out):
+                        lint_main(argv)
+                    self.assertEqual('Errors: 0 Warnings: 0 Suggestions: 0 Nitpicks: 0',
+                                     out.getvalue().strip())
+                os.mkdir('merge')
+                with open(os.path.join('merge', 'a.rlx'), 'w') as fout:
+                    fout.write('SELECT X ;\n')
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    with self.assertRaises(SystemExit):
+                        lint_main(['merge', '-l', '--max-error', '0'])
+                self.assertIn('a.rlx:1: error: (undef-set)', out.getvalue())
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    lint_main(['--merge', '-l', res])
+                self.assertNotIn('a.rlx', out.getvalue())
+            finally:
+                os.chdir(cwd)
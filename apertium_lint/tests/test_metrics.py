@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from collections import defaultdict
+from .base import TempDir
+from ..cache import ResultCache
+from ..metrics import Metrics
+from ..runner import run_files
+from .test_timing import TwolC
+
+class MetricsFile(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            paths = []
+            for i in range(3):
+                pth = os.path.join(tmpd, f'test{i}.twol')
+                with open(pth, 'w') as fout:
+                    # different contents so the cache can't share results
+                    fout.write(TwolC + f'! {i}\n')
+                paths.append(pth)
+            cache = ResultCache(os.path.join(tmpd, 'cache'))
+            list(run_files(paths[:1], cache=cache))
+            metrics = Metrics()
+            totals = defaultdict(int)
+            for pth, res in run_files(paths, jobs=2, cache=cache,
+                                      probes=[metrics]):
+                for ch in res['checks']:
+                    totals[ch['level']] += 1
+            out = os.path.join(tmpd, 'lint.prom')
+            metrics.write(out, totals, cache)
+            with open(out) as fin:
+                lines = fin.read().splitlines()
+        samples = dict(l.rsplit(' ', 1) for l in lines if not l.startswith('#'))
+        self.assertEqual('2', samples['apertium_lint_files_total{linter="TwolCLinter"}'])
+        self.assertEqual(str(2 * len(TwolC.encode('utf-8')) + 8),
+                         samples['apertium_lint_read_bytes_total{linter="TwolCLinter"}'])
+        self.assertEqual('2', samples['apertium_lint_parse_seconds_count{linter="TwolCLinter"}'])
+        self.assertEqual('2', samples['apertium_lint_parse_seconds_bucket{le="+Inf",linter="TwolCLinter"}'])
+        self.assertIn('apertium_lint_check_seconds_total{check="per_rule__undefined_symbols",linter="TwolCLinter"}', samples)
+        self.assertIn('apertium_lint_check_seconds_total{check="check_encoding",linter="TwolCLinter"}', samples)
+        # the counts from the workers reach the parent
+        self.assertEqual('1', samples['apertium_lint_cache_hits_total'])
+        self.assertEqual('3', samples['apertium_lint_cache_misses_total'])
+        self.assertEqual(str(totals[2]), samples['apertium_lint_diagnostics_total{level="warning"}'])
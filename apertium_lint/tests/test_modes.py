@@ -20,3 +20,30 @@ class InstallDeps(unittest.TestCase, LintTestBase):
     expected_checks = [
         (6, 'install-deps')
     ]
+
+class RedefMode(unittest.TestCase, LintTestBase):
+    file_name = 'modes.xml'
+    file_contents = '''
+<modes>
+  <mode name="eng-morph">
+    <pipeline>
+      <program name="lt-proc">
+        <file name="eng.automorf.bin"/>
+      </program>
+    </pipeline>
+  </mode>
+  <mode name="eng-morph">
+    <pipeline>
+      <program name="lt-proc -w">
+        <file name="eng.automorf.bin"/>
+      </program>
+    </pipeline>
+  </mode>
+</modes>
+'''
+    expected_class = 'ModesLinter'
+    expected_checks = [
+        (10, 'redef-mode'),
+        (3, 'required-mode'),
+        (3, 'suggested-mode'),
+    ]
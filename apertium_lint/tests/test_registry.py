@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import importlib
+import os
+import unittest
+from .base import TempDir
+from ..file_linter import FileLinter, UnavailableLinter, declare, lint
+
+class DeclaredLinters(unittest.TestCase):
+    '''The patterns passed to declare() match the classes.'''
+    def runTest(self):
+        specs = set(c for c in FileLinter.Extensions.values()
+                    if isinstance(c, str))
+        specs.update(c for _, c in FileLinter.Identifiers
+                     if isinstance(c, str))
+        for spec in specs:
+            importlib.import_module(spec.split(':')[0])
+        for ext, cls in FileLinter.Extensions.items():
+            self.assertNotIsInstance(cls, str, ext)
+            self.assertIn(ext, cls.Extensions)
+        patterns = [r.pattern for r, _ in FileLinter.Identifiers]
+        self.assertEqual(len(patterns), len(set(patterns)))
+        for r, cls in FileLinter.Identifiers + FileLinter.PathIdentifiers:
+            self.assertNotIsInstance(cls, str, r.pattern)
+
+class MissingModule(unittest.TestCase):
+    def setUp(self):
+        declare('apertium_lint.no_such_module:Linter', extensions=['nosuch'])
+    def tearDown(self):
+        del FileLinter.Extensions['nosuch']
+    def runTest(self):
+        with TempDir() as tmpd:
+            pth = os.path.join(tmpd, 'test.nosuch')
+            with open(pth, 'w') as fout:
+                fout.write('text')
+            linter = lint(pth)
+            self.assertIsInstance(linter, UnavailableLinter)
+            self.assertEqual(['noNL', 'no-linter'],
+                             [c['name'] for c in linter.get_results()['checks']])
+
+class LazyImports(unittest.TestCase):
+    '''Linting one file only imports the linter it needs.'''
+    def runTest(self):
+        import subprocess
+        import sys
+        with TempDir() as tmpd:
+            pth = os.path.join(tmpd, 'modes.xml')
+            with open(pth, 'w') as fout:
+                fout.write('<modes>\n</modes>\n')
+            code = ('import sys\n'
+                    'from apertium_lint import main\n'
+                    'try:\n'
+                    f'    main([{pth!r}])\n'
+                    'except SystemExit:\n'
+                    '    pass\n'
+                    'print(" ".join(sys.modules))\n')
+            root = os.path.dirname(os.path.dirname(os.path.dirname(
+                os.path.abspath(__file__))))
+            proc = subprocess.run([sys.executable, '-c', code], cwd=root,
+                                  capture_output=True, text=True, check=True)
+            modules = proc.stdout.splitlines()[-1].split()
+            self.assertIn('apertium_lint.xml.modes', modules)
+            self.assertEqual([], [m for m in modules
+                                  if m.startswith('tree_sitter')])
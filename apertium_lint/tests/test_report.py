@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import json
+import unittest
+from collections import defaultdict
+from ..report import make_reporter
+
+class Ndjson(unittest.TestCase):
+    blob = {
+        'stats': {'rules': {'name': 'rules', 'long_name': 'Rules', 'value': 2}},
+        'checks': [
+            {'line': 2, 'level': 1, 'name': 'undef-set', 'desc': 'Set X used but not defined.'},
+            {'line': 5, 'level': 2, 'name': 'NBSP', 'desc': 'Line contains non-breaking space.'},
+        ],
+    }
+    def runTest(self):
+        args = argparse.Namespace(format='ndjson', check=True, stats=True)
+        out = io.StringIO()
+        rep = make_reporter(args, out)
+        rep.start()
+        rep.file('a.rlx', self.blob)
+        rep.file('b.rlx', {'stats': {}, 'checks': []})
+        totals = defaultdict(int, {1: 1, 2: 1})
+        rep.finish(totals)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(['check', 'check', 'stats', 'summary'],
+                         [r['type'] for r in records])
+        self.assertEqual({'type': 'check', 'path': 'a.rlx', 'line': 2,
+                          'level': 1, 'name': 'undef-set',
+                          'desc': 'Set X used but not defined.'}, records[0])
+        self.assertEqual(self.blob['stats'], records[2]['stats'])
+        self.assertEqual({'type': 'summary', 'errors': 1, 'warnings': 1,
+                          'suggestions': 0, 'nitpicks': 0}, records[3])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import os
+import pickle
+import unittest
+from collections import defaultdict
+from .base import TempDir
+from ..file_linter import lint
+from .. import runner
+from ..runner import lint_many, run_files
+
+class ParallelRun(unittest.TestCase):
+    files = {
+        'a.rlx': 'SELECT X ;\n',
+        'b.lexd': 'PATTERNS\nX: :X\n',
+        'c.txt': 'no newline',
+        'd.rlx': 'LIST X = x ;\nSELECT X ;\n',
+    }
+    def runTest(self):
+        with TempDir() as tmpd:
+            paths = []
+            for name, text in sorted(self.files.items()):
+                pth = os.path.join(tmpd, name)
+                with open(pth, 'w') as fout:
+                    fout.write(text)
+                paths.append(pth)
+            serial = list(run_files(paths, stats=True))
+            parallel = list(run_files(paths, stats=True, jobs=2))
+            self.assertEqual(paths, [p for p, _ in parallel])
+            self.assertEqual(serial, parallel)
+
+class LintMany(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            paths = []
+            for i in range(20):
+                pth = os.path.join(tmpd, f'{i}.rlx')
+                with open(pth, 'w') as fout:
+                    fout.write('SELECT X ;\n' * (20 - i))
+                paths.append(pth)
+            serial = dict(run_files(paths))
+            for jobs in [1, 2]:
+                many = list(lint_many(paths, jobs=jobs))
+                self.assertEqual(sorted(paths), sorted(p for p, _ in many))
+                self.assertEqual(serial, dict(many))
+                # stopping early abandons the rest
+                gen = lint_many(iter(paths), jobs=jobs)
+                self.assertIn(next(gen)[0], paths)
+                gen.close()
+
+class SharedPool(unittest.TestCase):
+    '''The worker processes are kept between calls.'''
+    def runTest(self):
+        with TempDir() as tmpd:
+            paths = []
+            for i in range(8):
+                pth = os.path.join(tmpd, f'{i}.rlx')
+                with open(pth, 'w') as fout:
+                    fout.write('SELECT X ;\n')
+                paths.append(pth)
+            list(lint_many(paths, jobs=2))
+            pool = runner._pool.pool
+            pids = {p.pid for p in pool._pool}
+            gen = lint_many(paths, jobs=2)
+            next(gen)
+            gen.close()
+            self.assertEqual(len(paths), len(list(run_files(paths, jobs=2))))
+            self.assertIs(pool, runner._pool.pool)
+            self.assertEqual(pids, {p.pid for p in pool._pool})
+            list(run_files(paths, jobs=3))
+            self.assertIsNot(pool, runner._pool.pool)
+
+class PickleStats(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            pth = os.path.join(tmpd, 'test.lexd')
+            with open(pth, 'w') as fout:
+                fout.write('PATTERNS\nX\nLEXICON X\nx\n')
+            linter = lint(pth, stats=True)
+            stats = pickle.loads(pickle.dumps(linter.statistics))
+            self.assertEqual(linter.statistics, stats)
+
+class FailFast(unittest.TestCase):
+    def runTest(self):
+        import argparse, io
+        from .. import lint_paths
+        from ..report import make_reporter
+        with TempDir() as tmpd:
+            for i in range(6):
+                with open(os.path.join(tmpd, f'{i}.rlx'), 'w') as fout:
+                    fout.write('SELECT X ;\n')
+            for jobs in [1, 2]:
+                args = argparse.Namespace(
+                    check=True, stats=False, ignore=False, format='ndjson',
+                    jobs=jobs, max_error=1, max_warn=-1, fail_fast=True)
+                out = io.StringIO()
+                totals = defaultdict(int)
+                _, note = lint_paths([tmpd], args, totals,
+                                     make_reporter(args, out))
+                self.assertEqual(2, totals[1])
+                self.assertEqual(2, len(out.getvalue().splitlines()))
+                self.assertEqual('Stopped after 2 files: found more than 1 errors.',
+                                 note)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import unittest
+from .base import ScalingTestBase
+from ..bench.generate import generate
+
+class MonoDixScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'monodix'
+    expected_class = 'MonoDixLinter'
+
+class MonoDixParChain(ScalingTestBase, unittest.TestCase):
+    # can_be_space() used to check every prefix of the list of paradigms
+    # at the start of an entry
+    fmt = 'monodix'
+    sizes = [20, 80]
+    expected_class = 'MonoDixLinter'
+    def generate(self, n):
+        return generate(self.fmt, 100, chain=n)[1]
+
+class BiDixScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'bidix'
+    sizes = [4000, 16000]
+    expected_class = 'BiDixLinter'
+
+class LexCScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'lexc'
+    expected_class = 'LexCLinter'
+
+class LexCMultichars(ScalingTestBase, unittest.TestCase):
+    # per_lexicon_string__symbols used to try every multichar symbol at
+    # each character
+    fmt = 'lexc'
+    expected_class = 'LexCLinter'
+    def generate(self, n):
+        return generate(self.fmt, n, multichars=n // 5)[1]
+
+class LexdScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'lexd'
+    expected_class = 'LexdLinter'
+
+class TwolCScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'twolc'
+    expected_class = 'TwolCLinter'
+
+class CGScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'rlx'
+    expected_class = 'CGLinter'
+
+class TransferScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 't1x'
+    expected_class = 'TransferLinter'
+
+class TransferDisjointCats(ScalingTestBase, unittest.TestCase):
+    # check_blocking_rules used to compare each rule to every earlier
+    # rule when none of them overlapped
+    fmt = 't1x'
+    expected_class = 'TransferLinter'
+    def generate(self, n):
+        return generate(self.fmt, n, overlap=0)[1]
+
+class RTXScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'rtx'
+    expected_class = 'RTXLinter'
+
+class LRXScaling(ScalingTestBase, unittest.TestCase):
+    fmt = 'lrx'
+    sizes = [4000, 16000]
+    expected_class = 'LRXLinter'
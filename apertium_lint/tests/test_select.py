@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from unittest import mock
+from .base import LintTestBase, TempDir
+from ..config import Config, ConfigError
+from ..file_linter import Selection, linters
+from ..tree_sitter.twolc import TwolCLinter
+from ..xml.dix import MonoDixLinter
+
+MonoDix = '''<dictionary>
+  <pardefs>
+    <pardef n="x__n">
+      <e><p><l></l><r><s n="n"/></r></p></e>
+    </pardef>
+  </pardefs>
+  <section id="main" type="standard">
+    <e lm="a"><i></i><par n="x__n"/></e>
+    <e lm="b"><i>b</i><par n="y__n"/></e>
+  </section>
+</dictionary>
+'''
+
+class FullDix(unittest.TestCase, LintTestBase):
+    file_name = 'test.dix'
+    file_contents = MonoDix
+    expected_class = 'MonoDixLinter'
+    expected_checks = [
+        (8, 'maybeempty'),
+        (9, 'undef'),
+    ]
+
+class IgnoreSpaceBlank(unittest.TestCase, LintTestBase):
+    file_name = 'test.dix'
+    file_contents = MonoDix
+    expected_class = 'MonoDixLinter'
+    expected_checks = [
+        (9, 'undef'),
+    ]
+    selection = Selection(ignore=['check_space_blank'])
+    def runTest(self):
+        with mock.patch.object(MonoDixLinter, 'check_space_blank') as m:
+            LintTestBase.runTest(self)
+            m.assert_not_called()
+
+class IgnoreCost(IgnoreSpaceBlank):
+    selection = Selection(ignore=['superlinear'])
+
+class SelectReport(unittest.TestCase, LintTestBase):
+    file_name = 'test.dix'
+    file_contents = MonoDix
+    expected_class = 'MonoDixLinter'
+    expected_checks = [
+        (8, 'maybeempty'),
+    ]
+    selection = Selection(select=['maybeempty'])
+    def runTest(self):
+        with mock.patch.object(MonoDixLinter, 'check_par_names') as m:
+            LintTestBase.runTest(self)
+            m.assert_not_called()
+
+class Dependencies(unittest.TestCase):
+    '''Checks which others depend on run even if they are not selected.'''
+    def runTest(self):
+        sel = Selection(select=['unconstrained'])
+        self.assertEqual({'unconstrained'}, sel.enabled_reports(TwolCLinter))
+        self.assertEqual({'per_rule__undefined_symbols',
+                          'post_rule__uncontrolled_symbols'},
+                         sel.enabled_checks(TwolCLinter))
+
+class CheckInfoConsistent(unittest.TestCase):
+    '''Every CheckInfo entry names a real check and real report types.'''
+    def runTest(self):
+        prefixes = ('check_', 'stat_', 'statcheck_', 'pre_', 'per_', 'post_')
+        for cls in linters():
+            reports = cls.all_report_types()
+            for name, (cost, keys, deps) in cls.all_check_info().items():
+                self.assertTrue(name.startswith(prefixes), name)
+                self.assertTrue(callable(getattr(cls, name, None)), name)
+                self.assertIn(cost, ['cheap', 'linear', 'superlinear'])
+                for k in keys:
+                    self.assertIn(k, reports, f'{cls.__name__}.{name}')
+                for d in deps:
+                    self.assertTrue(callable(getattr(cls, d, None)), d)
+
+class ConfigOverrides(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            with open(os.path.join(tmpd, '.apertium-lint.toml'), 'w') as fout:
+                fout.write('''
+ignore = ["NBSP"]
+
+[[overrides]]
+paths = ["generated/"]
+ignore = ["superlinear"]
+
+[[overrides]]
+paths = ["*.lexc"]
+select = ["undef-tag"]
+''')
+            os.mkdir(os.path.join(tmpd, 'generated'))
+            dix = os.path.join(tmpd, 'generated', 'a.dix')
+            lexc = os.path.join(tmpd, 'generated', 'a.lexc')
+            other = os.path.join(tmpd, 'b.dix')
+            conf = Config()
+            self.assertEqual(Selection(None, ['NBSP']),
+                             conf.selection_for(other))
+            self.assertEqual(Selection(None, ['NBSP', 'superlinear']),
+                             conf.selection_for(dix))
+            self.assertEqual(Selection(['undef-tag'], ['NBSP', 'superlinear']),
+                             conf.selection_for(lexc))
+            # --select replaces select, --ignore adds to ignore
+            conf = Config(['undef'], ['unuse'])
+            self.assertEqual(Selection(['undef'], ['NBSP', 'superlinear', 'unuse']),
+                             conf.selection_for(lexc))
+            conf = Config(use_files=False)
+            self.assertIsNone(conf.selection_for(lexc))
+
+class UnknownNames(unittest.TestCase):
+    def runTest(self):
+        with self.assertRaisesRegex(ConfigError, 'check_spce_blank'):
+            Config(['check_spce_blank'])
+        with self.assertRaisesRegex(ConfigError, 'nbsp'):
+            Config(ignore=['nbsp'])
+        with TempDir() as tmpd:
+            cfg = os.path.join(tmpd, '.apertium-lint.toml')
+            with open(cfg, 'w') as fout:
+                fout.write('[[overrides]]\npaths = ["*.dix"]\nselect = ["undef", "check_spce_blank"]\n')
+            with self.assertRaisesRegex(ConfigError, cfg + '.*check_spce_blank'):
+                Config().selection_for(os.path.join(tmpd, 'a.dix'))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from .base import TempDir
+from ..file_linter import Probes
+from ..runner import run_files
+from ..timing import Profiler
+
+TwolC = '''Alphabet
+  a b %{A%}:a %{A%}:b ;
+Rules
+"A to b"
+%{A%}:b <=> _ b ;
+'''
+
+class ProfilePhases(unittest.TestCase):
+    def lint_with(self, jobs):
+        with TempDir() as tmpd:
+            paths = []
+            for i in range(3):
+                pth = os.path.join(tmpd, f'test{i}.twol')
+                with open(pth, 'w') as fout:
+                    fout.write(TwolC)
+                paths.append(pth)
+            prof = Profiler()
+            results = list(run_files(paths, jobs=jobs, probes=[prof]))
+            self.assertEqual(paths, [p for p, _ in results])
+            self.assertEqual([], Probes)
+            return prof, paths
+    def check(self, prof, paths):
+        phases = {phase: v for (name, phase), v in prof.phases.items()
+                  if name == 'TwolCLinter'}
+        for phase in ['lint', 'load', 'check_encoding', 'run_per',
+                      'pre_rule', 'per_rule__undefined_symbols',
+                      'post_rule__uncontrolled_symbols', 'get_results']:
+            self.assertIn(phase, phases)
+        self.assertEqual(3, phases['lint'][1])
+        # one rule in each file
+        self.assertEqual(3, phases['per_rule__undefined_symbols'][1])
+        self.assertEqual(sorted(paths), sorted(prof.files))
+        self.assertTrue(all(name == 'TwolCLinter'
+                            for name, _ in prof.files.values()))
+        lines = list(prof.table())
+        self.assertIn('Phase', lines[0])
+        blob = prof.to_json()
+        self.assertEqual(len(prof.phases), len(blob['phases']))
+        secs = [ph['seconds'] for ph in blob['phases']]
+        self.assertEqual(sorted(secs, reverse=True), secs)
+    def runTest(self):
+        self.check(*self.lint_with(1))
+        self.check(*self.lint_with(2))
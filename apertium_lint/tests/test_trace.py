@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import unittest
+from .base import TempDir
+from ..runner import run_files
+from ..trace import Tracer
+from .test_timing import TwolC
+
+class TraceEvents(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            paths = []
+            for i in range(4):
+                pth = os.path.join(tmpd, f'test{i}.twol')
+                with open(pth, 'w') as fout:
+                    fout.write(TwolC)
+                paths.append(pth)
+            tracer = Tracer()
+            list(run_files(paths, jobs=2, probes=[tracer]))
+            out = os.path.join(tmpd, 'trace.json')
+            tracer.dump(out)
+            with open(out) as fin:
+                events = json.load(fin)['traceEvents']
+        spans = [ev for ev in events if ev['ph'] == 'X']
+        meta = [ev for ev in events if ev['ph'] == 'M']
+        self.assertEqual(set(ev['pid'] for ev in spans),
+                         set(ev['pid'] for ev in meta))
+        lint = {ev['args']['path']: ev for ev in spans if ev['name'] == 'lint'}
+        self.assertEqual(sorted(paths), sorted(lint))
+        for ev in spans:
+            outer = lint[ev['args']['path']]
+            self.assertEqual('TwolCLinter', ev['cat'])
+            if ev['name'] != 'get_results':
+                self.assertGreaterEqual(ev['ts'], outer['ts'])
+                self.assertLessEqual(ev['ts'] + ev['dur'],
+                                     outer['ts'] + outer['dur'] + 1)
+        per = [ev for ev in spans if ev['name'] == 'run_per']
+        self.assertEqual(4, len(per))
+        self.assertIn('per_rule__undefined_symbols', per[0]['args'])
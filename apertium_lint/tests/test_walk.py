@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import os
+import unittest
+from .base import TempDir
+from ..walk import Walker, iter_changed, shard
+from ..ignore import GitIgnore
+
+def make_tree(root, files):
+    for name in files:
+        pth = os.path.join(root, name)
+        os.makedirs(os.path.dirname(pth), exist_ok=True)
+        with open(pth, 'w') as fout:
+            fout.write('\n')
+
+class ChangedSince(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            make_tree(tmpd, ['a.dix', 'b.dix', 'sub/c.lexc', '.hidden/d.rlx',
+                             'other/e.rlx'])
+            real = os.path.realpath(tmpd)
+            changed = set(os.path.join(real, n) for n in
+                          ['b.dix', 'sub/c.lexc', '.hidden/d.rlx', 'gone.dix'])
+            self.assertEqual(
+                [os.path.join(tmpd, 'b.dix'), os.path.join(tmpd, 'sub/c.lexc')],
+                list(iter_changed(tmpd, changed)))
+            self.assertEqual([], list(iter_changed(os.path.join(tmpd, 'other'),
+                                                   changed)))
+            self.assertEqual([], list(iter_changed(os.path.join(tmpd, 'a.dix'),
+                                                   changed)))
+
+class IgnoreRules(unittest.TestCase):
+    gitignore = '''
+# comment
+*.log
+!keep.log
+/top.dix
+build/
+a/**/c
+\\#hash
+'''
+    cases = [
+        ('x.log', False, True),
+        ('sub/x.log', False, True),
+        ('sub/keep.log', False, False),
+        ('top.dix', False, True),
+        ('sub/top.dix', False, False),
+        ('build', True, True),
+        ('build', False, False),
+        ('sub/build', True, True),
+        ('a/c', False, True),
+        ('a/b/b/c', True, True),
+        ('b/a/c', False, False),
+        ('#hash', False, True),
+        ('main.dix', False, False),
+    ]
+    def runTest(self):
+        with TempDir() as tmpd:
+            os.mkdir(os.path.join(tmpd, '.git'))
+            with open(os.path.join(tmpd, '.gitignore'), 'w') as fout:
+                fout.write(self.gitignore)
+            make_tree(tmpd, ['sub/nested/x.rlx'])
+            with open(os.path.join(tmpd, 'sub', '.gitignore'), 'w') as fout:
+                fout.write('*.rlx\n')
+            ign = GitIgnore.for_path(tmpd)
+            for pth, is_dir, exp in self.cases:
+                self.assertEqual(exp, ign.ignored(os.path.join(tmpd, pth), is_dir),
+                                 pth)
+            nested = os.path.join(tmpd, 'sub', 'nested', 'x.rlx')
+            self.assertFalse(ign.ignored(nested))
+            ign.load_dir(os.path.join(tmpd, 'sub'))
+            self.assertTrue(ign.ignored(nested))
+            self.assertFalse(ign.ignored(os.path.join(tmpd, 'x.rlx')))
+
+class TrackedNotIgnored(unittest.TestCase):
+    '''Like git check-ignore, tracked files are never ignored.'''
+    def runTest(self):
+        import subprocess
+        with TempDir() as tmpd:
+            make_tree(tmpd, ['build/tracked.dix', 'build/new.dix',
+                             'x.log', 'y.log', 'a.dix'])
+            with open(os.path.join(tmpd, '.gitignore'), 'w') as fout:
+                fout.write('*.log\nbuild/\n')
+            subprocess.run(['git', 'init', '-q'], cwd=tmpd, check=True)
+            subprocess.run(['git', 'add', '-f', 'x.log', 'build/tracked.dix'],
+                           cwd=tmpd, check=True)
+            ign = GitIgnore.for_path(tmpd)
+            self.assertFalse(ign.ignored(os.path.join(tmpd, 'x.log')))
+            self.assertTrue(ign.ignored(os.path.join(tmpd, 'y.log')))
+            self.assertFalse(ign.ignored(os.path.join(tmpd, 'build'), True))
+            self.assertTrue(ign.ignored(os.path.join(tmpd, 'build', 'new.dix')))
+            files = sorted(os.path.relpath(p, tmpd)
+                           for p in Walker().walk([tmpd]))
+            self.assertEqual(['a.dix', 'build/tracked.dix', 'x.log'], files)
+
+class PruneSkipped(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            make_tree(tmpd, ['a.dix', 'dev/b.dix', 'sub/corpus/x/c.txt',
+                             'test/expected/d.txt', 'test/e.txt', '.git/f'])
+            walker = Walker(ignore=False)
+            self.assertEqual(
+                sorted([os.path.join(tmpd, 'a.dix'),
+                        os.path.join(tmpd, 'test', 'e.txt')]),
+                sorted(walker.walk([tmpd])))
+            self.assertEqual(
+                sorted([os.path.join(tmpd, 'dev'),
+                        os.path.join(tmpd, 'sub', 'corpus'),
+                        os.path.join(tmpd, 'test', 'expected')]),
+                sorted(p for p, _ in walker.skipped))
+            # an explicitly requested directory is not skipped
+            walker = Walker(ignore=False)
+            self.assertEqual([os.path.join(tmpd, 'dev', 'b.dix')],
+                             list(walker.walk([os.path.join(tmpd, 'dev')])))
+
+class Shard(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            sizes = {'a.dix': 900, 'b.dix': 500, 'c.rlx': 400, 'd.rlx': 300,
+                     'e.rlx': 200, 'sub/f.lexc': 100, 'sub/g.lexc': 0}
+            for name, size in sizes.items():
+                pth = os.path.join(tmpd, name)
+                os.makedirs(os.path.dirname(pth), exist_ok=True)
+                with open(pth, 'w') as fout:
+                    fout.write('x' * size)
+            files = list(Walker().walk([tmpd], roots=True))
+            shards = [list(shard(files, i, 3)) for i in range(3)]
+            self.assertEqual(sorted(files), sorted(sum(shards, [])))
+            names = [sorted(os.path.relpath(p, tmpd) for p, _ in s)
+                     for s in shards]
+            self.assertEqual([['a.dix'], ['b.dix', 'e.rlx', 'sub/f.lexc'],
+                              ['c.rlx', 'd.rlx', 'sub/g.lexc']], names)
+            # the split doesn't depend on the order the files were found in
+            self.assertEqual(names[1], sorted(
+                os.path.relpath(p, tmpd)
+                for p, _ in shard(sorted(files, reverse=True), 1, 3)))
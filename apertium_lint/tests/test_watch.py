@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import sys
+import unittest
+from .base import TempDir
+from ..report import make_reporter
+from ..watch import Inotify, Poller, Watch, changes
+
+class Changes(unittest.TestCase):
+    def runTest(self):
+        def msg(line, name):
+            return {'line': line, 'level': 1, 'name': name, 'desc': name}
+        old = [msg(1, 'a'), msg(5, 'b'), msg(6, 'b')]
+        # b on line 5 moved to 7, and there's a new b on line 6
+        new = [msg(1, 'a'), msg(6, 'b'), msg(7, 'b'), msg(8, 'b'), msg(9, 'c')]
+        self.assertEqual([msg(7, 'b'), msg(9, 'c')], changes(old, new))
+        self.assertEqual([], changes(new, old))
+
+class Update(unittest.TestCase):
+    def runTest(self):
+        args = argparse.Namespace(check=True, stats=False, ignore=False,
+                                  format='linewise')
+        with TempDir() as tmpd:
+            a = os.path.join(tmpd, 'a.rlx')
+            b = os.path.join(tmpd, 'b.rlx')
+            with open(a, 'w') as fout:
+                fout.write('SELECT X ;\n')
+            out = io.StringIO()
+            watch = Watch([tmpd], args, make_reporter(args, out), Poller())
+            watch.start()
+            self.assertIn('undef-set', out.getvalue())
+            out.seek(0)
+            out.truncate()
+            with open(a, 'w') as fout:
+                fout.write('LIST X = x ;\nSELECT X ;\n')
+            with open(b, 'w') as fout:
+                fout.write('SELECT Y ;')
+            watch.update({a, b})
+            lines = out.getvalue().splitlines()
+            self.assertEqual(
+                [f'- {a}:1: error: (undef-set) Set X used but not defined.',
+                 f'+ {b}:1: error: (noNL) Missing trailing newline.',
+                 f'+ {b}:1: error: (undef-set) Set Y used but not defined.',
+                 'Errors: 2 Warnings: 0 Suggestions: 0 Nitpicks: 0'],
+                lines)
+            out.seek(0)
+            out.truncate()
+            os.remove(b)
+            watch.update({b})
+            self.assertEqual(3, len(out.getvalue().splitlines()))
+            self.assertEqual(['a.rlx'],
+                             [os.path.basename(p) for p in watch.results])
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'needs inotify')
+class Events(unittest.TestCase):
+    def runTest(self):
+        with TempDir() as tmpd:
+            pth = os.path.join(tmpd, 'a.rlx')
+            with open(pth, 'w') as fout:
+                fout.write('SELECT X ;\n')
+            watcher = Inotify()
+            try:
+                watcher.update([pth])
+                with open(pth, 'a') as fout:
+                    fout.write('SELECT Y ;\n')
+                os.mkdir(os.path.join(tmpd, 'sub'))
+                self.assertEqual({pth, os.path.join(tmpd, 'sub', '')},
+                                 watcher.read(1))
+                self.assertEqual(set(), watcher.read(0))
+            finally:
+                watcher.close()
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'needs inotify')
+class NewDirectories(unittest.TestCase):
+    '''Files added to empty or new directories are linted.'''
+    def runTest(self):
+        args = argparse.Namespace(check=True, stats=False, ignore=False,
+                                  format='linewise', jobs=2)
+        with TempDir() as tmpd:
+            os.mkdir(os.path.join(tmpd, 'empty'))
+            out = io.StringIO()
+            watch = Watch([tmpd], args, make_reporter(args, out), Inotify())
+            try:
+                watch.start()
+                a = os.path.join(tmpd, 'empty', 'a.rlx')
+                with open(a, 'w') as fout:
+                    fout.write('SELECT X ;\n')
+                watch.update(watch.watcher.read(1))
+                self.assertIn(a, watch.results)
+                os.mkdir(os.path.join(tmpd, 'new'))
+                watch.update(watch.watcher.read(1))
+                b = os.path.join(tmpd, 'new', 'b.rlx')
+                with open(b, 'w') as fout:
+                    fout.write('SELECT X ;\n')
+                watch.update(watch.watcher.read(1))
+                self.assertEqual({a, b}, set(watch.results))
+                self.assertIn(f'+ {b}:1: error: (undef-set)', out.getvalue())
+            finally:
+                watch.watcher.close()
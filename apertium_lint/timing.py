@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from .file_linter import Probe
+from time import perf_counter
+import json
+
+class Profiler(Probe):
+    '''
+    Total time spent in each phase of linting (see Probe), for each
+    linter class and for each file.
+    Phases are nested: 'lint' includes 'load' and the checks, and
+    'run_per' includes the pre_, per_ and post_ hooks.
+    '''
+    def __init__(self):
+        self.phases = {} # (class name, phase) : [seconds, calls]
+        self.files = {} # path : (class name, {phase : seconds})
+    def begin(self, linter, phase):
+        return perf_counter()
+    def end(self, linter, phase, token):
+        self.add(linter, phase, perf_counter() - token, 1)
+    def add(self, linter, phase, seconds, calls):
+        name = type(linter).__name__
+        ent = self.phases.setdefault((name, phase), [0.0, 0])
+        ent[0] += seconds
+        ent[1] += calls
+        fphases = self.files.setdefault(linter.path, (name, {}))[1]
+        fphases[phase] = fphases.get(phase, 0.0) + seconds
+    def drain(self):
+        ret = (self.phases, self.files)
+        self.phases = {}
+        self.files = {}
+        return ret
+    def merge(self, data):
+        phases, files = data
+        for key, (seconds, calls) in phases.items():
+            ent = self.phases.setdefault(key, [0.0, 0])
+            ent[0] += seconds
+            ent[1] += calls
+        for pth, (name, fphases) in files.items():
+            cur = self.files.setdefault(pth, (name, {}))[1]
+            for phase, seconds in fphases.items():
+                cur[phase] = cur.get(phase, 0.0) + seconds
+    def table(self, top_files=10):
+        '''
+        Lines of a table of the phases sorted by total time, followed by
+        the files which took longest.
+        '''
+        yield f'{"Seconds":>10} {"Calls":>8}  {"Linter":<16} Phase'
+        rows = sorted(self.phases.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        for (name, phase), (seconds, calls) in rows:
+            yield f'{seconds:10.4f} {calls:8}  {name:<16} {phase}'
+        files = sorted(self.files.items(),
+                       key=lambda kv: (-kv[1][1].get('lint', 0.0), kv[0]))
+        if files and top_files:
+            yield ''
+            yield f'{"Seconds":>10}  Slowest files'
+            for pth, (name, fphases) in files[:top_files]:
+                yield f'{fphases.get("lint", 0.0):10.4f}  {pth} ({name})'
+    def to_json(self):
+        return {
+            'phases': [
+                {'linter': name, 'phase': phase,
+                 'seconds': seconds, 'calls': calls}
+                for (name, phase), (seconds, calls) in
+                sorted(self.phases.items(), key=lambda kv: (-kv[1][0], kv[0]))
+            ],
+            'files': {pth: {'linter': name, 'phases': fphases}
+                      for pth, (name, fphases) in sorted(self.files.items())},
+        }
+    def dump(self, fname):
+        with open(fname, 'w') as fout:
+            json.dump(self.to_json(), fout, indent=2)
+            fout.write('\n')
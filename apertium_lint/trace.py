@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from .file_linter import Probe
+import json
+import os
+import threading
+import time
+
+class Tracer(Probe):
+    '''
+    Record each phase of linting (see Probe) as a Chrome trace event,
+    which can be viewed in chrome://tracing or https://ui.perfetto.dev
+    to see how the files were spread over the workers.
+    Timestamps are from the monotonic clock, which is shared between
+    processes, relative to when the Tracer was created.
+    '''
+    def __init__(self):
+        self.start = time.perf_counter_ns()
+        self.main_pid = os.getpid()
+        self.events = []
+        self.per_totals = {} # id(linter) : {hook : seconds}
+    def now(self):
+        return (time.perf_counter_ns() - self.start) / 1000
+    def begin(self, linter, phase):
+        return self.now()
+    def end(self, linter, phase, token):
+        args = {'path': linter.path}
+        if phase == 'run_per':
+            args.update(self.per_totals.pop(id(linter), {}))
+        self.events.append({
+            'name': phase,
+            'cat': type(linter).__name__,
+            'ph': 'X',
+            'ts': token,
+            'dur': self.now() - token,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+    def add(self, linter, phase, seconds, calls):
+        # per_ hooks are interleaved, so they can't be separate spans;
+        # list their totals on the enclosing run_per span instead
+        totals = self.per_totals.setdefault(id(linter), {})
+        totals[phase] = f'{seconds * 1000:.3f} ms over {calls} nodes'
+    def drain(self):
+        ret = self.events
+        self.events = []
+        return ret
+    def merge(self, data):
+        self.events += data
+    def to_json(self):
+        meta = []
+        for pid in sorted(set(ev['pid'] for ev in self.events)):
+            name = 'apertium-lint' if pid == self.main_pid else f'worker {pid}'
+            meta.append({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                         'args': {'name': name}})
+        return {'traceEvents': meta + self.events, 'displayTimeUnit': 'ms'}
+    def dump(self, fname):
+        with open(fname, 'w') as fout:
+            json.dump(self.to_json(), fout)
+            fout.write('\n')
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .tree_sitter_linter import TreeSitterLinter
 import tree_sitter_apertium as TSA
 from collections import defaultdict
@@ -16,6 +16,9 @@ class CGLinter(TreeSitterLinter):
         'undef-set': (Verbosity.Error, 'Set {0} used but not defined.'),
         'unuse-set': (Verbosity.Warn, 'Set {0} defined but not used.'),
     }
+    CheckInfo = {
+        'check_setnames': (Cost.Linear, ['redef-set', 'undef-set', 'unuse-set'], ['gather_lines']),
+    }
     def stat_rules(self):
         self.record_stat('rules',
                          sum(1 for n in self.tree.children
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .tree_sitter_linter import TreeSitterLinter
 import tree_sitter_apertium as TSA
 from collections import defaultdict
@@ -16,6 +16,11 @@ class LexCLinter(TreeSitterLinter):
         'left-empty': (Verbosity.Error, 'Dictionary can be empty on the left-hand side. Check the lexicon sequence {0}.'),
         'right-empty': (Verbosity.Error, 'Dictionary can be empty on the right-hand side. Check the lexicon sequence {0}.'),
     }
+    CheckInfo = {
+        'check_regex': (Cost.Linear, ['wrong-paren'], []),
+        'per_lexicon_string__symbols': (Cost.Superlinear, ['undef-tag', 'undef-archi', 'multichar-redef'], ['read_alphabet']),
+        'check_empty_paths': (Cost.Superlinear, ['left-empty', 'right-empty'], ['collect_stems']),
+    }
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.plain_continue = defaultdict(set)
@@ -26,9 +31,7 @@ class LexCLinter(TreeSitterLinter):
             return self.text(node)
         else:
             return ''
-    def process_lexicon_line(self, lex, line):
-        l = ''
-        r = ''
+    def read_lexicon_line(self, line):
         com = TSA.end_comment(line)
         gloss = self.text_or_blank(com).strip('!').strip()
         cont = self.text_or_blank(line.child_by_field_name('continuation'))
@@ -38,6 +41,14 @@ class LexCLinter(TreeSitterLinter):
         if whole:
             l = whole
             r = whole
+        return l, r, gloss, cont
+    def process_lexicon_line(self, lex, line):
+        # the comment can come after the node, so the key is the rest of
+        # the line as well
+        end = self.content.find(b'\n', line.end_byte)
+        key = self.content[line.start_byte:end if end != -1 else None]
+        l, r, gloss, cont = self.remember('lexicon_line', key,
+                                          lambda: self.read_lexicon_line(line))
         if cont and (l or r):
             self.entries[lex].add((l, r, gloss, cont))
         elif cont:
@@ -59,12 +70,12 @@ class LexCLinter(TreeSitterLinter):
     def stat_stems(self):
         self.collect_stems()
         initial_lex = {'Root'}
-        while True:
-            l = len(initial_lex)
-            for lx in list(initial_lex):
-                initial_lex.update(self.plain_continue[lx])
-            if len(initial_lex) == l:
-                break
+        todo = ['Root']
+        while todo:
+            for lx in self.plain_continue[todo.pop()]:
+                if lx not in initial_lex:
+                    initial_lex.add(lx)
+                    todo.append(lx)
         lemma_gloss = set()
         lemma_gloss_no_mt = set()
         lemma_cont = set()
@@ -109,28 +120,38 @@ class LexCLinter(TreeSitterLinter):
                 self.symbols[s] = TSA.line(node)
     def pre_lexicon_string__symbols(self):
         self.read_alphabet()
+        # first character : symbols in the order they were defined
+        self.symbols_by_char = defaultdict(list)
+        for s in self.symbols:
+            self.symbols_by_char[s[0]].append(s)
+    def memo_context(self, name):
+        if name == 'per_lexicon_string__symbols':
+            return tuple(self.symbols)
+        return super().memo_context(name)
     def per_lexicon_string__symbols(self, lexstr):
-        txt = self.text(lexstr)
-        t = txt
-        while t:
-            for s in self.symbols:
-                if t.startswith(s):
-                    t = t[len(s):]
+        t = self.text(lexstr)
+        i = 0
+        while i < len(t):
+            for s in self.symbols_by_char.get(t[i], []):
+                if t.startswith(s, i):
+                    i += len(s)
                     break
             else:
-                if t[0] == '%':
-                    if t.startswith('%<') and '>' in t:
-                        s, t = t.split('>', 1)
-                        s += '>'
-                        self.record('undef-tag', lexstr, s)
-                    elif t.startswith('%{') and '}' in t:
-                        s, t = t.split('}', 1)
-                        s += '}'
-                        self.record('undef-archi', lexstr, s)
+                if t[i] == '%':
+                    end = -1
+                    if t.startswith('%<', i):
+                        end = t.find('>', i)
+                        name = 'undef-tag'
+                    elif t.startswith('%{', i):
+                        end = t.find('}', i)
+                        name = 'undef-archi'
+                    if end != -1:
+                        self.record(name, lexstr, t[i:end+1])
+                        i = end + 1
                     else:
-                        t = t[2:]
+                        i += 2
                 else:
-                    t = t[1:]
+                    i += 1
     def check_empty_paths(self):
         # it would be nice if this could have real line numbers
         # but it's not clear where to put them
@@ -152,14 +173,19 @@ class LexCLinter(TreeSitterLinter):
             dists['Root'] = 0
             todo = ['Root']
             while todo:
-                next_todo = []
+                # each lexicon is only visited once, but in the order
+                # it was last reached, so that ties between paths of
+                # the same length are broken the same way as when
+                # it was visited every time it was reached
+                next_todo = {}
                 for k in todo:
                     d = dists[k] + 1
                     for v in sorted(dct[k]):
                         if dists.setdefault(v, d) == d:
-                            next_todo.append(v)
                             prev[v] = k
-                todo = next_todo
+                            next_todo.pop(v, None)
+                            next_todo[v] = None
+                todo = list(next_todo)
             if '#' in prev:
                 l = ['#']
                 c = '#'
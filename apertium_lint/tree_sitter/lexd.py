@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .tree_sitter_linter import TreeSitterLinter
 import tree_sitter_apertium as TSA
 from collections import defaultdict
@@ -22,6 +22,11 @@ class LexdLinter(TreeSitterLinter):
         'tag-unset': (Verbosity.Warn, 'Tag {0} used in a filter but never set.'),
         'nonempty-anon-left': (Verbosity.Suggestion, 'Non-tag content is not normally expected on the left side of an anonymous lexicon. This is often a typo.'),
     }
+    CheckInfo = {
+        'check_patterns': (Cost.Superlinear, ['adj-tok-merge', 'tok-merge', 'partition'], ['examine_pattern_line']),
+        'check_tags': (Cost.Linear, ['tag-unuse', 'tag-unset'], []),
+        'per_anonymous_lexicon': (Cost.Linear, ['nonempty-anon-left'], []),
+    }
     def get_side(self, node, count_type):
         parts = ''
         for c in node.children:
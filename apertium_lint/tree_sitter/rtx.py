@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .tree_sitter_linter import TreeSitterLinter
 import tree_sitter_apertium as TSA
 from collections import defaultdict
@@ -21,6 +21,10 @@ class RTXLinter(TreeSitterLinter):
         'unuse-retag': (Verbosity.Warn, 'Tag-rewrite rule from {0} to {1} is defined but not used.'),
         'inconsistent-operator': (Verbosity.Warn, 'Inconsistent operator name {0}. Prior instance on line {1} has {2}.'),
     }
+    CheckInfo = {
+        'check_retag': (Cost.Linear, ['redef-retag', 'undef-retag', 'unuse-retag'], []),
+        'check_operators': (Cost.Linear, ['inconsistent-operator'], []),
+    }
     def stat_rules(self):
         self.count_node('out_rules', 'output_rule')
         self.count_node('attrs', 'attr_rule')
@@ -4,13 +4,129 @@ from ..file_linter import FileLinter
 import tree_sitter_apertium as TSA
 from collections import defaultdict
 
+# (language, query text) : compiled query, shared by every file
+Queries = {}
+
 class TreeSitterLinter(FileLinter):
     language = None
+    # When a document is linted again after each edit (see lsp.Document),
+    # parsed is the tree_sitter.Tree of its contents, which has already
+    # been reparsed incrementally, changed is a list of (start byte,
+    # end byte) which differ from the previous run, and memo and spans
+    # hold what remember() and the per_ hooks found on the previous run
+    # (see run_per_type()). What this run finds is stored in saved and
+    # saved_spans for the next.
+    parsed = None
+    memo = None
+    spans = None
+    changed = ()
+    saved = None
+    saved_spans = None
+    needed = None
     def text(self, node, offset=0):
         return TSA.text(self.content, node, offset)
     def load(self):
-        self.content, self.tree = TSA.parse_file(self.path, self.language)
+        self.content = self.read()
+        if self.parsed is None:
+            self.tree = TSA.parse_bytes(self.content, self.language)
+        else:
+            self.tree = self.parsed.root_node
         return True
+    def memo_context(self, name):
+        '''
+        Something which, along with the text of the node, decides what
+        per_ hook name reports, or None if that isn't known.
+        Hooks with no dependencies only need the node.
+        '''
+        deps = self.all_check_info().get(name, (None, [], None))[2]
+        return () if deps == [] else None
+    def touches_changed(self, start, end):
+        for s, e in self.changed:
+            if s <= end and start <= e:
+                return True
+        return False
+    def run_hook(self, name, node):
+        start = len(self.reports)
+        getattr(self, name)(node)
+        if name in self.saved_spans and len(self.reports) > start:
+            row = node.start_point[0]
+            self.saved_spans[name][1].append(
+                (node.start_byte, node.end_byte, row,
+                 [(l - row, lvl, k, d)
+                  for l, lvl, k, d in self.reports[start:]]))
+    def run_per_type(self, node_type, per):
+        '''
+        If memo is set, the per_ hooks which only depend on their node
+        (see memo_context()) are only run on the nodes which overlap
+        changed, by restricting the query to those ranges, and what they
+        reported for the other nodes is taken from spans, where
+        lsp.Document has moved it along with any text before it.
+        Hooks which other checks depend on still run on every node, and
+        so do the check_ methods, so the rest of the lint is still
+        proportional to the size of the file.
+        '''
+        if self.memo is None:
+            return super().run_per_type(node_type, per)
+        if self.saved_spans is None:
+            self.saved_spans = {} # hook : (context, [(start, end, row, reports)])
+            # merge overlapping ranges, so there are fewer to query
+            merged = []
+            for s, e in sorted(self.changed):
+                if merged and s <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(e, merged[-1][1]))
+                else:
+                    merged.append((s, e))
+            self.changed = merged
+        if self.needed is None:
+            self.needed = {d for _, _, deps in self.all_check_info().values()
+                           for d in deps}
+        every = []
+        fresh = []
+        for name in per:
+            ctx = None if name in self.needed else self.memo_context(name)
+            if ctx is None:
+                every.append(name)
+                continue
+            old = (self.spans or {}).get(name)
+            self.saved_spans[name] = (ctx, [])
+            if old is None or old[0] != ctx:
+                every.append(name)
+                continue
+            fresh.append(name)
+            for start, end, row, reps in old[1]:
+                if not self.touches_changed(start, end):
+                    self.reports += [(row + l, lvl, k, d)
+                                     for l, lvl, k, d in reps]
+                    self.saved_spans[name][1].append((start, end, row, reps))
+        if every:
+            for node in self.iter_type(node_type):
+                for name in every:
+                    self.run_hook(name, node)
+        if fresh:
+            for node in self.iter_type_in(node_type, self.changed):
+                if self.touches_changed(node.start_byte, node.end_byte):
+                    for name in fresh:
+                        self.run_hook(name, node)
+    def remember(self, name, key, fn):
+        '''
+        fn(), or, if memo is set, what it returned for the same key (bytes)
+        on the previous run, which fn must only depend on.
+        '''
+        if self.memo is None:
+            return fn()
+        if self.saved is None:
+            self.saved = {}
+            self.reuse = {}
+        if name not in self.saved:
+            self.saved[name] = ((), {})
+            old = self.memo.get(name)
+            self.reuse[name] = old[1] if old else {}
+        if key in self.reuse[name]:
+            val = self.reuse[name][key]
+        else:
+            val = fn()
+        self.saved[name][1][key] = val
+        return val
     def iter_children(self, node, tags=None, nest=True):
         keep = []
         if isinstance(tags, str):
@@ -29,15 +145,39 @@ class TreeSitterLinter(FileLinter):
         self.record_stat(name,
                          sum(1 for _ in self.iter_children(self.tree,
                                                            tags, nest)))
+    def compile(self, qr):
+        q = Queries.get((self.language, qr))
+        if q is None:
+            q = Queries[(self.language, qr)] = self.language.query(qr)
+        return q
     def query(self, qr, node=None):
-        q = self.language.query(qr)
-        cap = q.captures(node or self.tree)
-        for c in cap:
-            for v in cap[c]:
-                yield v, c
+        cap = self.compile(qr).captures(node or self.tree)
+        # captures() doesn't return nodes in the order they appear, and
+        # the order changes when the tree is edited, so sort them
+        found = [(v, c) for c in cap for v in cap[c]]
+        found.sort(key=lambda vc: vc[0].start_byte)
+        yield from found
     def iter_type(self, name, node=None):
         for n, _ in self.query(f'({name}) @thing', node):
             yield n
+    def iter_type_in(self, name, ranges):
+        '''
+        The nodes of type name which overlap (or touch) any of ranges,
+        a sorted list of (start byte, end byte), each once.
+        '''
+        q = self.compile(f'({name}) @thing')
+        seen = set()
+        for s, e in ranges:
+            q.set_byte_range((max(s - 1, 0), e + 1))
+            try:
+                cap = q.captures(self.tree)
+            finally:
+                # the query is shared
+                q.set_byte_range((0, 0xFFFFFFFF))
+            for n in sorted(cap.get('thing', []), key=lambda n: n.start_byte):
+                if n.id not in seen:
+                    seen.add(n.id)
+                    yield n
     def all_labels(self, name, node=None):
         for node in self.iter_type(name, node):
             yield self.text(node)
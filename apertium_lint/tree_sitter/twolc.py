@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .tree_sitter_linter import TreeSitterLinter
 import tree_sitter_apertium as TSA
 from collections import defaultdict
@@ -24,6 +24,12 @@ class TwolCLinter(TreeSitterLinter):
         'unconstrained': (Verbosity.Warn, 'Symbol {0} has multiple unconstrained realizations ({1}).'),
         'over-constrained': (Verbosity.Suggestion, 'Symbol {0} has only 1 realization ({1}), so constraining it witha rule is unnecessary.'),
     }
+    CheckInfo = {
+        'per_context__semicolon': (Cost.Linear, ['stray-semi'], []),
+        'per_rule__plain_symbol': (Cost.Linear, ['explicit-target'], []),
+        'per_rule__undefined_symbols': (Cost.Superlinear, ['undef-pair', 'alpha-implicit', 'alpha-repeat'], ['read_alphabet', 'read_sets']),
+        'post_rule__uncontrolled_symbols': (Cost.Linear, ['unconstrained', 'over-constrained'], ['per_rule__undefined_symbols']),
+    }
     def read_alphabet(self):
         if hasattr(self, 'symbols'):
             return
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+from .file_linter import skip_directory
+from .ignore import GitIgnore, find_repo_root
+import heapq
+import os
+
+def changed_files(ref, paths):
+    '''
+    Return the set of real paths of files which differ between git
+    revision ref and the working tree of the repositories containing
+    each of paths. Raises ValueError if git fails.
+    '''
+    import subprocess
+    def git(cwd, *cmd):
+        try:
+            proc = subprocess.run(['git'] + list(cmd), capture_output=True,
+                                  cwd=cwd)
+        except OSError as e:
+            raise ValueError(str(e))
+        if proc.returncode != 0:
+            raise ValueError(proc.stderr.decode('utf-8', 'replace').strip())
+        return proc.stdout.decode('utf-8', 'surrogateescape')
+    tops = set()
+    for pth in paths:
+        cwd = pth if os.path.isdir(pth) else (os.path.dirname(pth) or '.')
+        tops.add(git(cwd, 'rev-parse', '--show-toplevel').strip())
+    ret = set()
+    for top in sorted(tops):
+        names = git(top, 'diff', '--name-only', '-z', '--no-renames',
+                    '--diff-filter=d', ref, '--')
+        ret.update(os.path.realpath(os.path.join(top, n))
+                   for n in names.split('\0') if n)
+    return ret
+
+def iter_changed(pth, changed):
+    real = os.path.realpath(pth)
+    if os.path.isfile(pth):
+        if real in changed:
+            yield pth
+    elif os.path.isdir(pth):
+        prefix = os.path.join(real, '')
+        for c in sorted(changed):
+            if not c.startswith(prefix):
+                continue
+            rel = c[len(prefix):]
+            if any(part.startswith('.') for part in rel.split(os.sep)):
+                continue
+            if os.path.isfile(c):
+                yield os.path.join(pth, rel)
+
+def shard(entries, index, count):
+    '''
+    Yield the entries (paths, or (path, root) as from Walker.walk())
+    which belong in shard index (counting from 0) of count.
+    Files are handed out largest first to whichever shard has the fewest
+    bytes so far, so that the shards take about as long as each other.
+    Ties are broken by the path relative to its root, so every shard
+    agrees on the split even if they are checked out in different places.
+    '''
+    entries = list(entries)
+    weighted = []
+    for ent in entries:
+        pth, root = (ent, None) if isinstance(ent, str) else ent
+        try:
+            size = os.path.getsize(pth)
+        except OSError:
+            size = 0
+        rel = os.path.relpath(pth, root) if root else pth
+        weighted.append((-size, rel, pth))
+    weighted.sort()
+    loads = [(0, i) for i in range(count)]
+    mine = set()
+    for size, _, pth in weighted:
+        load, i = heapq.heappop(loads)
+        # empty files still take some time
+        heapq.heappush(loads, (load + max(-size, 1), i))
+        if i == index:
+            mine.add(pth)
+    for ent in entries:
+        if (ent if isinstance(ent, str) else ent[0]) in mine:
+            yield ent
+
+class Walker:
+    '''
+    Find the files to be linted under a list of paths, skipping hidden
+    files, anything excluded by .gitignore (if ignore is True) and
+    directories which SkipLinting would skip every file in.
+    If changed is a set of real paths, only those files are returned.
+
+    Directories and files which are skipped are recorded in
+    self.skipped as (path, reason), and the directories which are
+    walked (including those with nothing to lint) in self.dirs.
+
+    If walk() is given roots=True, it yields (path, root) where root is
+    the argument the file was found under (or its directory, for a
+    file), which identify() matches PathIdentifiers relative to.
+    '''
+    def __init__(self, ignore=True, changed=None):
+        self.ignore = ignore
+        self.changed = changed
+        self.matchers = {} # repo root : GitIgnore
+        self.skipped = []
+        self.dirs = []
+    def ignore_matcher(self, pth):
+        '''
+        Return the GitIgnore for the repository containing pth,
+        or None if it isn't in a repository.
+        '''
+        root = find_repo_root(pth)
+        if root is None:
+            return None
+        if root not in self.matchers:
+            self.matchers[root] = GitIgnore(root)
+        self.matchers[root].load_parents(pth)
+        return self.matchers[root]
+    def walk(self, paths, roots=False):
+        for pth in paths:
+            if self.changed is not None:
+                files = self.iter_changed(pth)
+            elif os.path.isdir(pth):
+                ignore = self.ignore_matcher(pth) if self.ignore else None
+                files = self.iter_dir(pth, pth, ignore)
+            elif os.path.isfile(pth):
+                files = [pth]
+            else:
+                continue
+            if not roots:
+                yield from files
+                continue
+            root = pth if os.path.isdir(pth) else os.path.dirname(pth)
+            for fname in files:
+                yield fname, root
+    def iter_dir(self, pth, root, ignore):
+        if ignore is not None:
+            ignore.load_dir(pth)
+        self.dirs.append(pth)
+        # close the directory even if the caller stops early
+        with os.scandir(pth) as it:
+            for ent in it:
+                if ent.name.startswith('.'):
+                    continue
+                is_dir = ent.is_dir()
+                if ignore is not None and ignore.ignored(ent.path, is_dir):
+                    if is_dir:
+                        self.skipped.append((ent.path, 'ignored by git'))
+                    continue
+                if is_dir:
+                    # skip directories relative to the path we were given
+                    # so that e.g. linting ~/dev/apertium-eng still works
+                    pat = skip_directory(os.path.relpath(ent.path, root))
+                    if pat:
+                        self.skipped.append((ent.path, 'matches ' + pat))
+                    else:
+                        yield from self.iter_dir(ent.path, root, ignore)
+                elif ent.is_file():
+                    yield ent.path
+    def iter_changed(self, pth):
+        for fname in iter_changed(pth, self.changed):
+            rel = os.path.relpath(fname, pth)
+            pat = skip_directory(os.path.dirname(rel)) if os.sep in rel else None
+            if pat:
+                self.skipped.append((fname, 'matches ' + pat))
+            else:
+                yield fname
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+'''
+--watch: lint everything once, then re-lint files as they change and
+print which diagnostics appeared and which were resolved.
+'''
+
+from .report import LevelLabels, LinewiseReporter
+from .runner import run_files
+from .walk import Walker
+from collections import Counter, defaultdict
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+
+# wait this long after the last change before linting, so that a burst
+# of writes (an editor saving, or make) is linted once
+Delay = 0.2
+
+class Inotify:
+    '''
+    The directories being watched for changes, with inotify(7).
+    Only available on Linux; see Poller for everywhere else.
+    '''
+    MODIFY = 0x2
+    CLOSE_WRITE = 0x8
+    MOVED_FROM = 0x40
+    MOVED_TO = 0x80
+    CREATE = 0x100
+    DELETE = 0x200
+    OVERFLOW = 0x4000
+    ISDIR = 0x40000000
+    Mask = MODIFY | CLOSE_WRITE | MOVED_FROM | MOVED_TO | CREATE | DELETE
+    Header = struct.Struct('iIII')
+    def __init__(self):
+        self.libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {} # watch descriptor : directory
+    def add(self, dirname):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirname),
+                                         self.Mask)
+        if wd >= 0:
+            self.dirs[wd] = dirname
+    def update(self, files):
+        '''Watch the directory of each of files (or itself, ending in a separator).'''
+        for dirname in {os.path.dirname(f) for f in files}:
+            self.add(dirname)
+    def read(self, timeout=None):
+        '''
+        Paths which changed within timeout seconds (or whenever something
+        does, if it's None), or None if too many changed to keep track of.
+        Directories end with a separator.
+        '''
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            buf = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        paths = set()
+        pos = 0
+        while pos < len(buf):
+            wd, mask, _, size = self.Header.unpack_from(buf, pos)
+            pos += self.Header.size
+            name = buf[pos:pos+size].rstrip(b'\0')
+            pos += size
+            if mask & self.OVERFLOW:
+                return None
+            if wd not in self.dirs or not name:
+                continue
+            pth = os.path.join(self.dirs[wd], os.fsdecode(name))
+            if mask & self.ISDIR:
+                if mask & (self.CREATE | self.MOVED_TO):
+                    # watch it straight away, so that files written to
+                    # it from now on are seen; anything already in it
+                    # is found by walking again
+                    self.add(pth)
+                paths.add(pth + os.sep)
+            else:
+                paths.add(pth)
+        return paths
+    def close(self):
+        os.close(self.fd)
+
+class Poller:
+    '''The same interface as Inotify, by checking every file's mtime.'''
+    def __init__(self):
+        self.stat = {}
+        self.files = set()
+    def snapshot(self, pth):
+        try:
+            st = os.stat(pth)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+    def update(self, files):
+        # a directory's mtime changes when files are added to it
+        self.files = set(files) | {os.path.join(os.path.dirname(f), '')
+                                   for f in files}
+        self.stat = {f: self.snapshot(f) for f in self.files}
+    def read(self, timeout=None):
+        time.sleep(Delay if timeout is None else timeout)
+        changed = set()
+        for f in self.files:
+            st = self.snapshot(f)
+            if st != self.stat[f]:
+                self.stat[f] = st
+                changed.add(f)
+        return changed
+    def close(self):
+        pass
+
+def make_watcher():
+    if sys.platform.startswith('linux'):
+        try:
+            return Inotify()
+        except (OSError, AttributeError):
+            pass
+    return Poller()
+
+def key(msg):
+    return (msg['level'], msg['name'], msg['desc'])
+
+def changes(old, new):
+    '''
+    The diagnostics in new which aren't in old, not counting those
+    which are only on a different line (because lines were added or
+    removed above them).
+    '''
+    extra = Counter(map(key, new)) - Counter(map(key, old))
+    was = {(msg['line'],) + key(msg) for msg in old}
+    ret = []
+    # prefer the ones which aren't on the same line as before
+    for msg in sorted(new, key=lambda m: (m['line'],) + key(m) in was):
+        if extra[key(msg)] > 0:
+            extra[key(msg)] -= 1
+            ret.append(msg)
+    return sorted(ret, key=lambda m: m['line'])
+
+class Watch:
+    '''The latest results for every file under paths.'''
+    def __init__(self, paths, args, reporter, watcher=None):
+        self.paths = paths
+        self.args = args
+        self.reporter = reporter
+        self.out = reporter.out
+        self.display = LinewiseReporter(args, self.out).display_path
+        self.watcher = watcher or make_watcher()
+        self.files = {} # path : root
+        self.results = {} # path : results
+    def walk(self):
+        walker = Walker(ignore=self.args.ignore)
+        self.files = dict(walker.walk(self.paths, roots=True))
+        # every directory, so that files added to empty ones are seen
+        self.watcher.update(list(self.files) +
+                            [os.path.join(d, '') for d in walker.dirs])
+    def lint(self, files):
+        # with several jobs, run_files() keeps the same pool of workers
+        # from one batch of changes to the next
+        args = self.args
+        return run_files([(f, self.files[f]) for f in files],
+                         check=args.check, stats=args.stats,
+                         jobs=getattr(args, 'jobs', 1),
+                         cache=getattr(args, 'cache', None),
+                         config=getattr(args, 'config', None))
+    def totals(self):
+        totals = defaultdict(int)
+        for res in self.results.values():
+            for msg in res['checks']:
+                totals[msg['level']] += 1
+        return totals
+    def start(self):
+        '''Lint everything and report it in full.'''
+        self.walk()
+        self.reporter.start()
+        for pth, res in self.lint(sorted(self.files)):
+            self.results[pth] = res
+            self.reporter.file(pth, res)
+        self.reporter.finish(self.totals())
+        self.reporter.flush()
+    def update(self, changed):
+        '''
+        Lint the files in changed again (or everything, if it is None)
+        and print what changed.
+        '''
+        if changed is None or any(p not in self.files or not os.path.exists(p)
+                                  for p in changed):
+            self.walk()
+        if changed is None:
+            changed = set(self.files)
+        lines = []
+        def show(sign, pth, msgs):
+            for msg in msgs:
+                typ = LevelLabels.get(msg['level'], 'Message').lower()
+                lines.append(f'{sign} {self.display(pth)}:{msg["line"]}: {typ}: ({msg["name"]}) {msg["desc"]}')
+        for pth in sorted(set(self.results) - set(self.files)):
+            # deleted, or now ignored
+            show('-', pth, self.results.pop(pth)['checks'])
+        relint = sorted(p for p in changed if p in self.files)
+        for pth, res in self.lint(relint):
+            old = self.results.get(pth, {'checks': []})['checks']
+            show('-', pth, changes(res['checks'], old))
+            show('+', pth, changes(old, res['checks']))
+            self.results[pth] = res
+        if not relint and not lines:
+            return
+        totals = self.totals()
+        lines.append(f'Errors: {totals[1]} Warnings: {totals[2]} Suggestions: {totals[3]} Nitpicks: {totals[4]}')
+        self.out.write('\n'.join(lines) + '\n')
+        self.out.flush()
+    def wait(self, delay=Delay):
+        '''Wait for something to change, then until nothing has for delay.'''
+        changed = set()
+        while changed is not None and not changed:
+            changed = self.watcher.read()
+        while changed is not None:
+            more = self.watcher.read(delay)
+            if more is None:
+                return None
+            if not more:
+                break
+            changed |= more
+        return changed
+    def run(self):
+        self.start()
+        try:
+            while True:
+                self.update(self.wait())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.watcher.close()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .xml import XmlLinter
 from collections import defaultdict
 import re
@@ -12,6 +12,9 @@ class DixLinter(XmlLinter):
         'LitSpace': (Verbosity.Warn, 'Spaces in entries should be written with <b/>.'),
         'OtherSpace': (Verbosity.Error, 'Entries should not contain space characters.'),
     }
+    CheckInfo = {
+        'statcheck_par_refs': (Cost.Linear, ['undef', 'unuse'], []),
+    }
     StatLabels = {
         'section_entries': 'Entries in each section',
         'pardef_entries': 'Entries in each pardef',
@@ -113,6 +116,10 @@ class MonoDixLinter(DixLinter):
         'wrong-stem': (Verbosity.Warn, 'Stem is "{0}", but based on paradigm name, should be "{1}". lm: {2} stem: {3} par: {4}'),
         'repeat-entry': (Verbosity.Warn, 'Stem "{0}" appears more than once with paradigm {1}. First use on line {2}.'),
     }
+    CheckInfo = {
+        'check_space_blank': (Cost.Superlinear, ['maybeempty', 'initspace', 'LitSpace', 'OtherSpace'], ['space_blank_entry', 'find_blank', 'find_space']),
+        'check_par_names': (Cost.Linear, ['repeat-entry', 'lemma-is-stem', 'wrong-stem'], []),
+    }
     def space_blank_entry(self, ent):
         strs = self.collect_child_strings(ent)
         parname = ''
@@ -153,40 +160,84 @@ class MonoDixLinter(DixLinter):
                 self.blank_left[parname].append((line, emptyl))
             if emptyrstr and emptyr != None:
                 self.blank_right[parname].append((line, emptyr))
-    def all_blank(self, ls, side):
-        return all([self.can_be_empty(p)[0 if side=='left' else 1] for p in ls])
+    def find_blank(self):
+        # Work out which entries of each paradigm can be empty, starting
+        # from the ones which are empty outright, rather than recursing
+        # through <par>, which overflows the stack on long chains of
+        # paradigms and never finishes on loops.
+        self.really_blank = defaultdict(lambda: [[], []])
+        waiting = defaultdict(list) # (par, side) : [(parname, index, [reqs left])]
+        todo = []
+        for side, blank in enumerate([self.blank_left, self.blank_right]):
+            for par, ents in blank.items():
+                for i, (_, reqs) in enumerate(ents):
+                    if not reqs:
+                        todo.append((par, side, i))
+                    left = [len(reqs)]
+                    for p in reqs:
+                        waiting[(p, side)].append((par, i, left))
+        while todo:
+            par, side, i = todo.pop()
+            found = self.really_blank[par][side]
+            found.append(i)
+            if len(found) == 1:
+                for opar, j, left in waiting.pop((par, side), []):
+                    left[0] -= 1
+                    if left[0] == 0:
+                        todo.append((opar, side, j))
+        for found in self.really_blank.values():
+            found[0].sort()
+            found[1].sort()
     def can_be_empty(self, par):
-        if par in self.really_blank:
-            return tuple(self.really_blank[par])
-        left = [i for i, (line, reqs) in enumerate(self.blank_left[par])
-                if self.all_blank(reqs, 'left')]
-        right = [i for i, (line, reqs) in enumerate(self.blank_right[par])
-                 if self.all_blank(reqs, 'right')]
-        self.really_blank[par] = [left, right]
-        return (left, right)
+        return tuple(self.really_blank.get(par, ([], [])))
+    def find_space(self):
+        # Which paradigms can begin with a space, worked out the same way
+        # as find_blank().
+        self.space_pars = (set(), set())
+        waiting = defaultdict(list) # (par, side) : [parname]
+        todo = []
+        for side, spaces in enumerate([self.space_left, self.space_right]):
+            for par, ents in spaces.items():
+                prev = None
+                for _, reqs, final in ents:
+                    # consecutive entries often share the same list of reqs
+                    if reqs is not prev:
+                        prev = reqs
+                        blank = True
+                        for r in reqs:
+                            waiting[(r, side)].append(par)
+                            if not self.can_be_empty(r)[side]:
+                                blank = False
+                                break
+                    if final and blank:
+                        todo.append((par, side))
+        while todo:
+            par, side = todo.pop()
+            if par not in self.space_pars[side]:
+                self.space_pars[side].add(par)
+                todo += [(opar, side) for opar in waiting.pop((par, side), [])]
+    def space_starts(self, reqs, side):
+        # positions j where reqs[j] can begin with a space and everything
+        # before it can be empty, and whether all of reqs can be empty
+        starts = []
+        for j, r in enumerate(reqs):
+            if r in self.space_pars[side]:
+                starts.append(j)
+            if not self.can_be_empty(r)[side]:
+                return starts, False
+        return starts, True
     def can_be_space(self, par):
-        if par in self.really_space:
-            return tuple(self.really_space[par])
-        left = []
-        right = []
-        if par in self.space_left:
-            for i, (line, reqs, final) in enumerate(self.space_left[par]):
-                sp = [self.can_be_space(r)[0] for r in reqs]
-                for j in range(len(reqs)):
-                    if self.all_blank(reqs[:j], 'left') and sp[j]:
-                        left.append((i, j))
-                if final and self.all_blank(reqs, 'left'):
-                    left.append((i, -1))
-        if par in self.space_right:
-            for i, (line, reqs, final) in enumerate(self.space_right[par]):
-                sp = [self.can_be_space(r)[1] for r in reqs]
-                for j in range(len(reqs)):
-                    if self.all_blank(reqs[:j], 'right') and sp[j]:
-                        right.append((i, j))
-                if final and self.all_blank(reqs, 'right'):
-                    right.append((i, -1))
-        self.really_space[par] = [left, right]
-        return (left, right)
+        ret = ([], [])
+        for side, spaces in enumerate([self.space_left, self.space_right]):
+            prev = None
+            for i, (_, reqs, final) in enumerate(spaces.get(par, [])):
+                if reqs is not prev:
+                    starts, blank = self.space_starts(reqs, side)
+                    prev = reqs
+                ret[side].extend((i, j) for j in starts)
+                if final and blank:
+                    ret[side].append((i, -1))
+        return ret
     def check_space_blank(self):
         self.space_left = defaultdict(list)
         self.space_right = defaultdict(list)
@@ -197,14 +248,14 @@ class MonoDixLinter(DixLinter):
 
         # TODO: It could be useful to recursively enumerate the pardefs
         # involved in these errors
-        self.really_blank = defaultdict(list)
+        self.find_blank()
         le, re = self.can_be_empty('')
         for idx in le:
             self.record('maybeempty', self.blank_left[''][idx][0], 'left')
         for idx in re:
             self.record('maybeempty', self.blank_right[''][idx][0], 'right')
 
-        self.really_space = defaultdict(list)
+        self.find_space()
         ls, rs = self.can_be_space('')
         for idx, ct in ls:
             self.record('initspace', self.space_left[''][idx][0], 'left')
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .xml import XmlLinter
 from collections import defaultdict
 
@@ -14,6 +14,11 @@ class LRXLinter(XmlLinter):
         'long-or': (Verbosity.Suggestion, 'Sequence has more than 5 elements - did you forget an <or>?'),
         'redef-seq': (Verbosity.Error, 'Redefinition of sequence {0} (initial definition on line {1}.')
     }
+    CheckInfo = {
+        'check_macro_params': (Cost.Linear, ['p-non-mac', 'p-non-p', 'param-non-mac', 'non-param-mac'], []),
+        'check_repeat': (Cost.Linear, ['missing-attr'], []),
+        'check_seqs': (Cost.Linear, ['long-or', 'redef-seq', 'undef', 'unuse'], []),
+    }
     def check_macro_params(self, node=None, in_mac=False):
         if node == None:
             node = self.tree
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .xml import XmlLinter
 from collections import defaultdict
 
@@ -13,6 +13,11 @@ class ModesLinter(XmlLinter):
         'suggested-mode': (Verbosity.Suggestion, 'Mode {0} is defined, but corresponding mode {1} is missing.'),
         'separate-biltrans': (Verbosity.Warn, 'Lexical transfer should be done in a separate step with lt-proc, not within apertium-transfer.'),
     }
+    CheckInfo = {
+        'check_deps': (Cost.Cheap, ['install-deps'], []),
+        'check_mode_names': (Cost.Cheap, ['redef-mode', 'required-mode', 'suggested-mode'], []),
+        'check_programs': (Cost.Cheap, ['separate-biltrans'], ['arg_list']),
+    }
     def check_deps(self):
         for node in self.tree.findall(".//mode[@install='yes']//file"):
             if node.attrib.get('name', '').startswith('.deps/'):
@@ -24,7 +29,7 @@ class ModesLinter(XmlLinter):
             n = node.attrib.get('name', '')
             l = node.sourceline
             if n in locs:
-                self.record('repeat-name', node, n, locs[n])
+                self.record('redef-mode', node, n, locs[n])
             else:
                 locs[n] = l
             if n.endswith('-morph') and n.count('-') == 1:
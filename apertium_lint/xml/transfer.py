@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from ..file_linter import FileLinter, Verbosity
+from ..file_linter import Cost, FileLinter, Verbosity
 from .xml import XmlLinter
 from collections import defaultdict
 
@@ -14,6 +14,13 @@ class TransferLinter(XmlLinter):
         'out-of-range-rule': (Verbosity.Error, 'Clip has position {0} but rule only matches {1} items.'),
         'out-of-range-macro': (Verbosity.Error, 'Clip has position {0} but macro only takes {1} parameters.'),
     }
+    CheckInfo = {
+        'check_macros': (Cost.Linear, ['wrong-arg-count', 'undef', 'unuse'], []),
+        'check_blank_manipulation': (Cost.Linear, ['blank-manipulation'], []),
+        'check_blocking_rules': (Cost.Superlinear, ['overlapping-paths'], []),
+        'check_defuse': (Cost.Linear, ['redef', 'undef', 'unuse'], []),
+        'check_positions': (Cost.Linear, ['out-of-range-rule', 'out-of-range-macro'], []),
+    }
     def stat_rules(self):
         self.record_child_count(('rules'), self.tree, 'rule')
         self.record_child_count(('macros'), self.tree, 'def-macro')
@@ -47,35 +54,69 @@ class TransferLinter(XmlLinter):
                     break
     def check_blocking_rules(self):
         cats = defaultdict(set)
-        cat_overlap = defaultdict(set)
+        item2cat = defaultdict(set)
         for cat in self.tree.iter('def-cat'):
             name = cat.get('n')
-            cat_overlap[name].add(name)
+            items = cats[name]
             for ci in cat.iter('cat-item'):
                 l = ci.get('lemma', '')
                 t = ci.get('tags', '')
                 n = ci.get('name', '')
-                cats[name].add(n or (l+'@'+t if l else t))
-            for k, v in cats.items():
-                if k == name: continue
-                if not v.isdisjoint(cats[name]):
-                    cat_overlap[k].add(name)
-                    cat_overlap[name].add(k)
-        pat2rule = defaultdict(list)
+                item = n or (l+'@'+t if l else t)
+                items.add(item)
+                item2cat[item].add(name)
+        overlap = {}
+        def overlaps(a, b):
+            if (a, b) not in overlap:
+                if a == b:
+                    overlap[(a, b)] = a in cats
+                else:
+                    overlap[(a, b)] = not cats.get(a, set()).isdisjoint(cats.get(b, ()))
+            return overlap[(a, b)]
+        # length : {first category : line of first rule}
+        starts = defaultdict(dict)
+        # (length, first category) : {pattern : line of first rule}
+        # a repeated pattern can only match what its first occurrence did
+        pat2rule = defaultdict(dict)
         for rule in self.tree.iter('rule'):
             pat = []
             for pi in rule.iter('pattern-item'):
                 pat.append(pi.get('n'))
-            for line, opat in pat2rule[len(pat)]:
-                if all(b in cat_overlap[a] for a, b in zip(pat, opat)):
-                    ls = []
-                    for a, b in zip(pat, opat):
-                        s = cats[a].intersection(cats[b])
-                        ls.append((sorted(s) + ['*'])[0])
-                    ex = ' '.join(ls)
-                    self.record('overlapping-paths', rule.sourceline, ex, line)
+            pat = tuple(pat)
+            head = pat[0] if pat else None
+            heads = starts[len(pat)]
+            # walk the groups of earlier rules in order, either all of
+            # them or just the ones whose first category overlaps with
+            # ours, whichever is fewer
+            if not pat:
+                order = list(heads)
+            elif sum(len(item2cat[i]) for i in cats.get(head, ())) < len(heads):
+                ov = {head} if head in cats else set()
+                for i in cats.get(head, ()):
+                    ov.update(item2cat[i])
+                order = sorted((c for c in ov if c in heads), key=heads.get)
+            else:
+                order = (c for c in heads if overlaps(head, c))
+            first = None
+            for c in order:
+                if first is not None and heads[c] >= first[0]:
                     break
-            pat2rule[len(pat)].append((rule.sourceline, pat))
+                for opat, line in pat2rule[(len(pat), c)].items():
+                    if first is not None and line >= first[0]:
+                        break
+                    if all(overlaps(a, b) for a, b in zip(pat, opat)):
+                        first = (line, opat)
+                        break
+            if first is not None:
+                line, opat = first
+                ls = []
+                for a, b in zip(pat, opat):
+                    s = cats[a].intersection(cats[b])
+                    ls.append((sorted(s) + ['*'])[0])
+                ex = ' '.join(ls)
+                self.record('overlapping-paths', rule.sourceline, ex, line)
+            heads.setdefault(head, rule.sourceline)
+            pat2rule[(len(pat), head)].setdefault(pat, rule.sourceline)
     def check_defuse(self):
         defined = defaultdict(lambda: defaultdict(list))
         used = defaultdict(lambda: defaultdict(list))
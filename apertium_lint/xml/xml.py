@@ -10,7 +10,7 @@ class XmlLinter(FileLinter):
     }
     def load(self):
         try:
-            self.tree = etree.parse(self.path).getroot()
+            self.tree = etree.fromstring(self.read())
             return True
         except etree.XMLSyntaxError as e:
             self.record('invalid-xml', e.lineno, e.msg)